@@ -0,0 +1,16 @@
+"""Micro-benchmarks of the page object operations.
+
+The suite runs against the local fake DemoQA (``harness.fake_site``), so the
+numbers measure the page objects and Playwright rather than the network:
+
+    python -m benchmarks run                      # writes .harness/benchmarks/latest.json
+    python -m benchmarks run --save-baseline      # and makes it the baseline
+    python -m benchmarks compare                  # latest against the baseline
+
+Every benchmark is warmed up, calibrated to a number of loops per sample that
+takes at least ``--min-time`` seconds, then sampled ``--repeat`` times. Results
+hold the per-operation time of each sample plus min, median, mean, standard
+deviation, p95, IQR and operations per second. ``compare`` flags benchmarks
+whose median got more than ``--threshold`` slower, and exits with 1 when any
+did, so a change to the page objects or fixtures can show its before and after.
+"""
@@ -0,0 +1,138 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from importlib.metadata import version
+
+from playwright.sync_api import sync_playwright
+
+from benchmarks.cases import DEFAULT_ROWS, cases
+from benchmarks.runner import MIN_SAMPLE_TIME, compare, format_seconds, measure
+from harness.fake_site import FakeSite
+from pages.base_page import BasePage
+
+RESULTS_DIR = os.path.join(".harness", "benchmarks")
+LATEST_PATH = os.path.join(RESULTS_DIR, "latest.json")
+BASELINE_PATH = os.path.join(RESULTS_DIR, "baseline.json")
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _write(path: str, data: dict):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=1)
+
+
+def _run(args) -> int:
+    selected = [case for case in cases(args.rows) if not args.k or args.k in case.name]
+    if not selected:
+        print(f"no benchmark matches {args.k!r}")
+        return 1
+    site = FakeSite()
+    site.start()
+    BasePage.base_url = site.url
+    results = []
+    try:
+        with sync_playwright() as playwright:
+            browser = getattr(playwright, args.browser).launch(headless=not args.headed)
+            for case in selected:
+                context = browser.new_context(viewport={"width": 1920, "height": 1080})
+                try:
+                    operation = case.setup(context.new_page())
+                    result = measure(operation, warmup=args.warmup, repeat=args.repeat, min_time=args.min_time)
+                finally:
+                    context.close()
+                stats = result["stats"]
+                print(
+                    f"{case.name:<36} median {format_seconds(stats['median']):>9}  "
+                    f"min {format_seconds(stats['min']):>9}  iqr {format_seconds(stats['iqr']):>9}  "
+                    f"({result['loops']} loops x {args.repeat})",
+                    flush=True,
+                )
+                results.append({"name": case.name, **result})
+            browser.close()
+    finally:
+        site.stop()
+    data = {
+        "meta": {
+            "timestamp": time.time(),
+            "revision": _git_revision(),
+            "browser": args.browser,
+            "playwright": version("playwright"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    _write(args.output, data)
+    print(f"results written to {args.output}")
+    if args.save_baseline:
+        _write(args.baseline, data)
+        print(f"baseline written to {args.baseline}")
+    return 0
+
+
+def _compare(args) -> int:
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)
+    print(f"baseline {baseline['meta'].get('revision')}, current {current['meta'].get('revision')}")
+    comparisons = compare(baseline, current, args.threshold)
+    for comparison in comparisons:
+        old = format_seconds(comparison.baseline["median"]) if comparison.baseline else "-"
+        new = format_seconds(comparison.current["median"]) if comparison.current else "-"
+        ratio = f"{comparison.ratio:.2f}x" if comparison.ratio else ""
+        print(f"{comparison.name:<36} {old:>9} -> {new:>9} {ratio:>7}  {comparison.status}")
+    regressions = [c for c in comparisons if c.status == "regression"]
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Page object micro-benchmarks.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="Run the benchmarks against the local fake site.")
+    run.add_argument("--browser", default="chromium", choices=["chromium", "firefox", "webkit"])
+    run.add_argument("--headed", action="store_true", help="Run the browser headed.")
+    run.add_argument("-k", help="Only run the benchmarks whose name contains this.")
+    run.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS, help="Web table sizes to benchmark.")
+    run.add_argument("--warmup", type=int, default=3, help="Untimed calls before calibrating, defaults to 3.")
+    run.add_argument("--repeat", type=int, default=10, help="Samples per benchmark, defaults to 10.")
+    run.add_argument(
+        "--min-time",
+        type=float,
+        default=MIN_SAMPLE_TIME,
+        help=f"Minimum seconds per sample, defaults to {MIN_SAMPLE_TIME}.",
+    )
+    run.add_argument("--output", default=LATEST_PATH, help=f"Results file, defaults to {LATEST_PATH}.")
+    run.add_argument("--baseline", default=BASELINE_PATH, help=f"Baseline file, defaults to {BASELINE_PATH}.")
+    run.add_argument("--save-baseline", action="store_true", help="Also save the results as the baseline.")
+    comparison = commands.add_parser("compare", help="Compare results to the baseline.")
+    comparison.add_argument("current", nargs="?", default=LATEST_PATH, help=f"Results file, defaults to {LATEST_PATH}.")
+    comparison.add_argument("--baseline", default=BASELINE_PATH, help=f"Baseline file, defaults to {BASELINE_PATH}.")
+    comparison.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Relative slowdown of the median that counts as a regression, defaults to 0.1.",
+    )
+    args = parser.parse_args(argv)
+    return {"run": _run, "compare": _compare}[args.command](args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""The page object operations that are benchmarked.
+
+Each case gets a fresh page on the fake site, does its setup (usually a
+navigation) and returns the operation to time. Operations must leave the page
+in a state where they can run again.
+"""
+from itertools import cycle
+from typing import Callable, List, NamedTuple
+
+from playwright.sync_api import Page
+
+from pages.accessibility_page import AccessibilityPage
+from pages.responsive_page import ResponsivePage
+from pages.text_box_page import TextBoxPage
+from pages.web_tables_page import WebTablesPage
+
+DEFAULT_ROWS = [100, 1000, 10000]
+
+FORM_DATA = {
+    "full_name": "John Doe",
+    "email": "john.doe@example.com",
+    "current_address": "123 Main Street, City",
+    "permanent_address": "456 Oak Avenue, Town",
+}
+# Matches one seeded row, a tenth of the generated ones, a sixth of them, and all
+SEARCH_TERMS = ["Cierra", "Ada", "Engineering", ""]
+
+
+class Case(NamedTuple):
+    """A benchmark: its name and a setup returning the operation to time."""
+
+    name: str
+    setup: Callable[[Page], Callable[[], object]]
+
+
+def _navigate(page: Page):
+    text_box_page = TextBoxPage(page)
+    return text_box_page.navigate
+
+
+def _fill_form(page: Page):
+    text_box_page = TextBoxPage(page)
+    text_box_page.navigate()
+    return lambda: text_box_page.fill_form(**FORM_DATA)
+
+
+def _fill_form_per_field(page: Page):
+    # What fill_form did before fill_many, one Locator.fill per field
+    text_box_page = TextBoxPage(page)
+    text_box_page.navigate()
+    locators = {name: page.locator(selector) for name, selector in TextBoxPage.form_fields.items()}
+
+    def fill():
+        for name, value in FORM_DATA.items():
+            locators[name].fill(value)
+
+    return fill
+
+
+def _web_tables(page: Page, rows: int) -> WebTablesPage:
+    tables_page = WebTablesPage(page)
+    # Every row in the DOM: the operations scale with the table, not a page of it
+    tables_page.url = f"{tables_page.url}?rows={rows}&pageSize=0"
+    tables_page.navigate()
+    return tables_page
+
+
+def _row_count(rows: int):
+    def setup(page: Page):
+        return _web_tables(page, rows).get_table_row_count
+
+    return setup
+
+
+def _search(rows: int):
+    def setup(page: Page):
+        tables_page = _web_tables(page, rows)
+        terms = cycle(SEARCH_TERMS)
+        return lambda: tables_page.search(next(terms))
+
+    return setup
+
+
+def _audit(page: Page):
+    a11y_page = AccessibilityPage(page)
+    a11y_page.navigate_to_text_box()
+    return a11y_page.run_audit
+
+
+def _form_labels(page: Page):
+    a11y_page = AccessibilityPage(page)
+    a11y_page.navigate_to_text_box()
+    return lambda: [a11y_page.check_form_labels(field_id) for field_id in ("userName", "userEmail")]
+
+
+def _keyboard_navigation(page: Page):
+    a11y_page = AccessibilityPage(page)
+    a11y_page.navigate_to_text_box()
+    return lambda: a11y_page.keyboard_navigation_test("#userName", 4)
+
+
+def _viewport_switch(page: Page):
+    responsive_page = ResponsivePage(page)
+    responsive_page.navigate_to_text_box()
+    devices = cycle(ResponsivePage.VIEWPORTS)
+    return lambda: responsive_page.set_viewport(next(devices))
+
+
+def cases(rows: List[int] = DEFAULT_ROWS) -> List[Case]:
+    """Return every benchmark, the web table ones once per row count."""
+    return [
+        Case("navigate[text-box]", _navigate),
+        Case("fill_form", _fill_form),
+        Case("fill_form[per-field]", _fill_form_per_field),
+        *(Case(f"get_table_row_count[rows={n}]", _row_count(n)) for n in rows),
+        *(Case(f"search[rows={n}]", _search(n)) for n in rows),
+        Case("run_audit", _audit),
+        Case("check_form_labels", _form_labels),
+        Case("keyboard_navigation_test[tabs=4]", _keyboard_navigation),
+        Case("set_viewport", _viewport_switch),
+    ]
@@ -0,0 +1,107 @@
+"""Timing, statistics and comparison of benchmark results."""
+import statistics
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from harness.durations import percentile
+
+# Loops per sample are raised until a sample takes at least this long, so the
+# timer's resolution and per-sample overhead do not show in the results
+MIN_SAMPLE_TIME = 0.05
+MAX_LOOPS = 1 << 16
+
+
+def calibrate(func: Callable[[], object], min_time: float = MIN_SAMPLE_TIME) -> int:
+    """Return the number of loops a sample of ``func`` needs to take ``min_time``."""
+    loops = 1
+    while loops < MAX_LOOPS:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        # Jump close to the target rather than doubling from 1 every time
+        loops = min(max(loops * 2, int(loops * min_time / max(elapsed, 1e-9) * 1.2)), MAX_LOOPS)
+    return loops
+
+
+def measure(func: Callable[[], object], warmup: int = 3, repeat: int = 10,
+            min_time: float = MIN_SAMPLE_TIME) -> dict:
+    """Time ``func``: warm it up, calibrate the loops, and take ``repeat`` samples.
+
+    Returns the seconds per call of each sample, the loops per sample and
+    their summary.
+    """
+    for _ in range(warmup):
+        func()
+    loops = calibrate(func, min_time)
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        samples.append((time.perf_counter() - start) / loops)
+    return {"loops": loops, "samples": samples, "stats": summarize(samples)}
+
+
+def summarize(samples: List[float]) -> dict:
+    median = statistics.median(samples)
+    return {
+        "min": min(samples),
+        "max": max(samples),
+        "mean": statistics.fmean(samples),
+        "median": median,
+        "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "p95": percentile(samples, 95),
+        "iqr": percentile(samples, 75) - percentile(samples, 25),
+        "ops_per_sec": 1 / median if median else None,
+    }
+
+
+class Comparison(NamedTuple):
+    """A benchmark's result in the baseline and in the current run."""
+
+    name: str
+    baseline: Optional[dict]  # stats
+    current: Optional[dict]  # stats
+    status: str  # regression, improvement, unchanged, new or missing
+
+    @property
+    def ratio(self) -> Optional[float]:
+        if not self.baseline or not self.current:
+            return None
+        return self.current["median"] / self.baseline["median"]
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.1) -> List[Comparison]:
+    """Compare two result files benchmark by benchmark.
+
+    A benchmark regressed when its median is more than ``threshold`` slower and
+    its fastest sample is slower than the baseline median, so that one noisy
+    run is not enough.
+    """
+    before: Dict[str, dict] = {result["name"]: result["stats"] for result in baseline["results"]}
+    after: Dict[str, dict] = {result["name"]: result["stats"] for result in current["results"]}
+    comparisons = []
+    for name in list(before) + [name for name in after if name not in before]:
+        old, new = before.get(name), after.get(name)
+        if old is None:
+            status = "new"
+        elif new is None:
+            status = "missing"
+        elif new["median"] > old["median"] * (1 + threshold) and new["min"] > old["median"]:
+            status = "regression"
+        elif new["median"] < old["median"] * (1 - threshold) and new["max"] < old["median"]:
+            status = "improvement"
+        else:
+            status = "unchanged"
+        comparisons.append(Comparison(name, old, new, status))
+    return comparisons
+
+
+def format_seconds(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f}{unit}"
+    return f"{seconds / 1e-9:.0f}ns"
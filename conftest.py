@@ -1,42 +1,169 @@
 import pytest
-from playwright.sync_api import Page, BrowserContext
+from playwright.sync_api import Browser, BrowserContext, Page
 
+from harness.utils import node_slug
+from pages.base_page import BasePage
 
-@pytest.fixture(scope="function")
-def page(context: BrowserContext) -> Page:
-    """Create a new page for each test."""
-    page = context.new_page()
+# pytest imports these with assertion rewriting, so nothing imports them
+# before their turn: a plugin comes after the plugins it imports, and the
+# fixtures below import from them when they run.
+pytest_plugins = [
+    "harness.network",
+    "harness.page_pool",
+    "harness.resource_blocking",
+    "harness.durations",
+    "harness.scheduler",
+    "harness.async_driver",
+    "harness.screenshots",
+    "harness.visual",
+    "harness.artifacts",
+    "harness.reruns",
+    "harness.browserd",
+    "harness.fake_site",
+    "harness.storage_state",
+    "harness.perf",
+    "harness.profiler",
+    "harness.soak",
+    "harness.results_feed",
+    "harness.impact",
+    "harness.url_groups",
+]
+
+
+def configure_page(page: Page):
+    """Apply the suite-wide page settings."""
     # Set default timeout to 60 seconds for flaky demoqa.com
     page.set_default_timeout(60000)
     # Set default navigation timeout to 90 seconds
     page.set_default_navigation_timeout(90000)
+
+
+@pytest.fixture(scope="session")
+def base_url(base_url, request):
+    """The site under test; --base-url=fake starts the local fake DemoQA."""
+    from harness.fake_site import FAKE_BASE_URL
+
+    if base_url == FAKE_BASE_URL:
+        return request.getfixturevalue("fake_site").url
+    return base_url
+
+
+@pytest.fixture(scope="session", autouse=True)
+def page_object_base_url(base_url):
+    """Point the page objects at the site under test."""
+    if base_url:
+        BasePage.base_url = base_url.rstrip("/")
+
+
+@pytest.fixture(scope="session")
+def connect_options(browser_name, browser_type_launch_args, pytestconfig):
+    """Connect to the browser daemon when it serves this browser, launch one otherwise."""
+    from harness.browserd import connect_options_for
+
+    if pytestconfig.getoption("no_browserd"):
+        return None
+    return connect_options_for(browser_name, browser_type_launch_args)
+
+
+@pytest.fixture(scope="session")
+def page_pool(browser: Browser, browser_context_args, pytestconfig, request):
+    """Session-wide pool of warm pages, used with --page-pool and --group-by-url."""
+    from harness.page_pool import PagePool
+
+    # A context that lives for the whole session cannot record per-test videos
+    context_args = {k: v for k, v in browser_context_args.items() if k != "record_video_dir"}
+    restore = None
+    if pytestconfig.getoption("group_by_url"):
+        restore = request.getfixturevalue("url_groups").restore
+    pool = PagePool(
+        lambda: browser.new_context(**context_args),
+        viewport=context_args.get("viewport"),
+        max_uses=pytestconfig.getoption("page_pool_max_uses"),
+        on_new_page=configure_page,
+        storage_state=context_args.get("storage_state"),
+        restore=restore,
+    )
+    yield pool
+    pool.close()
+
+
+@pytest.fixture(scope="session")
+def async_driver(browser_name, browser_type_launch_args, browser_context_args, connect_options, pytestconfig):
+    """Async Playwright on a background event loop, for tests that drive many pages at once."""
+    from harness.async_driver import AsyncDriver
+
+    context_args = {k: v for k, v in browser_context_args.items() if k != "record_video_dir"}
+    driver = AsyncDriver(
+        browser_name,
+        launch_args=browser_type_launch_args,
+        context_args=context_args,
+        connect_options=connect_options,
+        concurrency=pytestconfig.getoption("async_concurrency"),
+        on_new_page=configure_page,
+    )
+    driver.start()
+    yield driver
+    driver.close()
+
+
+@pytest.fixture(scope="function")
+def page(request, pytestconfig) -> Page:
+    """Create a new page for each test, or lease a warm one with --page-pool or --group-by-url."""
+    grouped = pytestconfig.getoption("group_by_url")
+    # Reruns of environmental failures get a fresh context instead of a pooled page
+    if (pytestconfig.getoption("page_pool") or grouped) and getattr(request.node, "execution_count", 1) == 1:
+        from harness.url_groups import page_url
+
+        pool = request.getfixturevalue("page_pool")
+        # A budgeted test measures a real navigation, so it does not take over a page left at its URL
+        budgeted = request.node.get_closest_marker("perf_budget") is not None
+        url = page_url(request.node) if grouped and not budgeted else None
+        if url:
+            # The page the previous test of the group left at its URL
+            url_groups = request.getfixturevalue("url_groups")
+            page = pool.acquire(prefer=lambda idle: url_groups.is_clean_at(idle, url))
+            url_groups.lease(page)
+        else:
+            page = pool.acquire()
+        yield page
+        rep_call = getattr(request.node, "rep_call", None)
+        pool.release(page, healthy=not (rep_call and rep_call.failed))
+        return
+    context: BrowserContext = request.getfixturevalue("context")
+    page = context.new_page()
+    configure_page(page)
     yield page
     page.close()
 
 
 @pytest.fixture(scope="session")
-def browser_context_args(browser_context_args):
+def browser_context_args(browser_context_args, storage_state):
     """Configure browser context settings."""
-    return {
+    context_args = {
         **browser_context_args,
         "viewport": {"width": 1920, "height": 1080},
     }
+    if storage_state:
+        # Start every context from the bootstrapped cookies and localStorage
+        context_args["storage_state"] = storage_state
+    return context_args
 
 
 @pytest.fixture(scope="function", autouse=True)
-def screenshot_on_failure(page: Page, request):
+def screenshot_on_failure(request, screenshot_writer):
     """Take screenshot on test failure."""
+    if "page" not in request.fixturenames:
+        yield
+        return
+    page: Page = request.getfixturevalue("page")
     yield
     if hasattr(request.node, 'rep_call') and request.node.rep_call.failed:
+        attempt = getattr(request.node, "execution_count", 1)
         try:
-            screenshot_path = f"screenshots/{request.node.name}.png"
-            page.screenshot(path=screenshot_path, timeout=5000)
+            # Only the capture happens here; encoding and writing are done in the background
+            screenshot_path = screenshot_writer.capture(
+                page, f"{node_slug(request.node.nodeid)}-attempt{attempt}", timeout=5000
+            )
             print(f"Screenshot saved: {screenshot_path}")
         except Exception as e:
             print(f"Failed to take screenshot: {e}")
-
-
-def pytest_runtest_makereport(item, call):
-    """Hook to capture test results for screenshot fixture."""
-    if call.when == "call":
-        item.rep_call = call
@@ -0,0 +1 @@
+"""pytest plugins and support code for the DemoQA test harness."""
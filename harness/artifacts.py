@@ -0,0 +1,240 @@
+"""Content-addressed store for the traces and videos pytest-playwright keeps.
+
+After every test, the traces and videos it left in ``--output`` are streamed
+into ``--artifact-store`` (``artifacts/`` by default) under the sha256 of their
+content, and the originals are deleted. Identical files are stored once, and
+files that still compress well are gzipped (trace zips and webm videos are
+stored as they are, so the report can link them).
+
+Two budgets bound the store:
+
+- ``--artifact-test-budget-mb``: a test's artifacts beyond it are dropped,
+  traces are kept before videos.
+- ``--artifact-run-budget-mb``: once the store grows past it, the least
+  recently used objects are evicted, oldest runs first.
+
+``index.json`` in the store maps each test of the run to its objects (or to
+why they were dropped or evicted). The HTML report links the stored files
+instead of embedding them.
+"""
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import time
+import urllib.parse
+import zlib
+from pathlib import Path
+
+import pytest
+
+CHUNK_SIZE = 1024 * 1024
+# Gzip a file only if a sample of it shrinks below this ratio
+COMPRESSIBLE_RATIO = 0.9
+# Keep the most useful artifacts when a test goes over budget
+KIND_PRIORITY = {"trace": 0, "video": 1}
+EXTRA_NAMES = {"trace": "Trace", "video": "Video"}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("artifact-store", "Artifact store")
+    group.addoption(
+        "--artifact-store",
+        default="artifacts",
+        help="Directory of the content-addressed trace and video store, defaults to artifacts.",
+    )
+    group.addoption(
+        "--artifact-run-budget-mb",
+        type=float,
+        default=500.0,
+        help="Size of the store past which least recently used objects are evicted, defaults to 500.",
+    )
+    group.addoption(
+        "--artifact-test-budget-mb",
+        type=float,
+        default=50.0,
+        help="Size of the artifacts kept for one test, defaults to 50.",
+    )
+
+
+def _is_compressible(path: str) -> bool:
+    with open(path, "rb") as f:
+        sample = f.read(64 * 1024)
+    return bool(sample) and len(zlib.compress(sample, 1)) < COMPRESSIBLE_RATIO * len(sample)
+
+
+class ArtifactStore:
+    """Stores files by content hash and evicts the least recently used ones."""
+
+    def __init__(self, root: str, run_budget: int, test_budget: int):
+        self.root = root
+        self.run_budget = run_budget
+        self.test_budget = test_budget
+        self.index_path = os.path.join(root, "index.json")
+        self.objects = {}
+        self.tests = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding="utf-8") as f:
+                self.objects = json.load(f).get("objects", {})
+
+    @property
+    def size(self) -> int:
+        return sum(entry["stored_size"] for entry in self.objects.values())
+
+    def add_test(self, nodeid: str, artifacts) -> list:
+        """Store a test's artifacts within its budget; return its index entries."""
+        entries = []
+        used = 0
+        for kind, path in sorted(artifacts, key=lambda artifact: KIND_PRIORITY.get(artifact[0], 99)):
+            if not os.path.exists(path):
+                continue
+            size = os.path.getsize(path)
+            if used + size > self.test_budget:
+                os.remove(path)
+                entries.append({"kind": kind, "dropped": "test-budget", "size": size})
+                continue
+            digest = self.put(path, kind)
+            used += size
+            entries.append({"kind": kind, "object": digest, "path": self.objects[digest]["path"]})
+        self.tests.setdefault(nodeid, []).extend(entries)
+        self.evict()
+        return entries
+
+    def put(self, path: str, kind: str) -> str:
+        """Move a file into the store and return its content hash."""
+        os.makedirs(self.root, exist_ok=True)
+        compress = _is_compressible(path)
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        with open(path, "rb") as src, os.fdopen(fd, "wb") as raw:
+            out = gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) if compress else raw
+            for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+                size += len(chunk)
+                out.write(chunk)
+            if compress:
+                out.close()
+        digest = digest.hexdigest()
+        name = digest + Path(path).suffix + (".gz" if compress else "")
+        relative = os.path.join("objects", digest[:2], name)
+        target = os.path.join(self.root, relative)
+        if digest in self.objects and os.path.exists(target):
+            os.remove(tmp_path)
+        else:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(tmp_path, target)
+            self.objects[digest] = {
+                "path": relative,
+                "kind": kind,
+                "size": size,
+                "stored_size": os.path.getsize(target),
+                "compressed": compress,
+            }
+        self.objects[digest]["last_used"] = time.time()
+        os.remove(path)
+        return digest
+
+    def evict(self):
+        """Remove least recently used objects until the store fits the run budget."""
+        total = self.size
+        for digest, entry in sorted(self.objects.items(), key=lambda item: item[1]["last_used"]):
+            if total <= self.run_budget:
+                break
+            try:
+                os.remove(os.path.join(self.root, entry["path"]))
+            except FileNotFoundError:
+                pass
+            total -= entry["stored_size"]
+            del self.objects[digest]
+            for entries in self.tests.values():
+                for test_entry in entries:
+                    if test_entry.get("object") == digest:
+                        test_entry["evicted"] = True
+
+    def write_index(self):
+        os.makedirs(self.root, exist_ok=True)
+        index = {"objects": self.objects, "tests": self.tests, "size": self.size}
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=1)
+        os.replace(tmp_path, self.index_path)
+
+
+class ArtifactIngester:
+    """Moves each test's kept traces and videos into the store."""
+
+    def __init__(self, config, store: ArtifactStore):
+        self.config = config
+        self.store = store
+
+    # Before pytest-html reads the report, so its extras can be rewritten
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_logreport(self, report):
+        if report.when != "teardown":
+            return
+        artifacts = [
+            (name[len("playwright_"):], self._absolute(value))
+            for name, value in report.user_properties
+            if name in ("playwright_trace", "playwright_video")
+        ]
+        if not artifacts:
+            return
+        entries = self.store.add_test(report.nodeid, artifacts)
+        report.user_properties = [
+            (name, value)
+            for name, value in report.user_properties
+            if name not in ("playwright_trace", "playwright_video")
+        ]
+        report.user_properties.extend(
+            (f"playwright_{entry['kind']}", os.path.join(self.store.root, entry["path"]))
+            for entry in entries
+            if "path" in entry
+        )
+        self._relink_extras(report, entries)
+
+    def pytest_sessionfinish(self, session):
+        self.store.write_index()
+
+    def pytest_terminal_summary(self, terminalreporter):
+        dropped = sum(
+            1 for entries in self.store.tests.values() for entry in entries if "dropped" in entry or entry.get("evicted")
+        )
+        if self.store.tests:
+            terminalreporter.write_line(
+                f"artifacts: {len(self.store.objects)} objects, {self.store.size / 2**20:.1f} MB "
+                f"in {self.store.root}, {dropped} dropped or evicted"
+            )
+
+    def _absolute(self, path: str) -> str:
+        return str(Path(self.config.invocation_params.dir, path))
+
+    def _relink_extras(self, report, entries):
+        extras = getattr(report, "extras", None)
+        pytest_html = self.config.pluginmanager.getplugin("html")
+        html_path = getattr(self.config.option, "htmlpath", None)
+        if extras is None or pytest_html is None or not html_path:
+            return
+        # pytest-playwright embeds videos in self-contained reports; link the stored copies instead
+        names = set(EXTRA_NAMES.values())
+        report.extras = [extra for extra in extras if extra.get("name") not in names]
+        html_dir = Path(self.config.invocation_params.dir, os.path.expandvars(html_path)).parent
+        for entry in entries:
+            if "path" not in entry or entry["kind"] not in EXTRA_NAMES:
+                continue
+            stored = Path(self.config.invocation_params.dir, self.store.root, entry["path"])
+            link = urllib.parse.quote(Path(os.path.relpath(stored, html_dir)).as_posix())
+            report.extras.append(pytest_html.extras.url(link, name=EXTRA_NAMES[entry["kind"]]))
+
+
+def pytest_configure(config):
+    # xdist workers report to the controller, which owns the store
+    if hasattr(config, "workerinput"):
+        return
+    store = ArtifactStore(
+        config.getoption("artifact_store"),
+        run_budget=int(config.getoption("artifact_run_budget_mb") * 2**20),
+        test_budget=int(config.getoption("artifact_test_budget_mb") * 2**20),
+    )
+    config.pluginmanager.register(ArtifactIngester(config, store), "artifact-ingester")
@@ -0,0 +1,121 @@
+"""Async Playwright driver for tests that drive many pages at once.
+
+pytest-playwright's fixtures are synchronous and own the main thread, so the
+async driver runs its own Playwright instance and event loop on a background
+thread. Tests hand it coroutines and block on their results:
+
+    results = async_driver.map(check_viewport, ResponsivePage.VIEWPORTS)
+
+``map`` opens one browser context per item, runs the coroutine for every item
+concurrently (at most ``--async-concurrency`` at a time) and returns the
+results in order. The page objects in ``pages.aio`` are the async twins of
+the ones in ``pages``.
+"""
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from playwright.async_api import Browser, Page, Playwright, async_playwright
+
+
+def pytest_addoption(parser):
+    parser.getgroup("async-driver", "Async driver").addoption(
+        "--async-concurrency",
+        type=int,
+        default=4,
+        help="Number of pages the async driver runs at the same time, defaults to 4.",
+    )
+
+
+class AsyncDriver:
+    """Runs async Playwright on a background event loop."""
+
+    def __init__(
+        self,
+        browser_name: str,
+        launch_args: Dict,
+        context_args: Dict,
+        connect_options: Optional[Dict] = None,
+        concurrency: int = 4,
+        on_new_page: Optional[Callable[[Page], None]] = None,
+    ):
+        self._browser_name = browser_name
+        self._launch_args = launch_args
+        self._context_args = context_args
+        self._connect_options = connect_options
+        self._concurrency = concurrency
+        self._on_new_page = on_new_page
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="async-driver", daemon=True)
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+
+    @property
+    def browser(self) -> Optional[Browser]:
+        return self._browser
+
+    def start(self):
+        self._thread.start()
+        self.run(self._start())
+
+    def close(self):
+        """Close the browser, stop Playwright and the event loop."""
+        if not self._thread.is_alive():
+            return
+        try:
+            self.run(self._close())
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+
+    def run(self, coro: Awaitable) -> Any:
+        """Run a coroutine on the driver's loop and return its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    async def new_page(self, **context_args) -> Page:
+        """Open a page in a new browser context; close ``page.context`` when done."""
+        context = await self._browser.new_context(**{**self._context_args, **context_args})
+        page = await context.new_page()
+        if self._on_new_page:
+            self._on_new_page(page)
+        return page
+
+    def map(self, func: Callable[[Page, Any], Awaitable], items: Iterable) -> List:
+        """Run ``func(page, item)`` on its own page for every item, concurrently.
+
+        Results come back in the order of the items. The first exception is
+        raised once every item has finished.
+        """
+        return self.run(self._map(func, list(items)))
+
+    async def _map(self, func, items):
+        semaphore = asyncio.Semaphore(self._concurrency)
+
+        async def run_one(item):
+            async with semaphore:
+                page = await self.new_page()
+                try:
+                    return await func(page, item)
+                finally:
+                    await page.context.close()
+
+        results = await asyncio.gather(*(run_one(item) for item in items), return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return results
+
+    async def _start(self):
+        self._playwright = await async_playwright().start()
+        browser_type = getattr(self._playwright, self._browser_name)
+        if self._connect_options:
+            self._browser = await browser_type.connect(**self._connect_options)
+        else:
+            self._browser = await browser_type.launch(**self._launch_args)
+
+    async def _close(self):
+        if self._browser:
+            await self._browser.close()
+        if self._playwright:
+            await self._playwright.stop()
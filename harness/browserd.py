@@ -0,0 +1,303 @@
+"""Browser server daemon shared by pytest runs.
+
+Launching a browser is the slowest part of running a single test. The daemon
+launches browsers once, as Playwright browser servers, and pytest connects to
+them instead of launching its own:
+
+    python -m harness.browserd start --browser chromium --headed
+    pytest tests/test_buttons.py -k double    # connects to the running chromium
+    python -m harness.browserd status
+    python -m harness.browserd stop
+
+The daemon writes its endpoints to ``.harness/browserd.json``. The conftest
+``connect_options`` fixture uses a running daemon when it serves the requested
+browser with the same headed/headless mode and channel, and launches a browser
+as usual otherwise (or always, with ``--no-browserd``). ``--slowmo`` still
+applies: it is a connection option.
+
+Every few seconds the daemon checks that each browser server is alive and
+accepting connections, and restarts the ones that crashed or stopped answering.
+"""
+import argparse
+import json
+import os
+import queue
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+STATE_PATH = os.path.join(".harness", "browserd.json")
+LOG_PATH = os.path.join(".harness", "browserd.log")
+HEALTH_INTERVAL = 5.0
+START_TIMEOUT = 60.0
+# Time a browser server gets to print its endpoint
+SERVER_START_TIMEOUT = 30.0
+
+
+def pytest_addoption(parser):
+    parser.getgroup("browserd", "Browser daemon").addoption(
+        "--no-browserd",
+        action="store_true",
+        default=False,
+        help="Launch browsers even when the browser daemon is running.",
+    )
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def read_state(path: str = STATE_PATH) -> Optional[dict]:
+    """Return the running daemon's state, or None when no daemon is running."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    return state if _pid_alive(state["pid"]) else None
+
+
+def connect_options_for(browser_name: str, launch_args: Dict, path: str = STATE_PATH) -> Optional[Dict]:
+    """Return pytest-playwright connect options for a matching daemon browser."""
+    state = read_state(path)
+    if state is None:
+        return None
+    server = state["browsers"].get(browser_name)
+    if (
+        server is None
+        or server["headless"] != launch_args.get("headless", True)
+        or server["channel"] != launch_args.get("channel")
+    ):
+        return None
+    options = {"ws_endpoint": server["ws_endpoint"]}
+    if launch_args.get("slow_mo"):
+        options["slow_mo"] = launch_args["slow_mo"]
+    return options
+
+
+class BrowserServer:
+    """A Playwright browser server, run by the ``playwright launch-server`` CLI."""
+
+    def __init__(self, browser: str, headless: bool, channel: Optional[str]):
+        self.browser = browser
+        self.headless = headless
+        self.channel = channel
+        self.process: Optional[subprocess.Popen] = None
+        self.ws_endpoint: Optional[str] = None
+        self.restarts = 0
+
+    def start(self):
+        options = {"headless": self.headless}
+        if self.channel:
+            options["channel"] = self.channel
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as config:
+            json.dump(options, config)
+        try:
+            # Its own process group: the CLI runs the server in a Node.js child,
+            # and stop() signals both
+            self.process = subprocess.Popen(
+                [sys.executable, "-m", "playwright", "launch-server", "--browser", self.browser,
+                 "--config", config.name],
+                stdout=subprocess.PIPE,
+                text=True,
+                start_new_session=True,
+            )
+            first_line = queue.Queue()
+            threading.Thread(
+                target=self._forward_output, args=(self.process, first_line), name=f"{self.browser}-server", daemon=True
+            ).start()
+            # The server has read its config once it prints its endpoint
+            try:
+                line = first_line.get(timeout=SERVER_START_TIMEOUT)
+            except queue.Empty:
+                line = f"no endpoint within {SERVER_START_TIMEOUT:.0f}s"
+        finally:
+            os.unlink(config.name)
+        if not line or not line.startswith("ws://"):
+            self.stop()
+            raise RuntimeError(f"{self.browser} server did not start: {line or self.process.poll()}")
+        self.ws_endpoint = line
+
+    def _forward_output(self, process: subprocess.Popen, first_line: queue.Queue):
+        # Hands the endpoint to start(), then copies the rest to the daemon's log,
+        # so a full pipe never blocks the server
+        first_line.put(process.stdout.readline().strip())
+        for line in process.stdout:
+            print(f"{self.browser} server: {line.rstrip()}", flush=True)
+
+    def is_healthy(self) -> bool:
+        if self.process is None or self.process.poll() is not None:
+            return False
+        address = urlsplit(self.ws_endpoint)
+        try:
+            with socket.create_connection((address.hostname, address.port), timeout=2):
+                return True
+        except OSError:
+            return False
+
+    def restart(self):
+        self.stop()
+        self.restarts += 1
+        self.start()
+
+    def stop(self):
+        if self.process is None or self.process.poll() is not None:
+            return
+        os.killpg(self.process.pid, signal.SIGTERM)
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            os.killpg(self.process.pid, signal.SIGKILL)
+            self.process.wait()
+
+    def state(self) -> dict:
+        return {
+            "ws_endpoint": self.ws_endpoint,
+            "pid": self.process.pid if self.process else None,
+            "headless": self.headless,
+            "channel": self.channel,
+            "restarts": self.restarts,
+        }
+
+
+class Daemon:
+    """Keeps browser servers running and their endpoints in the state file."""
+
+    def __init__(self, servers: List[BrowserServer], state_path: str = STATE_PATH):
+        self.servers = servers
+        self.state_path = state_path
+        self._running = True
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+        try:
+            for server in self.servers:
+                server.start()
+            self._write_state()
+            while self._running:
+                time.sleep(HEALTH_INTERVAL)
+                self.check()
+        finally:
+            for server in self.servers:
+                server.stop()
+            if os.path.exists(self.state_path):
+                os.remove(self.state_path)
+
+    def check(self):
+        """Restart every browser server that is not healthy."""
+        restarted = False
+        for server in self.servers:
+            if self._running and not server.is_healthy():
+                print(f"{server.browser} server is not responding, restarting it", flush=True)
+                server.restart()
+                restarted = True
+        if restarted:
+            self._write_state()
+
+    def _stop(self, signum, frame):
+        self._running = False
+
+    def _write_state(self):
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        state = {
+            "pid": os.getpid(),
+            "started": time.time(),
+            "browsers": {server.browser: server.state() for server in self.servers},
+        }
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=1)
+        os.replace(tmp_path, self.state_path)
+
+
+def _start(args) -> int:
+    if read_state(args.state) is not None:
+        print("browser daemon is already running")
+        return _status(args)
+    command = [sys.executable, "-m", "harness.browserd", "--state", args.state, "run", "--browser", *args.browser]
+    if args.headed:
+        command.append("--headed")
+    if args.channel:
+        command += ["--channel", args.channel]
+    os.makedirs(os.path.dirname(LOG_PATH), exist_ok=True)
+    with open(LOG_PATH, "a") as log:
+        process = subprocess.Popen(command, stdout=log, stderr=log, start_new_session=True)
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            print(f"browser daemon failed to start, see {LOG_PATH}")
+            return 1
+        if read_state(args.state) is not None:
+            return _status(args)
+        time.sleep(0.2)
+    print(f"browser daemon did not start within {START_TIMEOUT:.0f}s, see {LOG_PATH}")
+    return 1
+
+
+def _run(args) -> int:
+    servers = [BrowserServer(browser, headless=not args.headed, channel=args.channel) for browser in args.browser]
+    Daemon(servers, args.state).run()
+    return 0
+
+
+def _status(args) -> int:
+    state = read_state(args.state)
+    if state is None:
+        print("browser daemon is not running")
+        return 1
+    print(f"browser daemon running (pid {state['pid']})")
+    for browser, server in state["browsers"].items():
+        mode = "headless" if server["headless"] else "headed"
+        print(f"  {browser} ({mode}): {server['ws_endpoint']}, {server['restarts']} restarts")
+    return 0
+
+
+def _stop(args) -> int:
+    state = read_state(args.state)
+    if state is None:
+        print("browser daemon is not running")
+        return 0
+    os.kill(state["pid"], signal.SIGTERM)
+    deadline = time.monotonic() + 15
+    while _pid_alive(state["pid"]) and time.monotonic() < deadline:
+        time.sleep(0.2)
+    print("browser daemon stopped")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m harness.browserd", description="Browser server daemon shared by pytest runs.")
+    parser.add_argument("--state", default=STATE_PATH, help=f"State file, defaults to {STATE_PATH}.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (("start", "Start the daemon in the background."), ("run", "Run the daemon in the foreground.")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument(
+            "--browser",
+            nargs="+",
+            default=["chromium"],
+            choices=["chromium", "firefox", "webkit"],
+            help="Browsers to serve, defaults to chromium.",
+        )
+        command.add_argument("--headed", action="store_true", help="Serve headed browsers.")
+        command.add_argument("--channel", help="Browser channel, e.g. chrome or msedge.")
+    commands.add_parser("status", help="Show the running daemon's browsers.")
+    commands.add_parser("stop", help="Stop the daemon.")
+    args = parser.parse_args(argv)
+    return {"start": _start, "run": _run, "status": _status, "stop": _stop}[args.command](args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
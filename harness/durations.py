@@ -0,0 +1,237 @@
+"""History of test durations, kept in a local JSONL file.
+
+Every finished test appends one record to ``--durations-store`` (by default
+``.harness/durations.jsonl``) with its setup, call and teardown durations, the
+total, its outcome, browser and number of reruns. At the end of a run the store
+is compacted to the last ``HISTORY_WINDOW`` records of each test. The parallel
+scheduler reads the history back to hand out the longest tests first.
+
+At the end of a run each test's total is compared to the rolling p50 of its
+previous runs; tests that got ``--duration-regression-factor`` times slower are
+listed in the terminal summary and at the top of the pytest-html report.
+"""
+import html
+import json
+import math
+import os
+import statistics
+import time
+from collections import defaultdict
+
+import pytest
+
+# Only the most recent runs describe how long a test takes today
+HISTORY_WINDOW = 20
+# A baseline needs a few runs before it means anything
+MIN_BASELINE_RUNS = 3
+# Ignore slowdowns smaller than this, whatever the factor, as timer noise
+MIN_REGRESSION_SECONDS = 0.5
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("durations-store", "Test duration history")
+    group.addoption(
+        "--durations-store",
+        default=os.path.join(".harness", "durations.jsonl"),
+        help="JSONL file with the duration history of each test, defaults to .harness/durations.jsonl.",
+    )
+    group.addoption(
+        "--duration-regression-factor",
+        type=float,
+        default=2.0,
+        help="Flag tests that take this many times their p50 duration, defaults to 2.0.",
+    )
+
+
+def percentile(values, q: float) -> float:
+    """Return the ``q``-th percentile (0-100) of ``values``, interpolating linearly."""
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+class DurationStore:
+    """JSONL store of per-test duration records, appended to and compacted after each run."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def append(self, record: dict):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+
+    def records(self):
+        """Yield the stored records, skipping lines cut short by a killed run."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+    def compact(self, window: int = HISTORY_WINDOW):
+        """Keep only the last ``window`` records of each test."""
+        runs = defaultdict(list)
+        for record in self.records():
+            runs[record["nodeid"]].append(record)
+        kept = [record for records in runs.values() for record in records[-window:]]
+        if not kept:
+            return
+        kept.sort(key=lambda record: record.get("timestamp", 0))
+        # Written next to the store and renamed, so a killed run never leaves half a file
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(record) + "\n" for record in kept)
+        os.replace(tmp_path, self.path)
+
+    def history(self, window: int = HISTORY_WINDOW) -> dict:
+        """Return the last ``window`` total durations of each test, oldest first."""
+        durations = defaultdict(list)
+        for record in self.records():
+            durations[record["nodeid"]].append(record["duration"])
+        return {nodeid: values[-window:] for nodeid, values in durations.items()}
+
+    def expected_durations(self) -> dict:
+        """Return the median recent duration of each test."""
+        return {nodeid: statistics.median(values) for nodeid, values in self.history().items()}
+
+    def stats(self, window: int = HISTORY_WINDOW) -> dict:
+        """Return rolling p50/p95 total durations and the number of runs per test."""
+        return {
+            nodeid: {
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+                "runs": len(values),
+            }
+            for nodeid, values in self.history(window).items()
+        }
+
+
+def slowdown_factor(regression: dict) -> float:
+    """Return how many times its p50 a flagged test took, infinite for a p50 of 0s."""
+    return regression["duration"] / regression["p50"] if regression["p50"] else math.inf
+
+
+def format_slowdown(regression: dict) -> str:
+    """Describe a flagged test's slowdown, e.g. ``3.2x``, or ``+0.80s`` for a p50 of 0s."""
+    factor = slowdown_factor(regression)
+    if math.isinf(factor):
+        return f"+{regression['duration']:.2f}s"
+    return f"{factor:.1f}x"
+
+
+class DurationRecorder:
+    """Appends a record to the store for every test and flags regressions."""
+
+    def __init__(self, store: DurationStore, regression_factor: float):
+        self.store = store
+        self.regression_factor = regression_factor
+        # Taken before this run adds to the store
+        self.baseline = store.stats()
+        self.regressions = []
+        # Records of tests that have not finished yet
+        self._runs = {}
+        # Tests whose current attempt is followed by a rerun
+        self._rerunning = set()
+
+    def pytest_runtest_logreport(self, report):
+        run = self._runs.setdefault(
+            report.nodeid,
+            {
+                "nodeid": report.nodeid,
+                "setup": 0.0,
+                "call": 0.0,
+                "teardown": 0.0,
+                "outcome": "passed",
+                "browser": getattr(report, "browser_name", None),
+                "reruns": 0,
+            },
+        )
+        attempt = getattr(report, "rerun", 0)
+        if attempt > run["reruns"]:
+            # Only the last attempt says how long the test takes, the earlier ones are counted
+            run.update(setup=0.0, call=0.0, teardown=0.0, outcome="passed", reruns=attempt)
+        run[report.when] += report.duration
+        if report.outcome == "rerun":
+            run["outcome"] = "passed"
+            self._rerunning.add(report.nodeid)
+        elif report.failed:
+            run["outcome"] = "failed" if report.when == "call" else "error"
+        elif report.skipped and run["outcome"] == "passed":
+            run["outcome"] = "xfailed" if hasattr(report, "wasxfail") else "skipped"
+
+    def pytest_runtest_logfinish(self, nodeid, location):
+        # Every attempt finishes, the record waits for the last one
+        if nodeid in self._rerunning:
+            self._rerunning.discard(nodeid)
+            return
+        run = self._runs.pop(nodeid, None)
+        if run is None:
+            return
+        for phase in ("setup", "call", "teardown"):
+            run[phase] = round(run[phase], 4)
+        run["duration"] = round(run["setup"] + run["call"] + run["teardown"], 4)
+        run["timestamp"] = time.time()
+        self.store.append(run)
+        self._check_regression(run)
+
+    def _check_regression(self, run: dict):
+        baseline = self.baseline.get(run["nodeid"])
+        if run["outcome"] != "passed" or not baseline or baseline["runs"] < MIN_BASELINE_RUNS:
+            return
+        duration = run["duration"]
+        if (
+            duration >= self.regression_factor * baseline["p50"]
+            and duration - baseline["p50"] >= MIN_REGRESSION_SECONDS
+        ):
+            self.regressions.append({**baseline, "nodeid": run["nodeid"], "duration": duration})
+
+    def pytest_sessionfinish(self, session):
+        # The older records no longer count, and the store would grow with every run
+        self.store.compact()
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.regressions:
+            return
+        terminalreporter.section("duration regressions", yellow=True)
+        for regression in sorted(self.regressions, key=slowdown_factor, reverse=True):
+            terminalreporter.line(
+                f"{regression['nodeid']}: {regression['duration']:.2f}s "
+                f"(p50 {regression['p50']:.2f}s, p95 {regression['p95']:.2f}s "
+                f"over {regression['runs']} runs, {format_slowdown(regression)})"
+            )
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_html_results_summary(self, prefix, summary, postfix):
+        if not self.regressions:
+            return
+        rows = "".join(
+            f"<li>{html.escape(r['nodeid'])}: {r['duration']:.2f}s "
+            f"(p50 {r['p50']:.2f}s, p95 {r['p95']:.2f}s, {format_slowdown(r)})</li>"
+            for r in self.regressions
+        )
+        prefix.append(f"<h3>Duration regressions</h3><ul>{rows}</ul>")
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    # Travels with the report to the xdist controller
+    callspec = getattr(item, "callspec", None)
+    outcome.get_result().browser_name = callspec.params.get("browser_name") if callspec else None
+
+
+def pytest_configure(config):
+    # xdist workers report to the controller, which writes the store alone
+    if hasattr(config, "workerinput"):
+        return
+    store = DurationStore(config.getoption("durations_store"))
+    recorder = DurationRecorder(store, config.getoption("duration_regression_factor"))
+    config.pluginmanager.register(recorder, "duration-recorder")
@@ -0,0 +1,164 @@
+"""Local fake of the DemoQA pages the page objects drive.
+
+The fake serves ``/text-box``, ``/buttons``, ``/alerts`` and ``/webtables``
+with the element ids, texts and behavior the page objects and tests rely on,
+from static files and the standard library only. Its web table can be seeded
+with any number of rows, to measure how page object operations scale with the
+size of the data:
+
+    pytest --base-url=fake                           # one server per worker, on a free port
+    pytest --base-url=fake --fake-site-rows=50000 --fake-site-page-size=100
+    python -m harness.fake_site --port 8000 --rows 100000
+
+``--fake-site-rows`` defaults to the 3 records demoqa.com starts with and
+``--fake-site-page-size`` to its 10 rows per page; 0 shows all rows on one
+page. A single page load can override both with the ``rows`` and ``pageSize``
+query parameters, e.g. ``/webtables?rows=10000&pageSize=0``. Like on
+demoqa.com, table edits live in the page and are gone after a reload.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from string import Template
+from typing import Optional, Tuple
+from urllib.parse import urlsplit
+
+import pytest
+
+# The --base-url value that starts the fake
+FAKE_BASE_URL = "fake"
+DEFAULT_ROWS = 3
+DEFAULT_PAGE_SIZE = 10
+STATIC_DIR = os.path.join(os.path.dirname(__file__), "static")
+# Path -> page content file and heading
+PAGES = {
+    "/": ("index.html", "DEMOQA"),
+    "/text-box": ("text-box.html", "Text Box"),
+    "/buttons": ("buttons.html", "Buttons"),
+    "/alerts": ("alerts.html", "Alerts"),
+    "/webtables": ("webtables.html", "Web Tables"),
+}
+ASSETS = {
+    "/static/site.css": ("site.css", "text/css; charset=utf-8"),
+}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("fake-site", "Fake DemoQA server")
+    group.addoption(
+        "--fake-site-rows",
+        type=int,
+        default=DEFAULT_ROWS,
+        help=f"Rows the fake web table starts with (--base-url={FAKE_BASE_URL}), defaults to {DEFAULT_ROWS}.",
+    )
+    group.addoption(
+        "--fake-site-page-size",
+        type=int,
+        default=DEFAULT_PAGE_SIZE,
+        help=f"Rows per page of the fake web table, 0 for all, defaults to {DEFAULT_PAGE_SIZE}.",
+    )
+
+
+def _read(name: str) -> str:
+    with open(os.path.join(STATIC_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+class FakeSite:
+    """The fake DemoQA server, serving from a background thread."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, rows: int = DEFAULT_ROWS,
+                 page_size: int = DEFAULT_PAGE_SIZE):
+        config = json.dumps({"rows": rows, "pageSize": page_size})
+        layout = Template(_read("layout.html"))
+        # Rendered once: the pages only change with the server's settings
+        self.responses = {
+            path: (
+                layout.substitute(title=title, content=_read(name), config=config).encode(),
+                "text/html; charset=utf-8",
+            )
+            for path, (name, title) in PAGES.items()
+        }
+        for path, (name, content_type) in ASSETS.items():
+            self.responses[path] = (_read(name).encode(), content_type)
+        handler = type("FakeSiteHandler", (_Handler,), {"site": self})
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def response(self, path: str) -> Optional[Tuple[bytes, str]]:
+        return self.responses.get(path.rstrip("/") or "/")
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name="fake-site", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    site: FakeSite
+    # Keep-alive, like a real web server
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        response = self.site.response(urlsplit(self.path).path)
+        if response is None:
+            body, content_type, status = b"Not Found", "text/plain; charset=utf-8", 404
+        else:
+            (body, content_type), status = response, 200
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="session")
+def fake_site(pytestconfig):
+    """The fake DemoQA server, started on a free port."""
+    site = FakeSite(
+        rows=pytestconfig.getoption("fake_site_rows"),
+        page_size=pytestconfig.getoption("fake_site_page_size"),
+    )
+    site.start()
+    yield site
+    site.stop()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="demoqa-fake-site", description="Serve the fake DemoQA pages.")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on, defaults to 127.0.0.1.")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on, defaults to 8000.")
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS, help="Rows the web table starts with.")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE, help="Rows per page, 0 for all.")
+    args = parser.parse_args(argv)
+    site = FakeSite(args.host, args.port, rows=args.rows, page_size=args.page_size)
+    print(f"fake DemoQA serving on {site.url} (pytest --base-url={site.url})", flush=True)
+    try:
+        site.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        site.server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,5 @@
+import sys
+
+from harness.fake_site import main
+
+sys.exit(main())
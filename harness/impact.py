@@ -0,0 +1,341 @@
+"""Test impact analysis keyed on the page objects.
+
+Every run records, per test, the page object modules and methods it called and
+the URL paths it navigated to through a page object, and merges them into
+``--impact-map`` (``.harness/impact.json``). Browser parametrizations share an
+entry: a test touches the same page objects in every browser.
+
+``--affected-since=<ref>`` then runs only the tests a change can affect, from
+``git diff <ref>`` plus untracked files:
+
+- a changed test module selects its tests
+- a change inside a page object method selects the tests that called that
+  method; any other change to a page object module selects every test that
+  touched the module
+- a changed fake DemoQA page selects the tests that navigated to it
+- files matched by the ``impact_ignore`` ini globs (docs, workflows) select
+  nothing, and any other change (conftest, harness, requirements, ...) selects
+  every test
+
+Tests missing from the map always run, and so does everything when there is
+no map yet. ``--no-impact-record`` leaves the map alone.
+"""
+import ast
+import fnmatch
+import functools
+import importlib
+import inspect
+import json
+import os
+import pkgutil
+import re
+import subprocess
+from typing import Dict, List, Optional, Set
+from urllib.parse import urlsplit
+
+import pytest
+
+import pages
+from harness.fake_site import PAGES as FAKE_SITE_PAGES, STATIC_DIR as FAKE_SITE_STATIC_DIR
+from pages.aio.base_page import BasePage as AsyncBasePage, NavigationListener as AsyncNavigationListener
+from pages.base_page import BasePage, NavigationListener
+
+MAP_VERSION = 1
+BROWSERS = ("chromium", "firefox", "webkit")
+DEFAULT_IGNORE = ["*.md", "LICENSE", ".gitignore", ".github/*", ".dockerignore"]
+HUNK_HEADER = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+_touches_key = pytest.StashKey["Touches"]()
+# The touches of the test that is running, None between tests
+_current: Optional["Touches"] = None
+_instrumented = False
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("impact", "Test impact analysis")
+    group.addoption(
+        "--affected-since",
+        default=None,
+        metavar="REF",
+        help="Only run the tests affected by the changes since this git ref.",
+    )
+    group.addoption(
+        "--impact-map",
+        default=os.path.join(".harness", "impact.json"),
+        help="Page objects, methods and URLs touched by each test, defaults to .harness/impact.json.",
+    )
+    group.addoption(
+        "--no-impact-record",
+        action="store_true",
+        default=False,
+        help="Do not record what the tests touch into the impact map.",
+    )
+    parser.addini(
+        "impact_ignore",
+        type="linelist",
+        default=DEFAULT_IGNORE,
+        help="Globs of changed files that affect no test with --affected-since.",
+    )
+
+
+def impact_key(nodeid: str) -> str:
+    """Return ``nodeid`` without its browser parametrization."""
+    path, bracket, params = nodeid.partition("[")
+    if not bracket:
+        return nodeid
+    kept = [param for param in params[:-1].split("-") if param not in BROWSERS]
+    return f"{path}[{'-'.join(kept)}]" if kept else path
+
+
+class Touches:
+    """What one test touched: page object modules, their methods, URL paths."""
+
+    def __init__(self):
+        self.modules: Set[str] = set()
+        self.methods: Set[str] = set()
+        self.urls: Set[str] = set()
+        self.skipped = False
+
+    def as_dict(self) -> dict:
+        return {key: sorted(getattr(self, key)) for key in ("modules", "methods", "urls")}
+
+
+def _record(function, method: str, module: str):
+    @functools.wraps(function)
+    def recorded(*args, **kwargs):
+        if _current is not None:
+            _current.modules.add(module)
+            _current.methods.add(method)
+        return function(*args, **kwargs)
+
+    return recorded
+
+
+def instrument_page_objects(rootdir: str):
+    """Wrap the methods of every page object class to record the calls."""
+    global _instrumented
+    if _instrumented:
+        return
+    _instrumented = True
+    for info in pkgutil.walk_packages(pages.__path__, f"{pages.__name__}."):
+        module = importlib.import_module(info.name)
+        path = os.path.relpath(module.__file__, rootdir).replace(os.sep, "/")
+        for cls in vars(module).values():
+            if not inspect.isclass(cls) or cls.__module__ != module.__name__:
+                continue
+            for name, attribute in list(vars(cls).items()):
+                method = f"{path}::{cls.__name__}.{name}"
+                if inspect.isfunction(attribute):
+                    setattr(cls, name, _record(attribute, method, path))
+                elif isinstance(attribute, (classmethod, staticmethod)):
+                    setattr(cls, name, type(attribute)(_record(attribute.__func__, method, path)))
+                elif isinstance(attribute, property) and attribute.fget is not None:
+                    setattr(cls, name, attribute.getter(_record(attribute.fget, method, path)))
+
+
+def _record_url(url: str):
+    if _current is not None:
+        _current.urls.add(urlsplit(url).path.rstrip("/") or "/")
+
+
+class UrlRecorder(NavigationListener):
+    """Records the path of every page object navigation."""
+
+    def skip_navigation(self, page, url):
+        # Asked about every navigation, including those that end up skipped
+        _record_url(url)
+        return False
+
+
+class AsyncUrlRecorder(AsyncNavigationListener):
+    """Records the path of every async page object navigation."""
+
+    async def skip_navigation(self, page, url):
+        _record_url(url)
+        return False
+
+
+def pytest_configure(config):
+    global _current
+    _current = None
+    if config.getoption("no_impact_record") or config.getoption("collectonly"):
+        return
+    instrument_page_objects(str(config.rootpath))
+    BasePage.add_navigation_listener(UrlRecorder())
+    AsyncBasePage.add_navigation_listener(AsyncUrlRecorder())
+    # xdist workers send what they recorded to the controller, which writes the map
+    if not hasattr(config, "workerinput"):
+        config.pluginmanager.register(ImpactRecorder(config.getoption("impact_map")), "impact-recorder")
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item):
+    global _current
+    if item.config.getoption("no_impact_record"):
+        return
+    _current = item.stash[_touches_key] = Touches()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    global _current
+    outcome = yield
+    touches = item.stash.get(_touches_key, None)
+    if touches is None:
+        return
+    report = outcome.get_result()
+    touches.skipped = touches.skipped or report.skipped
+    # A skipped test may not have touched everything it needs, its previous entry is kept
+    if call.when == "teardown":
+        _current = None
+        if not touches.skipped:
+            # Travels with the report to the xdist controller
+            report.impact = touches.as_dict()
+
+
+def load_map(path: str) -> Dict[str, dict]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    return data.get("tests", {}) if data.get("version") == MAP_VERSION else {}
+
+
+class ImpactRecorder:
+    """Merges what the tests of this run touched into the impact map."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.tests: Dict[str, dict] = {}
+
+    def pytest_runtest_logreport(self, report):
+        touches = getattr(report, "impact", None)
+        if touches is not None:
+            self.tests[impact_key(report.nodeid)] = touches
+
+    def pytest_sessionfinish(self, session):
+        if not self.tests:
+            return
+        tests = load_map(self.path)
+        tests.update(self.tests)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": MAP_VERSION, "tests": tests}, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def _git(root: str, *args: str) -> str:
+    return subprocess.run(["git", *args], cwd=root, check=True, capture_output=True, text=True).stdout
+
+
+def _method_spans(source: str) -> List[tuple]:
+    """Return (first line, last line, "Class.method") of the methods in a module."""
+    spans = []
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.ClassDef):
+            for item in node.body:
+                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    first = min([item.lineno] + [d.lineno for d in item.decorator_list])
+                    spans.append((first, item.end_lineno, f"{node.name}.{item.name}"))
+    return spans
+
+
+class Changes:
+    """The changes since a git ref, as they matter to test selection."""
+
+    def __init__(self, ref: str, root: str, ignore: List[str]):
+        self.ref = ref
+        self.run_all: List[str] = []  # changed files that affect every test
+        self.test_modules: Set[str] = set()
+        self.modules: Set[str] = set()  # page object modules changed outside their methods
+        self.methods: Set[str] = set()
+        self.urls: Set[str] = set()
+        self.any_url = False
+        top = _git(root, "rev-parse", "--show-toplevel").strip()
+        changed = _git(root, "diff", "--name-only", ref).splitlines()
+        changed += _git(root, "ls-files", "--others", "--exclude-standard").splitlines()
+        fake_pages = {name: path for path, (name, _) in FAKE_SITE_PAGES.items()}
+        static_dir = os.path.relpath(FAKE_SITE_STATIC_DIR, root).replace(os.sep, "/")
+        for name in sorted(set(changed)):
+            path = os.path.relpath(os.path.join(top, name), root).replace(os.sep, "/")
+            if any(fnmatch.fnmatch(path, pattern) for pattern in ignore):
+                continue
+            if re.fullmatch(r"tests/test_[^/]*\.py", path):
+                self.test_modules.add(path)
+            elif path.startswith("pages/") and path.endswith(".py") and not path.endswith("__init__.py"):
+                self._add_page_module(root, path)
+            elif path.startswith(f"{static_dir}/") and os.path.basename(path) in fake_pages:
+                self.urls.add(fake_pages[os.path.basename(path)])
+            elif path.startswith(f"{static_dir}/"):
+                # The layout and the stylesheet are part of every fake page
+                self.any_url = True
+            else:
+                self.run_all.append(path)
+
+    def _add_page_module(self, root: str, path: str):
+        try:
+            with open(os.path.join(root, path), encoding="utf-8") as f:
+                spans = _method_spans(f.read())
+        except (FileNotFoundError, SyntaxError):
+            self.modules.add(path)
+            return
+        for line in _git(root, "diff", "--unified=0", self.ref, "--", path).splitlines():
+            match = HUNK_HEADER.match(line)
+            if not match:
+                continue
+            first = int(match.group(1))
+            last = first + max(int(match.group(2) or 1), 1) - 1
+            method = next((name for start, end, name in spans if start <= first and last <= end), None)
+            if method is None:
+                self.modules.add(path)
+            else:
+                self.methods.add(f"{path}::{method}")
+        if path not in self.modules and not any(m.startswith(f"{path}::") for m in self.methods):
+            # New to git: no test has touched it yet
+            self.modules.add(path)
+
+    def affects(self, nodeid: str, touches: Optional[dict]) -> bool:
+        if self.run_all or touches is None:
+            return True
+        if nodeid.split("::", 1)[0] in self.test_modules:
+            return True
+        urls = set(touches["urls"])
+        return bool(
+            self.modules.intersection(touches["modules"])
+            or self.methods.intersection(touches["methods"])
+            or self.urls.intersection(urls)
+            or (self.any_url and urls)
+        )
+
+
+def pytest_collection_modifyitems(config, items):
+    ref = config.getoption("affected_since")
+    if not ref:
+        return
+    tests = load_map(config.getoption("impact_map"))
+    if not tests:
+        return
+    changes = Changes(ref, str(config.rootpath), config.getini("impact_ignore"))
+    selected, deselected = [], []
+    for item in items:
+        affected = changes.affects(item.nodeid, tests.get(impact_key(item.nodeid)))
+        (selected if affected else deselected).append(item)
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+
+
+def pytest_report_header(config):
+    ref = config.getoption("affected_since")
+    if not ref:
+        return None
+    if not load_map(config.getoption("impact_map")):
+        return f"impact: no map at {config.getoption('impact_map')} yet, running every test"
+    changes = Changes(ref, str(config.rootpath), config.getini("impact_ignore"))
+    if changes.run_all:
+        return f"impact: {', '.join(changes.run_all[:5])} changed since {ref}, running every test"
+    return f"impact: running the tests affected by the changes since {ref}"
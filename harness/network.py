@@ -0,0 +1,318 @@
+"""Offline network record/replay for the test suite.
+
+``--network-mode=record`` stores every request a test makes in a HAR-style
+archive under ``--network-dir`` (one file per test). ``--network-mode=replay``
+serves the test's requests from that archive instead of demoqa.com, so
+navigation only costs a local disk read. ``live`` (the default) leaves the
+network alone.
+
+Which requests are recorded and how they are matched on replay is controlled by
+the ``network_rules`` ini option, one ``<url glob> <action>`` rule per line. The
+first matching rule wins:
+
+- ``exact``: replay by method and full URL (the default for unmatched URLs)
+- ``ignore-query``: replay by method and URL without the query string, for
+  cache-busting ad and tracking parameters
+- ``live``: always go to the network, never recorded
+- ``abort``: never go to the network, never recorded
+
+Requests that have no entry in the archive are handled according to
+``--network-unmatched`` and listed in the terminal summary.
+"""
+import base64
+import fnmatch
+import json
+import os
+from collections import defaultdict, deque
+from datetime import datetime, timezone
+from urllib.parse import urlsplit, urlunsplit
+
+import pytest
+from playwright.sync_api import BrowserContext, Error, Page, Request, Route
+
+from harness.utils import node_slug
+
+MATCH_ACTIONS = ("exact", "ignore-query", "live", "abort")
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("network", "Network record/replay")
+    group.addoption(
+        "--network-mode",
+        default="live",
+        choices=["live", "record", "replay"],
+        help="Record requests to HAR archives, replay them from disk, or use the live network.",
+    )
+    group.addoption(
+        "--network-dir",
+        default="network-archives",
+        help="Directory holding the per-test HAR archives, defaults to network-archives.",
+    )
+    group.addoption(
+        "--network-unmatched",
+        default="abort",
+        choices=["abort", "live"],
+        help="What to do with requests that are missing from the archive in replay mode.",
+    )
+    parser.addini(
+        "network_rules",
+        type="linelist",
+        default=[],
+        help="'<url glob> <action>' rules for network record/replay, first match wins.",
+    )
+
+
+def parse_rules(lines):
+    """Parse ``<url glob> <action>`` lines into a list of (glob, action) tuples."""
+    rules = []
+    for line in lines:
+        parts = line.split()
+        if not parts:
+            continue
+        if len(parts) != 2 or parts[1] not in MATCH_ACTIONS:
+            raise pytest.UsageError(
+                f"Invalid network rule {line!r}: expected '<url glob> <{'|'.join(MATCH_ACTIONS)}>'"
+            )
+        rules.append((parts[0], parts[1]))
+    return rules
+
+
+def match_action(rules, url: str) -> str:
+    """Return the action of the first rule matching ``url``."""
+    for pattern, action in rules:
+        if fnmatch.fnmatchcase(url, pattern):
+            return action
+    return "exact"
+
+
+def strip_query(url: str) -> str:
+    """Return ``url`` without its query string and fragment."""
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, "", ""))
+
+
+def _headers_to_har(headers: dict) -> list:
+    return [{"name": name, "value": value} for name, value in headers.items()]
+
+
+# Replayed bodies are stored decoded, so the original transfer headers would lie
+_DROPPED_REPLAY_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+class NetworkRecorder:
+    """Collects the requests of one browser context into HAR entries."""
+
+    def __init__(self, rules):
+        self.rules = rules
+        self.entries = []
+
+    def attach(self, context: BrowserContext):
+        context.on("requestfinished", self._on_request_finished)
+        if any(action == "abort" for _, action in self.rules):
+            context.route("**/*", self._route)
+
+    def detach(self, context: BrowserContext):
+        context.remove_listener("requestfinished", self._on_request_finished)
+        if any(action == "abort" for _, action in self.rules):
+            context.unroute("**/*", self._route)
+
+    def _route(self, route: Route):
+        if match_action(self.rules, route.request.url) == "abort":
+            route.abort()
+        else:
+            route.fallback()
+
+    def _on_request_finished(self, request: Request):
+        if match_action(self.rules, request.url) in ("live", "abort"):
+            return
+        try:
+            response = request.response()
+            if response is None:
+                return
+            try:
+                body = response.body()
+            except Error:
+                # Redirects and some cached responses have no body to read
+                body = b""
+            entry = {
+                "startedDateTime": datetime.now(timezone.utc).isoformat(),
+                "time": max(request.timing.get("responseEnd", 0), 0),
+                "request": {
+                    "method": request.method,
+                    "url": request.url,
+                    "httpVersion": "HTTP/1.1",
+                    "headers": _headers_to_har(request.headers),
+                    "queryString": [],
+                    "cookies": [],
+                    "headersSize": -1,
+                    "bodySize": len(request.post_data_buffer or b""),
+                },
+                "response": {
+                    "status": response.status,
+                    "statusText": response.status_text,
+                    "httpVersion": "HTTP/1.1",
+                    "headers": _headers_to_har(response.headers),
+                    "cookies": [],
+                    "content": {
+                        "size": len(body),
+                        "mimeType": response.headers.get("content-type", ""),
+                        "text": base64.b64encode(body).decode("ascii"),
+                        "encoding": "base64",
+                    },
+                    "redirectURL": response.headers.get("location", ""),
+                    "headersSize": -1,
+                    "bodySize": len(body),
+                },
+                "cache": {},
+                "timings": {"send": 0, "wait": 0, "receive": 0},
+            }
+        except Error:
+            # The context is closing; whatever is in flight is not worth keeping
+            return
+        self.entries.append(entry)
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        har = {
+            "log": {
+                "version": "1.2",
+                "creator": {"name": "demoqa-harness", "version": "1.0"},
+                "entries": self.entries,
+            }
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(har, f)
+
+
+class NetworkReplayer:
+    """Serves the requests of one browser context from a HAR archive."""
+
+    def __init__(self, rules, entries, unmatched: str = "abort"):
+        self.rules = rules
+        self.on_unmatched = unmatched
+        self.unmatched = []
+        self._exact = defaultdict(deque)
+        self._ignore_query = defaultdict(deque)
+        for entry in entries:
+            method = entry["request"]["method"]
+            url = entry["request"]["url"]
+            self._exact[(method, url)].append(entry)
+            self._ignore_query[(method, strip_query(url))].append(entry)
+
+    @classmethod
+    def from_file(cls, path: str, rules, unmatched: str = "abort"):
+        entries = []
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                entries = json.load(f)["log"]["entries"]
+        return cls(rules, entries, unmatched)
+
+    def attach(self, context: BrowserContext):
+        context.route("**/*", self._route)
+
+    def detach(self, context: BrowserContext):
+        context.unroute("**/*", self._route)
+
+    def lookup(self, method: str, url: str):
+        """Return the archived entry for a request, or None when there is none."""
+        action = match_action(self.rules, url)
+        if action == "ignore-query":
+            candidates = self._ignore_query.get((method, strip_query(url)))
+        else:
+            candidates = self._exact.get((method, url))
+        if not candidates:
+            return None
+        # Repeated requests to the same URL are served in recorded order; the
+        # last recording keeps answering once the sequence is used up
+        return candidates.popleft() if len(candidates) > 1 else candidates[0]
+
+    def _route(self, route: Route):
+        request = route.request
+        action = match_action(self.rules, request.url)
+        if action == "live":
+            route.fallback()
+            return
+        if action == "abort":
+            route.abort()
+            return
+        entry = self.lookup(request.method, request.url)
+        if entry is None:
+            self.unmatched.append(f"{request.method} {request.url}")
+            if self.on_unmatched == "live":
+                route.fallback()
+            else:
+                route.abort()
+            return
+        response = entry["response"]
+        content = response["content"]
+        if content.get("encoding") == "base64":
+            body = base64.b64decode(content.get("text", ""))
+        else:
+            body = content.get("text", "").encode("utf-8")
+        headers = {
+            header["name"]: header["value"]
+            for header in response["headers"]
+            if header["name"].lower() not in _DROPPED_REPLAY_HEADERS
+        }
+        route.fulfill(status=response["status"], headers=headers, body=body)
+
+
+@pytest.fixture(scope="function", autouse=True)
+def network_archive(request, pytestconfig):
+    """Record or replay the test's network traffic according to --network-mode."""
+    mode = pytestconfig.getoption("network_mode")
+    # Tests without a browser page have no traffic
+    if mode == "live" or "page" not in request.fixturenames:
+        yield None
+        return
+    page: Page = request.getfixturevalue("page")
+    rules = parse_rules(pytestconfig.getini("network_rules"))
+    archive_path = os.path.join(
+        pytestconfig.getoption("network_dir"), f"{node_slug(request.node.nodeid)}.har"
+    )
+    context = page.context
+    if mode == "record":
+        handler = NetworkRecorder(rules)
+    else:
+        handler = NetworkReplayer.from_file(
+            archive_path, rules, pytestconfig.getoption("network_unmatched")
+        )
+    handler.attach(context)
+    yield handler
+    try:
+        handler.detach(context)
+    except Error:
+        pass
+    if mode == "record":
+        handler.save(archive_path)
+    elif handler.unmatched:
+        request.node.user_properties.append(("network_unmatched", handler.unmatched))
+        request.node.add_report_section(
+            "teardown", "network replay", "Unmatched requests:\n" + "\n".join(handler.unmatched)
+        )
+
+
+# Filled from the teardown reports, so it also works on the xdist controller
+_unmatched_requests = {}
+
+
+def pytest_runtest_logreport(report):
+    if report.when != "teardown":
+        return
+    for name, value in report.user_properties:
+        if name == "network_unmatched":
+            _unmatched_requests[report.nodeid] = value
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if config.getoption("network_mode") != "replay" or not _unmatched_requests:
+        return
+    total = sum(len(requests) for requests in _unmatched_requests.values())
+    terminalreporter.section("network replay")
+    terminalreporter.line(
+        f"{total} request(s) in {len(_unmatched_requests)} test(s) were not found in the archives:"
+    )
+    for nodeid, requests in sorted(_unmatched_requests.items()):
+        terminalreporter.line(f"  {nodeid}")
+        for line in requests:
+            terminalreporter.line(f"    {line}")
@@ -0,0 +1,221 @@
+"""Session-wide pool of warm pages handed out to tests instead of fresh ones.
+
+Enabled with ``--page-pool``. Each worker keeps one browser context per browser
+and reuses its pages across tests: after a test the page is reset (listeners it
+added, cookies, storage, page routes, viewport; the bootstrapped cookies and
+localStorage are put back) and handed to the next test. A page is closed and replaced after
+``--page-pool-max-uses`` tests, when it crashed or closed, or when the reset
+itself fails. A test that installs a fake clock changes the whole context,
+which is then closed and created anew. With ``--group-by-url`` (see
+``harness.url_groups``) a page can be reset in place, keeping its URL, for the
+next test that starts there.
+
+Pages from the pool do not get pytest-playwright's per-context tracing and
+video recording, since their context lives for the whole session.
+"""
+import json
+from typing import Callable, List, Optional
+from urllib.parse import urlsplit
+
+from playwright.sync_api import BrowserContext, Error, Page, ViewportSize
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("page-pool", "Page pool")
+    group.addoption(
+        "--page-pool",
+        action="store_true",
+        default=False,
+        help="Reuse warm pages across tests instead of creating a page per test.",
+    )
+    group.addoption(
+        "--page-pool-max-uses",
+        type=int,
+        default=50,
+        help="Number of tests a pooled page serves before it is replaced, defaults to 50.",
+    )
+
+
+_RESET_STORAGE = """(seed) => {
+    try {
+        window.localStorage.clear();
+        for (const {name, value} of seed) {
+            window.localStorage.setItem(name, value);
+        }
+    } catch (e) {}
+    try { window.sessionStorage.clear(); } catch (e) {}
+}"""
+
+
+class PagePool:
+    """Hands out reusable pages from a single browser context."""
+
+    def __init__(
+        self,
+        context_factory: Callable[[], BrowserContext],
+        viewport: Optional[ViewportSize],
+        max_uses: int = 50,
+        on_new_page: Optional[Callable[[Page], None]] = None,
+        storage_state: Optional[str] = None,
+        restore: Optional[Callable[[Page], bool]] = None,
+    ):
+        self._context_factory = context_factory
+        self._context: Optional[BrowserContext] = None
+        self._viewport = viewport
+        self._max_uses = max_uses
+        self._on_new_page = on_new_page
+        # Resets a page without leaving its URL, False when it cannot
+        self._restore = restore
+        # Cookies and localStorage (by origin) of the context's storage state,
+        # put back after every reset
+        self._seed_cookies = []
+        self._seed_storage = {}
+        if storage_state:
+            with open(storage_state, encoding="utf-8") as f:
+                state = json.load(f)
+            self._seed_cookies = state.get("cookies", [])
+            self._seed_storage = {
+                origin["origin"]: origin.get("localStorage", []) for origin in state.get("origins", [])
+            }
+        self._idle: List[Page] = []
+        self._uses = {}
+        self._crashed = set()
+        self._listeners = {}
+        self._clock_installed = False
+        self.created = 0
+        self.recycled = 0
+
+    @property
+    def context(self) -> BrowserContext:
+        if self._context is None:
+            self._context = self._context_factory()
+            self._watch_clock(self._context)
+        return self._context
+
+    def acquire(self, prefer: Optional[Callable[[Page], bool]] = None) -> Page:
+        """Return a warm page, creating one when none is idle.
+
+        Args:
+            prefer: Picks the idle page to hand out, when one matches.
+        """
+        if prefer:
+            # Most recently released last, like the pop below
+            for page in reversed(self._idle):
+                if prefer(page) and self._is_healthy(page):
+                    self._idle.remove(page)
+                    self._idle.append(page)
+                    break
+        while self._idle:
+            page = self._idle.pop()
+            if self._is_healthy(page):
+                break
+            self._discard(page)
+        else:
+            page = self._new_page()
+        self._uses[page] = self._uses.get(page, 0) + 1
+        self._listeners[page] = self._track_listeners(page)
+        return page
+
+    def release(self, page: Page, healthy: bool = True):
+        """Reset a page after a test and keep it for the next one."""
+        self._untrack_listeners(page)
+        if self._clock_installed:
+            # The fake clock cannot be uninstalled, start over with a new context
+            self._discard(page)
+            self.close()
+            return
+        if not healthy or not self._is_healthy(page) or self._uses[page] >= self._max_uses:
+            self._discard(page)
+            return
+        try:
+            self._reset(page)
+        except Error:
+            self._discard(page)
+            return
+        self._idle.append(page)
+
+    def close(self):
+        """Close the pool's context and every page in it."""
+        if self._context is not None:
+            try:
+                self._context.close()
+            except Error:
+                pass
+        self._context = None
+        self._idle.clear()
+        self._uses.clear()
+        self._clock_installed = False
+
+    def _new_page(self) -> Page:
+        page = self.context.new_page()
+        page.on("crash", lambda crashed: self._crashed.add(crashed))
+        if self._on_new_page:
+            self._on_new_page(page)
+        self.created += 1
+        return page
+
+    def _is_healthy(self, page: Page) -> bool:
+        return not page.is_closed() and page not in self._crashed
+
+    def _reset(self, page: Page):
+        page.unroute_all(behavior="ignoreErrors")
+        self.context.clear_cookies()
+        if self._seed_cookies:
+            self.context.add_cookies(self._seed_cookies)
+        self.context.clear_permissions()
+        if self._viewport:
+            page.set_viewport_size(self._viewport)
+        if page.url != "about:blank":
+            url = urlsplit(page.url)
+            page.evaluate(_RESET_STORAGE, self._seed_storage.get(f"{url.scheme}://{url.netloc}", []))
+            if self._restore is None or not self._restore(page):
+                page.goto("about:blank")
+
+    def _discard(self, page: Page):
+        self._uses.pop(page, None)
+        self._crashed.discard(page)
+        self.recycled += 1
+        if not page.is_closed():
+            try:
+                page.close()
+            except Error:
+                pass
+
+    def _watch_clock(self, context: BrowserContext):
+        clock = context.clock
+        install = clock.install
+
+        def tracked_install(*args, **kwargs):
+            self._clock_installed = True
+            install(*args, **kwargs)
+
+        clock.install = tracked_install
+
+    def _track_listeners(self, page: Page):
+        # Tests and page objects register handlers (e.g. for dialogs) straight on
+        # the page. Record them through instance-level wrappers so the reset can
+        # remove exactly those handlers and nothing the pool registered itself.
+        added = []
+        register_on, register_once = page.on, page.once
+
+        def on(event, handler):
+            added.append((event, handler))
+            register_on(event, handler)
+
+        def once(event, handler):
+            added.append((event, handler))
+            register_once(event, handler)
+
+        page.on = on
+        page.once = once
+        return added
+
+    def _untrack_listeners(self, page: Page):
+        del page.on
+        del page.once
+        for event, handler in self._listeners.pop(page, []):
+            try:
+                page.remove_listener(event, handler)
+            except KeyError:
+                # A `once` handler that already fired
+                pass
@@ -0,0 +1,266 @@
+"""Web performance metrics of every navigation made through a page object.
+
+Page objects navigate with ``BasePage.goto``, which notifies this plugin. When a
+page's document is left (at the next navigation or at the end of the test) its
+metrics are read in one evaluation:
+
+- Navigation Timing: ``ttfb_ms``, ``dom_content_loaded_ms``, ``load_ms``
+- paint timings: ``fp_ms``, ``fcp_ms`` and ``lcp_ms`` (largest contentful paint)
+- ``long_tasks`` and ``long_tasks_ms``: count and total time of main thread tasks over 50 ms
+- ``transfer_kb`` and ``resources``: bytes over the wire and number of requests
+  (cross-origin resources without Timing-Allow-Origin count as 0 bytes)
+- on Chromium, ``cdp``: the DevTools Performance domain metrics
+
+Metrics that a browser does not support are null. Each test's navigations are
+in a "perf" report section and appended to ``--perf-store``
+(``.harness/perf.jsonl``) as a time series.
+
+Collection is opt-in: ``--perf`` turns it on for every test, and it is always on
+for the tests with a budget. ``@pytest.mark.perf_budget(lcp_ms=2500,
+transfer_kb=3000)`` fails a test when any of its navigations goes over one of
+the limits, or when none of them was measured.
+"""
+import json
+import os
+import time
+import weakref
+from typing import List, Optional
+
+import pytest
+from playwright.sync_api import CDPSession, Error, Page, Response
+
+from pages.base_page import BasePage, NavigationListener
+
+BUDGET_METRICS = (
+    "ttfb_ms",
+    "dom_content_loaded_ms",
+    "load_ms",
+    "fcp_ms",
+    "lcp_ms",
+    "long_tasks_ms",
+    "transfer_kb",
+)
+CDP_METRICS = (
+    "JSHeapUsedSize",
+    "Nodes",
+    "LayoutCount",
+    "RecalcStyleCount",
+    "LayoutDuration",
+    "ScriptDuration",
+    "TaskDuration",
+)
+
+# Observers that must exist before the page's own scripts run: long tasks are
+# not buffered, so they have to be watched from the start
+OBSERVER_SCRIPT = """(() => {
+    if (window.__harnessPerf) {
+        return;
+    }
+    const perf = window.__harnessPerf = {lcp: null, longTasks: []};
+    try {
+        new PerformanceObserver(list => {
+            const entries = list.getEntries();
+            perf.lcp = entries[entries.length - 1].startTime;
+        }).observe({type: 'largest-contentful-paint', buffered: true});
+    } catch (e) {}
+    try {
+        new PerformanceObserver(list => {
+            for (const entry of list.getEntries()) {
+                perf.longTasks.push(entry.duration);
+            }
+        }).observe({type: 'longtask', buffered: true});
+    } catch (e) {}
+})();"""
+
+COLLECT_SCRIPT = """() => {
+    const round = value => (value == null ? null : Math.round(value * 10) / 10);
+    const nav = performance.getEntriesByType('navigation')[0];
+    const paint = Object.fromEntries(
+        performance.getEntriesByType('paint').map(entry => [entry.name, entry.startTime])
+    );
+    const resources = performance.getEntriesByType('resource');
+    const perf = window.__harnessPerf || {lcp: null, longTasks: []};
+    const transfer = (nav ? nav.transferSize : 0)
+        + resources.reduce((sum, entry) => sum + (entry.transferSize || 0), 0);
+    return {
+        ttfb_ms: nav ? round(nav.responseStart - nav.startTime) : null,
+        dom_content_loaded_ms: nav ? round(nav.domContentLoadedEventEnd) : null,
+        load_ms: nav && nav.loadEventEnd ? round(nav.loadEventEnd) : null,
+        fp_ms: round(paint['first-paint']),
+        fcp_ms: round(paint['first-contentful-paint']),
+        lcp_ms: round(perf.lcp),
+        long_tasks: perf.longTasks.length,
+        long_tasks_ms: round(perf.longTasks.reduce((sum, duration) => sum + duration, 0)),
+        transfer_kb: round(transfer / 1024),
+        resources: resources.length
+    };
+}"""
+
+# Pages that already run the observer script
+_observed_pages = weakref.WeakSet()
+_collector_key = pytest.StashKey["PerfCollector"]()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("perf", "Performance metrics")
+    group.addoption(
+        "--perf",
+        action="store_true",
+        default=False,
+        help="Collect performance metrics of the page object navigations of every test, not only budgeted ones.",
+    )
+    group.addoption(
+        "--perf-store",
+        default=os.path.join(".harness", "perf.jsonl"),
+        help="JSONL time series of navigation metrics, defaults to .harness/perf.jsonl.",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        f"perf_budget(**limits): fail when a navigation exceeds a limit, one of {', '.join(BUDGET_METRICS)}",
+    )
+    if not hasattr(config, "workerinput"):
+        config.pluginmanager.register(PerfRecorder(config.getoption("perf_store")), "perf-recorder")
+
+
+class PerfCollector(NavigationListener):
+    """Collects the metrics of each document a page navigates to."""
+
+    def __init__(self, page: Page, browser_name: str):
+        self.page = page
+        self.browser_name = browser_name
+        self.navigations: List[dict] = []
+        self._current: Optional[dict] = None
+        self._cdp: Optional[CDPSession] = None
+        if page not in _observed_pages:
+            page.add_init_script(OBSERVER_SCRIPT)
+            _observed_pages.add(page)
+        if browser_name == "chromium":
+            try:
+                self._cdp = page.context.new_cdp_session(page)
+                self._cdp.send("Performance.enable")
+            except Error:
+                self._cdp = None
+
+    def before_navigation(self, page: Page, url: str):
+        if page is self.page:
+            self._finish_current()
+
+    def after_navigation(self, page: Page, url: str, response: Optional[Response]):
+        if page is self.page:
+            self._current = {
+                "url": url,
+                "browser": self.browser_name,
+                "status": response.status if response else None,
+                "timestamp": time.time(),
+            }
+
+    def finish(self) -> List[dict]:
+        """Collect the current document's metrics and return every navigation."""
+        self._finish_current()
+        if self._cdp is not None:
+            try:
+                self._cdp.detach()
+            except Error:
+                pass
+            self._cdp = None
+        return self.navigations
+
+    def violations(self, limits: dict) -> List[str]:
+        return [
+            f"{navigation['url']}: {metric} {navigation[metric]} > {limit}"
+            for navigation in self.navigations
+            for metric, limit in limits.items()
+            if navigation.get(metric) is not None and navigation[metric] > limit
+        ]
+
+    def _finish_current(self):
+        if self._current is None:
+            return
+        navigation, self._current = self._current, None
+        try:
+            navigation.update(self.page.evaluate(COLLECT_SCRIPT))
+            if self._cdp is not None:
+                metrics = self._cdp.send("Performance.getMetrics")["metrics"]
+                navigation["cdp"] = {m["name"]: m["value"] for m in metrics if m["name"] in CDP_METRICS}
+        except Error:
+            # The page closed or crashed; keep what is known
+            pass
+        self.navigations.append(navigation)
+
+
+def _budget(item) -> dict:
+    marker = item.get_closest_marker("perf_budget")
+    if marker is None:
+        return {}
+    unknown = set(marker.kwargs) - set(BUDGET_METRICS)
+    if unknown:
+        raise pytest.UsageError(f"Unknown perf_budget metrics: {', '.join(sorted(unknown))}")
+    return marker.kwargs
+
+
+@pytest.fixture(scope="function", autouse=True)
+def perf_metrics(request, pytestconfig):
+    """Collect the metrics of the test's page object navigations, with --perf or a perf_budget."""
+    measured = pytestconfig.getoption("perf") or request.node.get_closest_marker("perf_budget")
+    if not measured or "page" not in request.fixturenames:
+        yield None
+        return
+    page: Page = request.getfixturevalue("page")
+    collector = PerfCollector(page, request.getfixturevalue("browser_name"))
+    request.node.stash[_collector_key] = collector
+    BasePage.add_navigation_listener(collector)
+    yield collector
+    BasePage.remove_navigation_listener(collector)
+    navigations = collector.finish()
+    del request.node.stash[_collector_key]
+    if not navigations:
+        return
+    request.node.user_properties.append(("perf", navigations))
+    request.node.add_report_section(
+        "teardown",
+        "perf",
+        "\n".join(
+            f"{n['url']}: ttfb={n.get('ttfb_ms')}ms fcp={n.get('fcp_ms')}ms lcp={n.get('lcp_ms')}ms "
+            f"load={n.get('load_ms')}ms long_tasks={n.get('long_tasks_ms')}ms transfer={n.get('transfer_kb')}KB"
+            for n in navigations
+        ),
+    )
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    result = yield
+    # Only a passing test is checked; a failure has already said more
+    collector = item.stash.get(_collector_key, None)
+    limits = _budget(item)
+    if collector is not None and limits:
+        if not collector.finish():
+            # e.g. --group-by-url skipped the navigation: a budget over nothing would pass
+            pytest.fail("Performance budget: no page object navigation was measured", pytrace=False)
+        violations = collector.violations(limits)
+        if violations:
+            pytest.fail("Performance budget exceeded:\n" + "\n".join(violations), pytrace=False)
+    return result
+
+
+class PerfRecorder:
+    """Appends the navigations of every test to the JSONL time series."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def pytest_runtest_logreport(self, report):
+        if report.when != "teardown":
+            return
+        navigations = [value for name, value in report.user_properties if name == "perf"]
+        if not navigations:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            for navigation in navigations[-1]:
+                f.write(json.dumps({"nodeid": report.nodeid, **navigation}) + "\n")
@@ -0,0 +1,226 @@
+"""Profile of the Playwright calls made by the page objects.
+
+With ``--profile-actions`` the Playwright ``Page``, ``Locator`` and ``Keyboard``
+methods that talk to the browser (``goto``, ``fill``, ``click``,
+``text_content``, ``evaluate``, ...) are timed. Each call is attributed to the
+chain of page object methods it was made from, e.g.
+``WebTablesPage.fill_registration_form;WebTablesPage.fill_many;Locator.fill``.
+Calls made outside page objects are attributed to the calling function.
+
+The terminal summary lists the Playwright calls and the page object methods
+that took the most time, with call counts, latency percentiles and a latency
+histogram. Every stack, rooted at its test, is written in the folded format of
+flamegraph.pl and speedscope to ``--profile-output``
+(``.harness/actions.folded``), weighted in microseconds.
+"""
+import functools
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+import pytest
+from playwright.sync_api import Keyboard, Locator, Page
+
+from harness.durations import percentile
+from pages.base_page import BasePage
+
+# Methods that make a round trip to the browser
+PROFILED_METHODS = {
+    Page: (
+        "goto", "reload", "go_back", "go_forward", "evaluate", "evaluate_handle", "content", "title",
+        "wait_for_load_state", "wait_for_selector", "wait_for_timeout", "wait_for_url", "set_viewport_size",
+        "screenshot", "fill", "click", "press", "query_selector", "query_selector_all",
+    ),
+    Locator: (
+        "fill", "clear", "click", "dblclick", "check", "uncheck", "press", "type", "press_sequentially",
+        "select_option", "hover", "focus", "text_content", "inner_text", "inner_html", "input_value",
+        "get_attribute", "is_visible", "is_hidden", "is_enabled", "is_checked", "count", "all",
+        "all_text_contents", "all_inner_texts", "evaluate", "evaluate_all", "bounding_box", "screenshot",
+        "scroll_into_view_if_needed", "wait_for",
+    ),
+    Keyboard: ("press", "type", "down", "up", "insert_text"),
+}
+# Upper bounds of the latency histogram buckets, in milliseconds
+HISTOGRAM_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+SUMMARY_ROWS = 15
+
+_profiler_key = pytest.StashKey["ActionProfiler"]()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("profile-actions", "Playwright action profiler")
+    group.addoption(
+        "--profile-actions",
+        action="store_true",
+        default=False,
+        help="Time the Playwright calls made by the page objects.",
+    )
+    group.addoption(
+        "--profile-output",
+        default=os.path.join(".harness", "actions.folded"),
+        help="Folded stacks file for flame graphs, defaults to .harness/actions.folded.",
+    )
+
+
+def _frame_name(frame) -> str:
+    owner = frame.f_locals.get("self")
+    if isinstance(owner, BasePage):
+        return f"{type(owner).__name__}.{frame.f_code.co_name}"
+    return f"{frame.f_globals.get('__name__', '?')}.{frame.f_code.co_name}"
+
+
+def _callers(frame) -> Tuple[str, ...]:
+    """Return the page object methods on the stack, outermost first.
+
+    Without any, return the first function outside Playwright.
+    """
+    page_object_frames = []
+    caller = None
+    while frame is not None:
+        if isinstance(frame.f_locals.get("self"), BasePage):
+            page_object_frames.append(_frame_name(frame))
+        elif caller is None and not frame.f_globals.get("__name__", "").startswith("playwright"):
+            caller = _frame_name(frame)
+        frame = frame.f_back
+    if page_object_frames:
+        return tuple(reversed(page_object_frames))
+    return (caller,) if caller else ()
+
+
+class ActionProfiler:
+    """Wraps the profiled Playwright methods and records each call's latency."""
+
+    def __init__(self):
+        # Stack of callers plus the action -> latencies in microseconds
+        self.calls: Dict[Tuple[str, ...], List[int]] = defaultdict(list)
+        self._patched = []
+        self._local = threading.local()
+
+    def install(self):
+        for cls, names in PROFILED_METHODS.items():
+            for name in names:
+                original = cls.__dict__.get(name)
+                if original is None:
+                    continue
+                setattr(cls, name, self._wrap(f"{cls.__name__}.{name}", original))
+                self._patched.append((cls, name, original))
+
+    def uninstall(self):
+        for cls, name, original in self._patched:
+            setattr(cls, name, original)
+        self._patched.clear()
+
+    def take(self) -> Dict[str, List[int]]:
+        """Return the calls recorded since the last take, keyed by folded stack."""
+        calls, self.calls = self.calls, defaultdict(list)
+        return {";".join(stack): latencies for stack, latencies in calls.items()}
+
+    def _wrap(self, action: str, original):
+        @functools.wraps(original)
+        def profiled(*args, **kwargs):
+            # A profiled method calling another one is timed once, as the outer action
+            if getattr(self._local, "active", False):
+                return original(*args, **kwargs)
+            self._local.active = True
+            start = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                self._local.active = False
+                self.calls[_callers(sys._getframe(1)) + (action,)].append(round(elapsed * 1e6))
+
+        return profiled
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    profiler = item.config.stash.get(_profiler_key, None)
+    if profiler is not None and call.when == "teardown":
+        # Travels with the report to the xdist controller; covers all three phases
+        outcome.get_result().action_profile = profiler.take()
+
+
+def _histogram(latencies_ms: List[float]) -> str:
+    counts = [0] * (len(HISTOGRAM_BUCKETS) + 1)
+    for latency in latencies_ms:
+        index = next((i for i, bound in enumerate(HISTOGRAM_BUCKETS) if latency < bound), len(HISTOGRAM_BUCKETS))
+        counts[index] += 1
+    labels = [f"<{bound}" for bound in HISTOGRAM_BUCKETS] + [f">={HISTOGRAM_BUCKETS[-1]}"]
+    return " ".join(f"{label}:{count}" for label, count in zip(labels, counts) if count)
+
+
+class ProfileReporter:
+    """Aggregates the profiles of all tests into a summary and a folded stacks file."""
+
+    def __init__(self, output: str):
+        self.output = output
+        self.folded: Dict[str, int] = defaultdict(int)
+        self.actions: Dict[str, List[int]] = defaultdict(list)
+        self.methods: Dict[str, List[int]] = defaultdict(list)
+
+    def pytest_runtest_logreport(self, report):
+        profile = getattr(report, "action_profile", None)
+        if not profile:
+            return
+        root = report.nodeid.replace(" ", "_").replace(";", ":")
+        for stack, latencies in profile.items():
+            self.folded[f"{root};{stack}"] += sum(latencies)
+            frames = stack.split(";")
+            self.actions[frames[-1]].extend(latencies)
+            # Inclusive: a method is charged for the calls of the methods it called
+            for method in set(frames[:-1]):
+                self.methods[method].extend(latencies)
+
+    def pytest_sessionfinish(self, session):
+        if not self.folded:
+            return
+        directory = os.path.dirname(self.output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.output, "w", encoding="utf-8") as f:
+            for stack, weight in sorted(self.folded.items()):
+                f.write(f"{stack} {weight}\n")
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.actions:
+            return
+        terminalreporter.section("action profile")
+        terminalreporter.line(f"{'action':<32} {'calls':>7} {'total s':>9} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}  histogram (ms)")
+        for action, latencies in self._top(self.actions):
+            latencies_ms = [latency / 1000 for latency in latencies]
+            terminalreporter.line(
+                f"{action:<32} {len(latencies):>7} {sum(latencies) / 1e6:>9.2f} "
+                f"{percentile(latencies_ms, 50):>8.1f} {percentile(latencies_ms, 95):>8.1f} "
+                f"{max(latencies_ms):>8.1f}  {_histogram(latencies_ms)}"
+            )
+        if self.methods:
+            terminalreporter.line("")
+            terminalreporter.line(f"{'calling method':<48} {'actions':>7} {'total s':>9}")
+            for method, latencies in self._top(self.methods):
+                terminalreporter.line(f"{method:<48} {len(latencies):>7} {sum(latencies) / 1e6:>9.2f}")
+        terminalreporter.line(f"\nfolded stacks: {self.output}")
+
+    @staticmethod
+    def _top(latencies_by_name: Dict[str, List[int]]):
+        return sorted(latencies_by_name.items(), key=lambda item: -sum(item[1]))[:SUMMARY_ROWS]
+
+
+def pytest_configure(config):
+    if not config.getoption("profile_actions"):
+        return
+    profiler = ActionProfiler()
+    profiler.install()
+    config.stash[_profiler_key] = profiler
+    if not hasattr(config, "workerinput"):
+        config.pluginmanager.register(ProfileReporter(config.getoption("profile_output")), "profile-reporter")
+
+
+def pytest_unconfigure(config):
+    profiler = config.stash.get(_profiler_key, None)
+    if profiler is not None:
+        profiler.uninstall()
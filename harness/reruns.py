@@ -0,0 +1,147 @@
+"""Reruns of tests that failed for environmental reasons.
+
+With ``--env-reruns=N`` a failing test is run again, up to N times, only when
+its failure looks environmental: a navigation timeout, a network error, or a
+crashed or disconnected browser. Assertion failures and any other error are
+deterministic and are reported right away.
+
+The reruns themselves are run by pytest-rerunfailures: every test gets a
+``flaky`` marker whose condition classifies the exception of the failed phase.
+Each rerun gets a fresh browser context (pooled pages are bypassed) and starts
+after an exponential backoff: ``--env-rerun-backoff`` seconds, doubled for
+every earlier attempt. The session reruns at most ``--rerun-budget`` tests, so
+a site outage cannot multiply the length of a run.
+
+Intermediate attempts are reported with the outcome ``rerun``. The durations
+store records the last attempt of every test with its number of reruns, and
+the terminal summary lists the tests that needed one with their flakiness
+score: the share of their recent runs that needed a rerun.
+"""
+import re
+
+import pytest
+
+from harness.durations import HISTORY_WINDOW, DurationStore
+
+ENVIRONMENTAL_PATTERNS = [
+    re.compile(pattern)
+    for pattern in (
+        r"net::ERR_",  # Chromium network errors
+        r"NS_ERROR_",  # Firefox network errors
+        r"Could not connect|Connection (refused|reset|closed)",  # WebKit and driver connection errors
+        r"(?s)Timeout \d+ms exceeded.*(navigating to|waiting for navigation|waiting for event \"load\")",
+        r"(?i)page\.(goto|reload|go_?back|go_?forward|wait_?for_?load_?state|wait_?for_?url): Timeout",
+        r"Navigation .* (interrupted|failed)",
+        r"Target (page, context or browser|crashed|closed)",
+        r"Browser (closed|has been closed|has disconnected)",
+        r"Page crashed",
+    )
+]
+ENVIRONMENTAL_EXCEPTIONS = (ConnectionError, TimeoutError)
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("env-reruns", "Environmental reruns")
+    group.addoption(
+        "--env-reruns",
+        type=int,
+        default=0,
+        help="Rerun a test up to this many times when it fails for environmental reasons.",
+    )
+    group.addoption(
+        "--env-rerun-backoff",
+        type=float,
+        default=1.0,
+        help="Seconds before the first rerun, doubled for every further attempt, defaults to 1.",
+    )
+    group.addoption(
+        "--rerun-budget",
+        type=int,
+        default=10,
+        help="Number of reruns the whole session may spend, defaults to 10.",
+    )
+
+
+def classify_failure(error: BaseException) -> str:
+    """Return ``environmental`` or ``deterministic`` for a test's exception."""
+    if isinstance(error, AssertionError):
+        return "deterministic"
+    if isinstance(error, ENVIRONMENTAL_EXCEPTIONS):
+        return "environmental"
+    text = f"{type(error).__name__}: {error}"
+    if any(pattern.search(text) for pattern in ENVIRONMENTAL_PATTERNS):
+        return "environmental"
+    return "deterministic"
+
+
+def is_environmental(error) -> bool:
+    """Rerun condition of the flaky marker, given the exception of the failed phase."""
+    return error is not None and classify_failure(error) == "environmental"
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    # Travels with the report to the xdist controller and the results feed
+    if report.failed and call.excinfo is not None:
+        report.failure_kind = classify_failure(call.excinfo.value)
+
+
+class FlakinessReporter:
+    """Lists the tests that needed a rerun, with their flakiness score."""
+
+    def __init__(self, store: DurationStore):
+        self.store = store
+        self.rerun = set()
+
+    def pytest_runtest_logreport(self, report):
+        if report.outcome == "rerun":
+            self.rerun.add(report.nodeid)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.rerun:
+            return
+        # The durations store has this run's records by now
+        scores = flakiness_scores(self.store)
+        terminalreporter.section("environmental reruns", yellow=True)
+        for nodeid in sorted(self.rerun, key=lambda nodeid: -scores.get(nodeid, 0)):
+            terminalreporter.line(f"{nodeid}: flakiness {scores.get(nodeid, 0):.2f}")
+
+
+def flakiness_scores(store: DurationStore, window: int = HISTORY_WINDOW) -> dict:
+    """Return the share of each test's recent runs that needed a rerun."""
+    runs = {}
+    for record in store.records():
+        runs.setdefault(record["nodeid"], []).append(bool(record.get("reruns")))
+    return {nodeid: sum(values[-window:]) / len(values[-window:]) for nodeid, values in runs.items()}
+
+
+def pytest_configure(config):
+    if config.getoption("env_reruns") > 0:
+        if config.getoption("usepdb"):
+            raise pytest.UsageError("--env-reruns cannot be used with --pdb")
+        if not config.pluginmanager.hasplugin("rerunfailures"):
+            raise pytest.UsageError("--env-reruns needs pytest-rerunfailures: pip install pytest-rerunfailures")
+        if config.option.max_suite_reruns is None:
+            config.option.max_suite_reruns = config.getoption("rerun_budget")
+    if not hasattr(config, "workerinput"):
+        config.pluginmanager.register(
+            FlakinessReporter(DurationStore(config.getoption("durations_store"))), "flakiness-reporter"
+        )
+
+
+def pytest_collection_modifyitems(config, items):
+    max_reruns = config.getoption("env_reruns")
+    if max_reruns <= 0:
+        return
+    rerun = pytest.mark.flaky(
+        reruns=max_reruns,
+        reruns_delay=config.getoption("env_rerun_backoff"),
+        reruns_delay_backoff_factor=2,
+        condition=is_environmental,
+    )
+    for item in items:
+        # A test's own flaky marker takes precedence
+        if item.get_closest_marker("flaky") is None:
+            item.add_marker(rerun)
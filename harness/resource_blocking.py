@@ -0,0 +1,161 @@
+"""Route-interception profiles that keep ads, trackers and media off the wire.
+
+A profile aborts requests by resource type or host pattern for the whole
+browser context. It is chosen with ``--resource-profile`` and can be overridden
+per test, class or module with ``@pytest.mark.resource_profile("minimal")``:
+
+- ``full``: nothing is blocked (the default)
+- ``no-media``: images, media and fonts are blocked
+- ``minimal``: like ``no-media``, plus ad and tracking hosts
+
+Every test gets a "resources" report section with the number of blocked and
+allowed requests and an approximate byte count of the allowed responses: the
+sum of their Content-Length headers. Chunked and some compressed responses have
+none, so the section also says how many responses were left out of the sum.
+Blocked requests never reach the server, so their size is unknown.
+"""
+import fnmatch
+from typing import NamedTuple, Tuple
+from urllib.parse import urlsplit
+
+import pytest
+from playwright.sync_api import BrowserContext, Error, Page, Request, Response, Route
+
+AD_HOSTS = (
+    "*.doubleclick.net",
+    "*.googlesyndication.com",
+    "*.googletagservices.com",
+    "*.googletagmanager.com",
+    "*.google-analytics.com",
+    "adservice.google.*",
+    "*.adservice.google.*",
+    "*.amazon-adsystem.com",
+    "*.adnxs.com",
+    "*.pubmatic.com",
+    "*.rubiconproject.com",
+    "*.criteo.com",
+    "*.criteo.net",
+    "*.casalemedia.com",
+    "*.openx.net",
+    "*.taboola.com",
+    "*.outbrain.com",
+    "*.ezoic.net",
+    "*.ezodn.com",
+)
+
+
+class BlockingProfile(NamedTuple):
+    """Resource types and host globs whose requests are aborted."""
+
+    resource_types: Tuple[str, ...] = ()
+    hosts: Tuple[str, ...] = ()
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.resource_types and not self.hosts
+
+    def blocks(self, request: Request) -> bool:
+        if request.resource_type in self.resource_types:
+            return True
+        host = urlsplit(request.url).hostname or ""
+        return any(fnmatch.fnmatchcase(host, pattern) for pattern in self.hosts)
+
+
+PROFILES = {
+    "full": BlockingProfile(),
+    "no-media": BlockingProfile(resource_types=("image", "media", "font")),
+    "minimal": BlockingProfile(resource_types=("image", "media", "font"), hosts=AD_HOSTS),
+}
+
+
+def pytest_addoption(parser):
+    parser.getgroup("resource-blocking", "Resource blocking").addoption(
+        "--resource-profile",
+        default="full",
+        choices=sorted(PROFILES),
+        help="Requests to block for every test unless a resource_profile marker says otherwise.",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        f"resource_profile(name): block requests with one of the profiles {', '.join(sorted(PROFILES))}",
+    )
+
+
+class ResourceBlocker:
+    """Applies a blocking profile to a browser context and counts the traffic."""
+
+    def __init__(self, profile: BlockingProfile):
+        self.profile = profile
+        self.blocked = 0
+        self.allowed = 0
+        # Content-Length sum of the allowed responses, and the responses without one
+        self.allowed_bytes = 0
+        self.unsized = 0
+
+    def attach(self, context: BrowserContext):
+        context.on("response", self._on_response)
+        if not self.profile.is_empty:
+            context.route("**/*", self._route)
+
+    def detach(self, context: BrowserContext):
+        context.remove_listener("response", self._on_response)
+        if not self.profile.is_empty:
+            context.unroute("**/*", self._route)
+
+    def summary(self) -> dict:
+        return {
+            "blocked": self.blocked,
+            "allowed": self.allowed,
+            "allowed_bytes": self.allowed_bytes,
+            "unsized": self.unsized,
+        }
+
+    def _route(self, route: Route):
+        if self.profile.blocks(route.request):
+            self.blocked += 1
+            route.abort("blockedbyclient")
+        else:
+            route.fallback()
+
+    def _on_response(self, response: Response):
+        self.allowed += 1
+        # The provisional headers are already on this side of the connection;
+        # asking for exact sizes would cost a round trip per response
+        length = response.headers.get("content-length")
+        if length and length.isdigit():
+            self.allowed_bytes += int(length)
+        else:
+            self.unsized += 1
+
+
+@pytest.fixture(scope="function", autouse=True)
+def resource_blocking(network_archive, request, pytestconfig):
+    """Block requests according to the test's resource profile and report the counts."""
+    # Depends on network_archive so this route is registered last and runs
+    # first: blocked requests are not recorded and need no replay entry.
+    if "page" not in request.fixturenames:
+        yield None
+        return
+    marker = request.node.get_closest_marker("resource_profile")
+    name = marker.args[0] if marker else pytestconfig.getoption("resource_profile")
+    if name not in PROFILES:
+        raise pytest.UsageError(f"Unknown resource profile: {name}")
+    blocker = ResourceBlocker(PROFILES[name])
+    context = request.getfixturevalue("page").context
+    blocker.attach(context)
+    yield blocker
+    try:
+        blocker.detach(context)
+    except Error:
+        pass
+    summary = blocker.summary()
+    request.node.user_properties.append(("resources", summary))
+    request.node.add_report_section(
+        "teardown",
+        "resources",
+        f"profile={name} blocked={summary['blocked']} allowed={summary['allowed']} "
+        f"allowed_bytes~{summary['allowed_bytes']} (Content-Length, {summary['unsized']} responses without one)",
+    )
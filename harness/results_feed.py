@@ -0,0 +1,390 @@
+"""Streaming JSONL results feed and the paginated HTML report built from it.
+
+With ``--results-feed=reports/results.jsonl`` every test phase is appended to
+the feed as one JSON line the moment it is reported, and flushed. A feed
+therefore shows a run's progress while it goes and survives a killed
+container, up to its last line:
+
+- ``session_start`` and ``session_finish`` records frame the run; the start
+  record carries a run id
+- ``phase`` records carry a test phase's outcome, duration, error text,
+  captured output and artifact paths (traces, videos)
+- ``test_finish`` records mark the end of a test, after any reruns
+- a ``duration_regressions`` record, before the end, lists the tests that got
+  slower than their history (see ``harness.durations``)
+
+The renderer turns a feed into a paginated HTML report, incrementally:
+
+    python -m harness.results_feed render reports/results.jsonl reports/html
+    python -m harness.results_feed render reports/results.jsonl reports/html --watch 10
+
+It remembers how far into the feed it got, so each render reads only the new
+records. Full pages are written once, and only the last page and the index
+are rewritten. Artifacts are linked, never inlined.
+"""
+import argparse
+import hashlib
+import html
+import json
+import os
+import sys
+import time
+import urllib.parse
+import uuid
+from pathlib import Path
+from typing import List, Optional
+
+import pytest
+
+from harness.durations import format_slowdown
+
+FEED_VERSION = 1
+# Captured output kept per section, from the end
+MAX_SECTION_CHARS = 20000
+DEFAULT_PAGE_SIZE = 200
+STATE_FILE = ".render-state.json"
+ARTIFACT_PROPERTIES = {"playwright_trace": "Trace", "playwright_video": "Video"}
+
+
+def pytest_addoption(parser):
+    parser.getgroup("results-feed", "Results feed").addoption(
+        "--results-feed",
+        default=None,
+        metavar="PATH",
+        help="Append a JSON record per test phase to this JSONL file while the run goes.",
+    )
+
+
+def _tail(text: str, limit: int = MAX_SECTION_CHARS) -> str:
+    return text if len(text) <= limit else f"[{len(text) - limit} characters cut]\n{text[-limit:]}"
+
+
+class ResultsFeed:
+    """Appends and flushes one JSON record per test phase."""
+
+    def __init__(self, config, path: str):
+        self.config = config
+        self.path = path
+        self.root = Path(config.invocation_params.dir)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # One feed per run; line buffered, so every record reaches the file as soon as it is written
+        self._file = open(path, "w", encoding="utf-8", buffering=1)
+        # Tests whose current attempt is followed by a rerun
+        self._rerunning = set()
+
+    def _write(self, record: dict):
+        self._file.write(json.dumps(record, default=str) + "\n")
+
+    def pytest_sessionstart(self, session):
+        self._write({
+            "type": "session_start",
+            "version": FEED_VERSION,
+            "run": uuid.uuid4().hex,
+            "time": time.time(),
+            "args": list(self.config.invocation_params.args),
+        })
+
+    def pytest_runtest_logreport(self, report):
+        if report.outcome == "rerun":
+            self._rerunning.add(report.nodeid)
+        artifacts = [
+            {"name": ARTIFACT_PROPERTIES[name], "path": str(self.root / value)}
+            for name, value in report.user_properties
+            if name in ARTIFACT_PROPERTIES
+        ]
+        self._write({
+            "type": "phase",
+            "nodeid": report.nodeid,
+            "when": report.when,
+            "outcome": report.outcome,
+            "wasxfail": hasattr(report, "wasxfail"),
+            "duration": report.duration,
+            "start": getattr(report, "start", None),
+            "browser": getattr(report, "browser_name", None),
+            # xdist attaches the worker a report came from
+            "worker": getattr(getattr(report, "node", None), "workerinput", {}).get("workerid"),
+            "failure_kind": getattr(report, "failure_kind", None),
+            "longrepr": _tail(report.longreprtext) if report.longrepr else None,
+            "sections": [[title, _tail(content)] for title, content in report.sections],
+            "artifacts": artifacts,
+        })
+
+    def pytest_runtest_logfinish(self, nodeid, location):
+        # Every attempt finishes, the test only after its last one
+        if nodeid in self._rerunning:
+            self._rerunning.discard(nodeid)
+            return
+        self._write({"type": "test_finish", "nodeid": nodeid, "time": time.time()})
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session, exitstatus):
+        recorder = self.config.pluginmanager.get_plugin("duration-recorder")
+        if recorder is not None and recorder.regressions:
+            self._write({"type": "duration_regressions", "regressions": recorder.regressions})
+        self._write({"type": "session_finish", "time": time.time(), "exitstatus": int(exitstatus)})
+        self._file.close()
+
+
+def pytest_configure(config):
+    path = config.getoption("results_feed")
+    # xdist workers report to the controller, which writes the feed
+    if path and not hasattr(config, "workerinput"):
+        config.pluginmanager.register(ResultsFeed(config, path), "results-feed")
+
+
+class ReportRenderer:
+    """Renders a results feed into paginated HTML, picking up where it left off."""
+
+    def __init__(self, feed_path: str, out_dir: str, page_size: int = DEFAULT_PAGE_SIZE):
+        self.feed_path = feed_path
+        self.out_dir = out_dir
+        self.page_size = page_size
+        self.state_path = os.path.join(out_dir, STATE_FILE)
+        self.state = self._load_state()
+
+    def _run_identity(self) -> Optional[str]:
+        """Hash of the feed's first line, the start record of the run it holds."""
+        with open(self.feed_path, "rb") as f:
+            first = f.readline()
+        return hashlib.sha1(first).hexdigest() if first.endswith(b"\n") else None
+
+    def _load_state(self) -> dict:
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                state = json.load(f)
+            if (
+                state["feed"] == os.path.abspath(self.feed_path)
+                and state["page_size"] == self.page_size
+                # A new run rewrote the feed, whatever its size
+                and state["run"] is not None
+                and state["run"] == self._run_identity()
+            ):
+                return state
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            pass
+        return {
+            "feed": os.path.abspath(self.feed_path),
+            "page_size": self.page_size,
+            "run": None,
+            "offset": 0,
+            "full_pages": [],  # counts of the pages that are written for good
+            "open_page": [],  # tests of the last page
+            "pending": {},  # tests started but not finished
+            "counts": {},
+            "failures": [],  # [nodeid, page number, anchor]
+            "regressions": [],
+            "session": {},
+        }
+
+    def render(self) -> bool:
+        """Render the records added since the last call; return True when the run finished."""
+        os.makedirs(self.out_dir, exist_ok=True)
+        if not self.state["offset"]:
+            # Pages left over from an earlier feed
+            for stale in Path(self.out_dir).glob("page-*.html"):
+                stale.unlink()
+        if self.state["run"] is None:
+            self.state["run"] = self._run_identity()
+        records = self._read_new_records()
+        dirty = bool(records)
+        for record in records:
+            self._apply(record)
+        if dirty or not os.path.exists(os.path.join(self.out_dir, "index.html")):
+            if self.state["open_page"] or not self.state["full_pages"]:
+                self._write_page(len(self.state["full_pages"]) + 1, self.state["open_page"])
+            self._write_index()
+            self._save_state()
+        return "finish" in self.state["session"]
+
+    def _read_new_records(self) -> List[dict]:
+        with open(self.feed_path, "rb") as f:
+            f.seek(self.state["offset"])
+            data = f.read()
+        # A line cut short by a writer that is still going (or was killed) waits for its end
+        end = data.rfind(b"\n") + 1
+        self.state["offset"] += end
+        records = []
+        for line in data[:end].splitlines():
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+        return records
+
+    def _apply(self, record: dict):
+        kind = record["type"]
+        if kind == "session_start":
+            self.state["session"] = {"start": record["time"], "args": record.get("args", [])}
+        elif kind == "session_finish":
+            self.state["session"]["finish"] = record["time"]
+            self.state["session"]["exitstatus"] = record["exitstatus"]
+        elif kind == "phase":
+            self._apply_phase(record)
+        elif kind == "duration_regressions":
+            self.state["regressions"] = record["regressions"]
+        elif kind == "test_finish":
+            test = self.state["pending"].pop(record["nodeid"], None)
+            if test is not None:
+                self._add_test(test)
+
+    def _apply_phase(self, record: dict):
+        test = self.state["pending"].setdefault(record["nodeid"], {
+            "nodeid": record["nodeid"],
+            "outcome": "passed",
+            "duration": 0.0,
+            "reruns": 0,
+            "browser": record.get("browser"),
+            "errors": [],
+            "sections": [],
+            "artifacts": [],
+        })
+        test["duration"] += record["duration"]
+        outcome, when = record["outcome"], record["when"]
+        if outcome == "rerun":
+            test["reruns"] += 1
+        elif outcome == "failed":
+            test["outcome"] = "failed" if when == "call" else "error"
+        elif outcome == "passed" and record.get("wasxfail"):
+            test["outcome"] = "xpassed"
+        elif outcome == "skipped" and test["outcome"] == "passed":
+            test["outcome"] = "xfailed" if record.get("wasxfail") else "skipped"
+        if record.get("longrepr") and outcome != "passed":
+            test["errors"].append({"when": when, "outcome": outcome, "text": record["longrepr"]})
+        if outcome in ("failed", "rerun"):
+            test["sections"].extend(record.get("sections", []))
+        test["artifacts"].extend(record.get("artifacts", []))
+
+    def _add_test(self, test: dict):
+        counts = self.state["counts"]
+        counts[test["outcome"]] = counts.get(test["outcome"], 0) + 1
+        if test["reruns"]:
+            counts["rerun"] = counts.get("rerun", 0) + 1
+        page = self.state["open_page"]
+        page.append(test)
+        page_number = len(self.state["full_pages"]) + 1
+        if test["outcome"] in ("failed", "error"):
+            self.state["failures"].append([test["nodeid"], page_number, f"t{len(page)}"])
+        if len(page) == self.page_size:
+            # Written one last time, then never touched again
+            self._write_page(page_number, page)
+            self.state["full_pages"].append(len(page))
+            self.state["open_page"] = []
+
+    def _save_state(self):
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f)
+        os.replace(tmp_path, self.state_path)
+
+    def _link(self, path: str) -> str:
+        return urllib.parse.quote(Path(os.path.relpath(path, self.out_dir)).as_posix())
+
+    def _write_page(self, number: int, tests: List[dict]):
+        rows = []
+        for index, test in enumerate(tests, 1):
+            links = " ".join(
+                f'<a href="{self._link(artifact["path"])}">{html.escape(artifact["name"])}</a>'
+                for artifact in test["artifacts"]
+            )
+            details = "".join(
+                f"<details><summary>{html.escape(error['when'])} {html.escape(error['outcome'])}</summary>"
+                f"<pre>{html.escape(error['text'])}</pre></details>"
+                for error in test["errors"]
+            ) + "".join(
+                f"<details><summary>{html.escape(title)}</summary><pre>{html.escape(content)}</pre></details>"
+                for title, content in test["sections"]
+            )
+            rows.append(
+                f'<tr id="t{index}" class="{test["outcome"]}"><td>{test["outcome"]}</td>'
+                f"<td>{html.escape(test['nodeid'])}{details}</td>"
+                f"<td>{test['duration']:.2f}s</td><td>{test['reruns'] or ''}</td><td>{links}</td></tr>"
+            )
+        pages = max(len(self.state["full_pages"]) + bool(self.state["open_page"]), number)
+        navigation = " ".join(
+            f'<a href="page-{n:04d}.html">{n}</a>' if n != number else f"<b>{n}</b>" for n in range(1, pages + 1)
+        )
+        body = (
+            f'<p><a href="index.html">Summary</a> | Page {navigation}</p>'
+            "<table><tr><th>Outcome</th><th>Test</th><th>Duration</th><th>Reruns</th><th>Artifacts</th></tr>"
+            + "".join(rows)
+            + "</table>"
+        )
+        self._write_html(f"page-{number:04d}.html", f"Results, page {number}", body)
+
+    def _write_index(self):
+        session = self.state["session"]
+        finished = "finish" in session
+        if finished:
+            status = f"Finished with exit status {session['exitstatus']} in {session['finish'] - session['start']:.0f}s"
+        elif session:
+            status = f"Running for {time.time() - session['start']:.0f}s (or interrupted)"
+        else:
+            status = "Waiting for the run to start"
+        counts = ", ".join(f"{count} {outcome}" for outcome, count in sorted(self.state["counts"].items()))
+        if self.state["pending"]:
+            counts = ", ".join(filter(None, [counts, f"{len(self.state['pending'])} running"]))
+        page_counts = self.state["full_pages"]
+        if self.state["open_page"] or not page_counts:
+            page_counts = page_counts + [len(self.state["open_page"])]
+        pages = "".join(
+            f'<li><a href="page-{n:04d}.html">Page {n}</a>: {count} tests</li>' for n, count in enumerate(page_counts, 1)
+        )
+        failures = "".join(
+            f'<li><a href="page-{page:04d}.html#{anchor}">{html.escape(nodeid)}</a></li>'
+            for nodeid, page, anchor in self.state["failures"]
+        )
+        regressions = "".join(
+            f"<li>{html.escape(r['nodeid'])}: {r['duration']:.2f}s "
+            f"(p50 {r['p50']:.2f}s, p95 {r['p95']:.2f}s, {format_slowdown(r)})</li>"
+            for r in self.state["regressions"]
+        )
+        body = (
+            f"<p>{html.escape(status)}</p><p>{counts or 'No tests finished yet'}</p>"
+            f"<h2>Failures</h2><ul>{failures or '<li>None</li>'}</ul>"
+            + (f"<h2>Duration regressions</h2><ul>{regressions}</ul>" if regressions else "")
+            + f"<h2>Pages</h2><ul>{pages}</ul>"
+        )
+        self._write_html("index.html", "Test results", body, refresh=not finished)
+
+    def _write_html(self, name: str, title: str, body: str, refresh: bool = False):
+        head = '<meta http-equiv="refresh" content="30">' if refresh else ""
+        document = (
+            f"<!DOCTYPE html><html><head><meta charset=\"utf-8\">{head}<title>{html.escape(title)}</title>"
+            "<style>body{font-family:sans-serif;margin:16px}table{border-collapse:collapse;width:100%}"
+            "td,th{border-bottom:1px solid #ddd;padding:4px 8px;text-align:left;vertical-align:top}"
+            "pre{white-space:pre-wrap;font-size:12px}.failed,.error{background:#fde8e8}"
+            ".skipped,.xfailed{background:#fdf6e3}</style></head>"
+            f"<body><h1>{html.escape(title)}</h1>{body}</body></html>"
+        )
+        tmp_path = os.path.join(self.out_dir, name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(document)
+        os.replace(tmp_path, os.path.join(self.out_dir, name))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m harness.results_feed", description="Render a results feed.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    render = commands.add_parser("render", help="Render the feed into paginated HTML, incrementally.")
+    render.add_argument("feed", help="JSONL results feed written with --results-feed.")
+    render.add_argument("out_dir", nargs="?", default=os.path.join("reports", "html"),
+                        help="Output directory, defaults to reports/html.")
+    render.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE,
+                        help=f"Tests per page, defaults to {DEFAULT_PAGE_SIZE}.")
+    render.add_argument("--watch", type=float, metavar="SECONDS",
+                        help="Render again every SECONDS until the run finishes.")
+    args = parser.parse_args(argv)
+    renderer = ReportRenderer(args.feed, args.out_dir, args.page_size)
+    while True:
+        finished = renderer.render()
+        if finished or not args.watch:
+            break
+        time.sleep(args.watch)
+    print(f"report written to {os.path.join(args.out_dir, 'index.html')}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""Longest-first scheduling of tests across pytest-xdist workers.
+
+With ``-n`` (``--dist=load``, xdist's default) tests are handed out one at a
+time, longest expected duration first, based on the history in the durations
+store. Every worker keeps one browser for the whole session (the
+pytest-playwright ``browser`` fixture is session-scoped), so spreading the slow
+tests is what is left to make wall-clock time scale with the number of workers.
+Tests without history are assumed to take the median known duration.
+
+``--schedule=load`` falls back to xdist's own scheduler.
+"""
+import statistics
+
+import pytest
+
+from harness.durations import DurationStore
+
+# Tests with no history yet, when there is no history at all
+DEFAULT_DURATION = 1.0
+
+
+def pytest_addoption(parser):
+    parser.getgroup("xdist").addoption(
+        "--schedule",
+        default="duration",
+        choices=["duration", "load"],
+        help="How --dist=load hands tests to workers: longest first from the duration history, "
+        "or xdist's default chunked order.",
+    )
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    if config.getoption("dist") != "load" or config.getoption("schedule") != "duration":
+        return None
+    durations = DurationStore(config.getoption("durations_store")).expected_durations()
+    return _duration_scheduling_class()(config, log, durations)
+
+
+def _duration_scheduling_class():
+    # pytest-xdist is optional, only import it once a distributed run asks for it
+    from xdist.scheduler import LoadScheduling
+
+    class DurationScheduling(LoadScheduling):
+        """LoadScheduling that keeps every worker one test ahead, longest test first."""
+
+        # xdist workers only run a test once they know the one after it
+        per_node = 2
+
+        def __init__(self, config, log, durations):
+            super().__init__(config, log)
+            self.durations = durations
+            self.default_duration = (
+                statistics.median(durations.values()) if durations else DEFAULT_DURATION
+            )
+
+        def expected_duration(self, nodeid: str) -> float:
+            return self.durations.get(nodeid, self.default_duration)
+
+        def schedule(self):
+            assert self.collection_is_completed
+            if self.collection is not None:
+                for node in self.nodes:
+                    self.check_schedule(node)
+                return
+            if not self._check_nodes_have_same_collection():
+                self.log("**Different tests collected, aborting run**")
+                return
+            self.collection = next(iter(self.node2collection.values()))
+            self.pending[:] = sorted(
+                range(len(self.collection)),
+                key=lambda index: self.expected_duration(self.collection[index]),
+                reverse=True,
+            )
+            # Deal the tests out round by round, so the longest ones start on
+            # different workers instead of queueing behind each other
+            for _ in range(self.per_node):
+                for node in self.nodes:
+                    self._send_tests(node, 1)
+            if not self.pending:
+                for node in self.nodes:
+                    node.shutdown()
+
+        def check_schedule(self, node, duration=0):
+            if node.shutting_down:
+                return
+            if self.pending:
+                missing = self.per_node - len(self.node2pending[node])
+                if missing > 0:
+                    self._send_tests(node, missing)
+            else:
+                node.shutdown()
+            self.log("num items waiting for node:", len(self.pending))
+
+    return DurationScheduling
@@ -0,0 +1,179 @@
+"""Screenshots written to disk by a background thread.
+
+Tests only wait for the browser to capture a screenshot. A writer thread
+encodes it and writes it to ``--screenshot-dir``. With ``--screenshot-format``
+the encoding is ``png`` (recompressed when Pillow is installed), ``jpeg``
+(encoded by the browser) or ``webp`` (needs Pillow). ``--screenshot-quality``
+sets the quality of the lossy formats.
+
+File names carry the xdist worker and, for failure screenshots, the attempt, so
+reruns and parallel workers never overwrite each other. A screenshot identical
+to one already written in the session is not written again; the earlier file's
+path is returned instead.
+"""
+import hashlib
+import io
+import os
+import queue
+import threading
+from typing import Dict, Optional
+
+import pytest
+from playwright.sync_api import Page
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional
+    Image = None
+
+FORMATS = ("png", "jpeg", "webp")
+EXTENSIONS = {"png": ".png", "jpeg": ".jpg", "webp": ".webp"}
+
+_writer: Optional["ScreenshotWriter"] = None
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("screenshots", "Screenshots")
+    group.addoption(
+        "--screenshot-dir",
+        default="screenshots",
+        help="Directory screenshots are written to, defaults to screenshots.",
+    )
+    group.addoption(
+        "--screenshot-format",
+        default="png",
+        choices=FORMATS,
+        help="Image format of the screenshots, defaults to png. webp needs Pillow.",
+    )
+    group.addoption(
+        "--screenshot-quality",
+        type=int,
+        default=80,
+        help="Quality (0-100) of jpeg and webp screenshots, defaults to 80.",
+    )
+
+
+class ScreenshotWriter:
+    """Encodes and writes screenshots on a background thread."""
+
+    def __init__(self, directory: str = "screenshots", image_format: str = "png", quality: int = 80):
+        if image_format == "webp" and Image is None:
+            raise ValueError("webp screenshots need Pillow (pip install Pillow)")
+        self.directory = directory
+        self.image_format = image_format
+        self.quality = quality
+        self.worker = os.environ.get("PYTEST_XDIST_WORKER")
+        self.written = 0
+        self.duplicates = 0
+        self._paths_by_hash: Dict[str, str] = {}
+        self._used_paths = set()
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="screenshot-writer", daemon=True)
+        self._thread.start()
+
+    def screenshot_options(self) -> dict:
+        """Arguments for ``page.screenshot`` that capture in this writer's format."""
+        if self.image_format == "jpeg":
+            return {"type": "jpeg", "quality": self.quality}
+        return {"type": "png"}
+
+    def capture(self, page: Page, name: str, **kwargs) -> str:
+        """Take a screenshot of the page and queue it for writing; return its path."""
+        return self.submit(page.screenshot(**self.screenshot_options(), **kwargs), name)
+
+    def submit(self, data: bytes, name: str) -> str:
+        """Queue a captured screenshot for writing and return the path it gets."""
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            if digest in self._paths_by_hash:
+                self.duplicates += 1
+                return self._paths_by_hash[digest]
+            path = self._unique_path(name)
+            self._paths_by_hash[digest] = path
+        self._queue.put((data, path))
+        return path
+
+    def flush(self):
+        """Wait until every queued screenshot is on disk."""
+        self._queue.join()
+
+    def close(self):
+        self.flush()
+        self._queue.put(None)
+        self._thread.join()
+
+    def _unique_path(self, name: str) -> str:
+        stem = os.path.splitext(name)[0]
+        if self.worker:
+            stem = f"{stem}-{self.worker}"
+        extension = EXTENSIONS[self.image_format]
+        path = os.path.join(self.directory, stem + extension)
+        counter = 1
+        while path in self._used_paths:
+            counter += 1
+            path = os.path.join(self.directory, f"{stem}-{counter}{extension}")
+        self._used_paths.add(path)
+        return path
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                data, path = item
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                with open(path, "wb") as f:
+                    f.write(self._encode(data))
+                self.written += 1
+            except Exception as e:
+                print(f"Failed to write screenshot: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _encode(self, data: bytes) -> bytes:
+        # jpeg comes encoded from the browser; png and webp are re-encoded from
+        # the browser's png when Pillow is available
+        if Image is None or self.image_format == "jpeg":
+            return data
+        image = Image.open(io.BytesIO(data))
+        out = io.BytesIO()
+        if self.image_format == "webp":
+            image.save(out, format="WEBP", quality=self.quality, method=4)
+        else:
+            image.save(out, format="PNG", optimize=True)
+        return out.getvalue()
+
+
+def get_writer() -> ScreenshotWriter:
+    """Return the session's screenshot writer, starting a default one outside pytest."""
+    global _writer
+    if _writer is None:
+        _writer = ScreenshotWriter()
+    return _writer
+
+
+@pytest.fixture(scope="session")
+def screenshot_writer() -> ScreenshotWriter:
+    """The session's screenshot writer."""
+    return get_writer()
+
+
+def pytest_configure(config):
+    global _writer
+    try:
+        _writer = ScreenshotWriter(
+            config.getoption("screenshot_dir"),
+            config.getoption("screenshot_format"),
+            config.getoption("screenshot_quality"),
+        )
+    except ValueError as e:
+        raise pytest.UsageError(str(e))
+
+
+def pytest_unconfigure(config):
+    global _writer
+    if _writer is not None:
+        _writer.close()
+        _writer = None
@@ -0,0 +1,318 @@
+"""Soak mode: page object flows run thousands of times on concurrent contexts.
+
+Soak tests are marked ``soak`` and hand an async flow to the ``soak`` fixture:
+
+    @pytest.mark.soak
+    def test_fill_and_submit_soak(soak):
+        async def fill_and_submit(page):
+            ...
+        soak.run(fill_and_submit)
+
+Soak tests are deselected unless ``--soak=N`` is given; the flow then runs N
+times (once with ``--soak=1``), each time on a new browser context of the async
+driver, with ``--concurrency`` (defaults to ``--async-concurrency``) iterations
+at a time:
+
+    pytest -m soak --soak=5000 --concurrency=8 --base-url=fake
+
+Every ``--soak-sample-interval`` seconds the run samples the iterations done,
+the open browser contexts, and the resident memory of this process and of its
+child processes (the Playwright driver and the browsers it launched; Linux
+only, and not the browsers of a browser daemon). The terminal summary shows
+each soak test's throughput, latency percentiles and memory growth, and the
+samples are written to ``.harness/soak/<test>.json``. A soak test fails when
+any iteration failed or when browser contexts were left open.
+"""
+import asyncio
+import json
+import os
+import time
+from collections import defaultdict
+from typing import Awaitable, Callable, List, NamedTuple, Optional
+
+import pytest
+from playwright.async_api import Page
+
+from harness.async_driver import AsyncDriver
+from harness.durations import percentile
+from harness.utils import node_slug
+
+SOAK_DIR = os.path.join(".harness", "soak")
+# Failed iterations listed in a failure message
+MAX_REPORTED_ERRORS = 5
+
+_results_key = pytest.StashKey[list]()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("soak", "Soak mode")
+    group.addoption(
+        "--soak",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Run the soak tests, each flow N times. Soak tests are deselected without it.",
+    )
+    group.addoption(
+        "--concurrency",
+        type=int,
+        default=None,
+        metavar="M",
+        help="Soak iterations run at the same time, defaults to --async-concurrency.",
+    )
+    group.addoption(
+        "--soak-sample-interval",
+        type=float,
+        default=5.0,
+        help="Seconds between memory and progress samples of a soak run, defaults to 5.",
+    )
+
+
+def _rss(pid: int) -> int:
+    with open(f"/proc/{pid}/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def process_tree_rss(root: int) -> Optional[int]:
+    """Return the summed resident memory, in bytes, of the descendants of ``root``.
+
+    Shared pages are counted once per process. Returns None without ``/proc``.
+    """
+    if not os.path.isdir("/proc"):
+        return None
+    children = defaultdict(list)
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # The command name can contain spaces and parentheses; the fields after it cannot
+        ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        children[ppid].append(int(entry))
+    total = 0
+    pending = list(children[root])
+    while pending:
+        pid = pending.pop()
+        try:
+            total += _rss(pid)
+        except OSError:
+            continue
+        pending.extend(children[pid])
+    return total
+
+
+class SoakResult(NamedTuple):
+    """The outcome of a soak run."""
+
+    iterations: int
+    concurrency: int
+    duration: float  # seconds
+    latencies: List[float]  # seconds, of the iterations that passed
+    errors: List[BaseException]
+    samples: List[dict]
+    leaked_contexts: int
+
+    @property
+    def throughput(self) -> float:
+        """Iterations per second."""
+        return self.iterations / self.duration if self.duration else 0.0
+
+    def rss_growth(self, key: str) -> Optional[float]:
+        """Least-squares slope of a memory sample over time, in MB per hour."""
+        points = [(s["elapsed"], s[key]) for s in self.samples if s.get(key) is not None]
+        if len(points) < 2:
+            return None
+        mean_t = sum(t for t, _ in points) / len(points)
+        mean_m = sum(m for _, m in points) / len(points)
+        variance = sum((t - mean_t) ** 2 for t, _ in points)
+        if not variance:
+            return None
+        slope = sum((t - mean_t) * (m - mean_m) for t, m in points) / variance
+        return slope * 3600 / 2**20
+
+    def summary(self) -> dict:
+        latencies = self.latencies or [0.0]
+        return {
+            "iterations": self.iterations,
+            "concurrency": self.concurrency,
+            "duration": round(self.duration, 3),
+            "throughput": round(self.throughput, 3),
+            "errors": len(self.errors),
+            "error_messages": [f"{type(e).__name__}: {e}" for e in self.errors[:MAX_REPORTED_ERRORS]],
+            "latency": {
+                "p50": percentile(latencies, 50),
+                "p95": percentile(latencies, 95),
+                "p99": percentile(latencies, 99),
+                "max": max(latencies),
+            },
+            "browser_rss_mb_per_hour": self.rss_growth("browser_rss"),
+            "python_rss_mb_per_hour": self.rss_growth("python_rss"),
+            "leaked_contexts": self.leaked_contexts,
+            "samples": self.samples,
+        }
+
+
+class SoakRunner:
+    """Runs an async page flow many times on the async driver's browser."""
+
+    def __init__(self, driver: AsyncDriver, iterations: int, concurrency: int, sample_interval: float):
+        self.driver = driver
+        self.iterations = iterations
+        self.concurrency = concurrency
+        self.sample_interval = sample_interval
+        self.results: List[SoakResult] = []
+
+    def run(self, flow: Callable[[Page], Awaitable]) -> SoakResult:
+        """Run ``flow(page)`` for every iteration, each on a new context.
+
+        With a single iteration the flow's exception is raised as is. Otherwise
+        an AssertionError is raised when iterations failed or contexts leaked.
+        """
+        result = self.driver.run(self._run(flow))
+        self.results.append(result)
+        if result.errors and self.iterations == 1:
+            raise result.errors[0]
+        problems = []
+        if result.errors:
+            messages = "\n".join(result.summary()["error_messages"])
+            problems.append(f"{len(result.errors)} of {result.iterations} iterations failed:\n{messages}")
+        if result.leaked_contexts:
+            problems.append(f"{result.leaked_contexts} browser contexts were left open")
+        assert not problems, "\n".join(problems)
+        return result
+
+    async def _run(self, flow) -> SoakResult:
+        browser = self.driver.browser
+        contexts_before = len(browser.contexts)
+        latencies: List[float] = []
+        errors: List[BaseException] = []
+        samples: List[dict] = []
+        started = 0
+        start = time.perf_counter()
+
+        def sample():
+            samples.append({
+                "elapsed": round(time.perf_counter() - start, 3),
+                "completed": len(latencies) + len(errors),
+                "contexts": len(browser.contexts),
+                "browser_rss": process_tree_rss(os.getpid()),
+                "python_rss": _rss(os.getpid()) if os.path.isdir("/proc") else None,
+            })
+
+        async def worker():
+            nonlocal started
+            while started < self.iterations:
+                started += 1
+                page = await self.driver.new_page()
+                iteration_start = time.perf_counter()
+                try:
+                    await flow(page)
+                except Exception as e:
+                    errors.append(e)
+                else:
+                    latencies.append(time.perf_counter() - iteration_start)
+                finally:
+                    await page.context.close()
+
+        async def sampler():
+            while True:
+                sample()
+                await asyncio.sleep(self.sample_interval)
+
+        sampling = asyncio.ensure_future(sampler())
+        try:
+            await asyncio.gather(*(worker() for _ in range(min(self.concurrency, self.iterations))))
+        finally:
+            sampling.cancel()
+        duration = time.perf_counter() - start
+        sample()
+        return SoakResult(
+            iterations=self.iterations,
+            concurrency=self.concurrency,
+            duration=duration,
+            latencies=latencies,
+            errors=errors,
+            samples=samples,
+            leaked_contexts=len(browser.contexts) - contexts_before,
+        )
+
+
+@pytest.fixture
+def soak(async_driver, request, pytestconfig) -> SoakRunner:
+    """Runs a soak test's flow once, or --soak times on --concurrency contexts."""
+    runner = SoakRunner(
+        async_driver,
+        iterations=max(pytestconfig.getoption("soak"), 1),
+        concurrency=pytestconfig.getoption("concurrency") or pytestconfig.getoption("async_concurrency"),
+        sample_interval=pytestconfig.getoption("soak_sample_interval"),
+    )
+    request.node.stash[_results_key] = runner.results
+    return runner
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    results = item.stash.get(_results_key, None)
+    if call.when == "call" and results and item.config.getoption("soak"):
+        # Travels with the report to the xdist controller
+        outcome.get_result().soak = [result.summary() for result in results]
+
+
+class SoakReporter:
+    """Writes each soak test's samples and summarizes the runs."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.runs = []
+
+    def pytest_runtest_logreport(self, report):
+        summaries = getattr(report, "soak", None)
+        if not summaries:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{node_slug(report.nodeid)}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"nodeid": report.nodeid, "runs": summaries}, f, indent=1)
+        self.runs.extend((report.nodeid, summary) for summary in summaries)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.runs:
+            return
+        terminalreporter.section("soak")
+        for nodeid, run in self.runs:
+            latency = run["latency"]
+            terminalreporter.line(
+                f"{nodeid}: {run['iterations']} iterations x{run['concurrency']} in {run['duration']:.1f}s, "
+                f"{run['throughput']:.2f}/s, {run['errors']} errors, {run['leaked_contexts']} leaked contexts"
+            )
+            terminalreporter.line(
+                f"  latency p50 {latency['p50'] * 1000:.0f}ms p95 {latency['p95'] * 1000:.0f}ms "
+                f"p99 {latency['p99'] * 1000:.0f}ms max {latency['max'] * 1000:.0f}ms"
+            )
+            samples = [s for s in run["samples"] if s["browser_rss"] is not None]
+            if samples:
+                growth = run["browser_rss_mb_per_hour"]
+                terminalreporter.line(
+                    f"  browser RSS {samples[0]['browser_rss'] / 2**20:.0f}MB -> "
+                    f"{samples[-1]['browser_rss'] / 2**20:.0f}MB"
+                    + (f" ({growth:+.1f}MB/h)" if growth is not None else "")
+                )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("soak"):
+        return
+    deselected = [item for item in items if item.get_closest_marker("soak")]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = [item for item in items if not item.get_closest_marker("soak")]
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "soak: a page object flow that --soak runs many times, deselected without it")
+    if config.getoption("soak") and not hasattr(config, "workerinput"):
+        config.pluginmanager.register(SoakReporter(SOAK_DIR), "soak-reporter")
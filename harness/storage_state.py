@@ -0,0 +1,187 @@
+"""Storage state bootstrapped once per session and shared by every context.
+
+With ``--storage-bootstrap``, before the first test a throwaway context visits each bootstrap page, accepts
+any consent banner, and saves its cookies and localStorage to
+``.harness/storage-state/<browser>.json``. ``browser_context_args`` then passes
+that file as ``storage_state``, so every context starts as a returning visitor.
+
+A snapshot is reused until it is older than ``--storage-state-ttl`` hours or
+the site version changes. The site version is a hash of the script and
+stylesheet URLs on the base page, which change with every deploy of a bundled
+frontend. It is not probed against the fake DemoQA, nor with
+``--network-mode=replay``, which only reuses an existing snapshot instead of
+visiting the live site. Without ``--storage-bootstrap`` every context starts
+empty.
+
+The bootstrap pages default to the pages under test and can be set with the
+``storage_bootstrap_pages`` ini option (paths relative to ``--base-url``).
+Playwright's storage state holds cookies and localStorage only; the HTTP cache
+is not part of it and stays per context.
+"""
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+import warnings
+from contextlib import contextmanager
+from typing import List, Optional
+from urllib.parse import urljoin
+
+import pytest
+from playwright.sync_api import Browser, Error
+
+from harness.fake_site import FAKE_BASE_URL
+
+try:
+    import fcntl
+except ImportError:  # Windows: concurrent workers may bootstrap twice
+    fcntl = None
+
+DEFAULT_BASE_URL = "https://demoqa.com"
+DEFAULT_PAGES = ["/", "/text-box", "/buttons", "/webtables", "/alerts"]
+STATE_DIR = os.path.join(".harness", "storage-state")
+
+# Accept buttons of the consent dialogs DemoQA has shown
+CONSENT_SELECTORS = (
+    ".fc-cta-consent",
+    "#onetrust-accept-btn-handler",
+    "button:has-text('Accept all')",
+    "button:has-text('Consent')",
+)
+
+_ASSET_URL = re.compile(r"<(?:script|link)\b[^>]*?(?:src|href)=[\"']([^\"']+\.(?:js|css)[^\"']*)[\"']", re.I)
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("storage-state", "Storage state bootstrap")
+    group.addoption(
+        "--storage-bootstrap",
+        action="store_true",
+        default=False,
+        help="Start every browser context from storage bootstrapped once per session.",
+    )
+    group.addoption(
+        "--storage-state-ttl",
+        type=float,
+        default=12.0,
+        help="Hours a bootstrapped storage state is reused, defaults to 12.",
+    )
+    parser.addini(
+        "storage_bootstrap_pages",
+        type="linelist",
+        help="Pages, relative to the base URL, visited to bootstrap the storage state.",
+    )
+
+
+def site_version(browser: Browser, base_url: str) -> Optional[str]:
+    """Return a hash of the base page's script and stylesheet URLs."""
+    context = browser.new_context()
+    try:
+        response = context.request.get(base_url, timeout=30000)
+        if not response.ok:
+            return None
+        assets = sorted(set(_ASSET_URL.findall(response.text())))
+    except Error:
+        return None
+    finally:
+        context.close()
+    return hashlib.sha256("\n".join(assets).encode()).hexdigest()[:16]
+
+
+class StorageSnapshot:
+    """A saved storage state plus the TTL and site version it is valid for."""
+
+    def __init__(self, directory: str, browser_name: str):
+        self.path = os.path.join(directory, f"{browser_name}.json")
+        self.meta_path = os.path.join(directory, f"{browser_name}.meta.json")
+
+    def is_valid(self, ttl_seconds: float, version: Optional[str]) -> bool:
+        try:
+            with open(self.meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return False
+        if not os.path.exists(self.path) or time.time() - meta["created"] > ttl_seconds:
+            return False
+        # An unknown version (site unreachable) keeps the snapshot until its TTL
+        return version is None or meta["site_version"] == version
+
+    def bootstrap(self, browser: Browser, urls: List[str], version: Optional[str]):
+        """Visit the pages in a fresh context and save its storage state."""
+        context = browser.new_context()
+        try:
+            page = context.new_page()
+            for url in urls:
+                page.goto(url, wait_until="load", timeout=60000)
+                _accept_consent(page)
+            state = context.storage_state()
+        finally:
+            context.close()
+        _write_json(self.path, state)
+        _write_json(self.meta_path, {"created": time.time(), "site_version": version, "pages": urls})
+
+    @contextmanager
+    def lock(self):
+        """Keep xdist workers from bootstrapping the same snapshot at once."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path + ".lock", "w") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _accept_consent(page):
+    for selector in CONSENT_SELECTORS:
+        button = page.locator(selector).first
+        try:
+            if button.is_visible():
+                button.click(timeout=5000)
+                return
+        except Error:
+            continue
+
+
+def _write_json(path: str, data):
+    # Written next to the target and renamed, so readers never see half a file
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+@pytest.fixture(scope="session")
+def storage_state(browser_name: str, base_url: Optional[str], pytestconfig, request) -> Optional[str]:
+    """Path of the bootstrapped storage state with --storage-bootstrap, None otherwise."""
+    if not pytestconfig.getoption("storage_bootstrap"):
+        return None
+    replay = pytestconfig.getoption("network_mode") == "replay"
+    snapshot = StorageSnapshot(STATE_DIR, browser_name)
+    ttl_seconds = pytestconfig.getoption("storage_state_ttl") * 3600
+    if replay:
+        # Replayed runs stay off the live site
+        if snapshot.is_valid(ttl_seconds, None):
+            return snapshot.path
+        warnings.warn("No storage state snapshot to reuse with --network-mode=replay, contexts start empty")
+        return None
+    browser: Browser = request.getfixturevalue("browser")
+    base_url = base_url or DEFAULT_BASE_URL
+    pages = pytestconfig.getini("storage_bootstrap_pages") or DEFAULT_PAGES
+    urls = [urljoin(base_url, page) for page in pages]
+    fake = pytestconfig.getoption("base_url") == FAKE_BASE_URL
+    # The fake DemoQA never deploys
+    version = None if fake else site_version(browser, base_url)
+    with snapshot.lock():
+        if not snapshot.is_valid(ttl_seconds, version):
+            try:
+                snapshot.bootstrap(browser, urls, version)
+            except Error as e:
+                # Tests still run, from empty storage
+                warnings.warn(f"Storage state bootstrap failed, contexts start empty: {e}")
+                return None
+    return snapshot.path
@@ -0,0 +1,236 @@
+"""URL-grouped execution: tests that start on the same page share it.
+
+Tests declare the page they start on with a marker, as a path under the base
+URL or as an absolute URL:
+
+    @pytest.mark.page_url("/text-box")
+    def test_form_inputs_have_labels(page): ...
+
+With ``--group-by-url`` the tests are reordered so that those of a URL (and
+browser) run one after another, on one page of the page pool. Once a test is
+done the page is reset in place instead of navigated away: routes, cookies,
+permissions, storage and the viewport are reset as usual, form controls are put
+back to their default values, and a fingerprint of the page (URL, open dialogs,
+and the form values, number of elements and text of result regions and tables
+of its main content, leaving out ads and other third-party nodes) is compared
+to the one taken right after it was loaded. When they match, the next test's
+navigation to that URL through a page object is skipped. When they do not, the
+page is reloaded, which still saves the trip to ``about:blank`` and
+back. A page is only reused at the viewport it was loaded at: a test that
+resizes the page before navigating gets a real navigation.
+
+With pytest-xdist, ``--dist=loadgroup`` keeps each group on one worker.
+"""
+import weakref
+from typing import Dict, Optional
+
+import pytest
+from playwright.sync_api import Page
+
+from pages.base_page import BasePage, NavigationListener
+
+# Puts form controls back to their default values, through the native setters
+# and events React listens to, and drops focus and scroll position
+RESET_SCRIPT = """() => {
+    const setters = {
+        INPUT: Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set,
+        TEXTAREA: Object.getOwnPropertyDescriptor(HTMLTextAreaElement.prototype, 'value').set
+    };
+    for (const el of document.querySelectorAll('input, textarea')) {
+        if (el.type === 'checkbox' || el.type === 'radio') {
+            if (el.checked !== el.defaultChecked) {
+                el.click();
+            }
+        } else if (el.type !== 'file' && el.value !== el.defaultValue) {
+            setters[el.tagName].call(el, el.defaultValue);
+            el.dispatchEvent(new Event('input', {bubbles: true}));
+            el.dispatchEvent(new Event('change', {bubbles: true}));
+        }
+    }
+    if (document.activeElement && document.activeElement !== document.body) {
+        document.activeElement.blur();
+    }
+    window.scrollTo(0, 0);
+}"""
+
+# FNV-1a hash of what a test can leave behind on a page: form values, open
+# dialogs, inserted elements and the text of the regions forms write their
+# results to. textContent, unlike innerText, does not wait for a layout
+FINGERPRINT_SCRIPT = """() => {
+    // Only the page's own content: ads and trackers change on their own
+    const root = document.querySelector('main, [role="main"], .playgound-body') || document.body;
+    const thirdParty = 'iframe, script, style, ins, .adsbygoogle, [id^="google_ads"], [id*="adplus"], #fixedban';
+    const own = selector => Array.from(root.querySelectorAll(selector)).filter(el => !el.closest(thirdParty));
+    const controls = own('input, select, textarea').map(el =>
+        `${el.id || el.name}=${el.type === 'checkbox' || el.type === 'radio' ? el.checked : el.value}`);
+    const results = own(
+        'output, #output, [aria-live], [id$="Result"], [id$="Message"], tbody, [role="rowgroup"]'
+    ).map(el => `${el.hidden}:${el.textContent}`);
+    // Modals are usually rendered outside the main content
+    const dialogs = document.querySelectorAll(
+        '[role="dialog"]:not([hidden]), [aria-modal="true"]:not([hidden]), .modal.show'
+    );
+    const state = JSON.stringify([
+        location.href,
+        controls,
+        results,
+        dialogs.length,
+        own('*').length
+    ]);
+    let hash = 0x811c9dc5;
+    for (let i = 0; i < state.length; i++) {
+        hash ^= state.charCodeAt(i);
+        hash = Math.imul(hash, 0x01000193);
+    }
+    return hash >>> 0;
+}"""
+COUNTERS = ("navigations", "skipped", "restored", "reloaded")
+
+_group_index_key = pytest.StashKey[int]()
+_groups_key = pytest.StashKey["UrlGroups"]()
+
+
+def pytest_addoption(parser):
+    parser.getgroup("page-pool").addoption(
+        "--group-by-url",
+        action="store_true",
+        default=False,
+        help="Run the tests of a page_url one after another on a shared page, reset in place between them.",
+    )
+
+
+def page_url(item) -> Optional[str]:
+    """Return the absolute URL of an item's page_url marker, if it has one."""
+    marker = item.get_closest_marker("page_url")
+    if marker is None:
+        return None
+    url = marker.args[0]
+    return url if "://" in url else f"{BasePage.base_url}{url}"
+
+
+class UrlGroups(NavigationListener):
+    """Tracks the pooled pages left clean at a URL, and skips navigating them there again."""
+
+    def __init__(self):
+        # Page -> (page.url, fingerprint, requested URL, viewport) right after its last load
+        self._baselines = weakref.WeakKeyDictionary()
+        # Page -> URL it was reset at, until a test navigates it
+        self._clean = weakref.WeakKeyDictionary()
+        # Pages of the grouped tests that are running
+        self._leased = weakref.WeakSet()
+        self.counts: Dict[str, int] = dict.fromkeys(COUNTERS, 0)
+
+    def lease(self, page: Page):
+        self._leased.add(page)
+
+    def is_clean_at(self, page: Page, url: str) -> bool:
+        return self._clean.get(page) == url
+
+    def skip_navigation(self, page: Page, url: str) -> bool:
+        if page not in self._leased:
+            return False
+        # Only a test's first navigation can be skipped, and only at the viewport the page was loaded at
+        baseline = self._baselines.get(page)
+        if self._clean.pop(page, None) == url and baseline and page.viewport_size == baseline[3]:
+            self.counts["skipped"] += 1
+            return True
+        return False
+
+    def after_navigation(self, page, url, response):
+        if page in self._leased:
+            self.counts["navigations"] += 1
+            self._baselines[page] = (page.url, page.evaluate(FINGERPRINT_SCRIPT), url, page.viewport_size)
+        else:
+            self._baselines.pop(page, None)
+
+    def restore(self, page: Page) -> bool:
+        """Reset a page in place after a test; False when it has to leave its URL."""
+        self._leased.discard(page)
+        self._clean.pop(page, None)
+        baseline = self._baselines.get(page)
+        if baseline is None:
+            return False
+        loaded_url, fingerprint, url, viewport = baseline
+        if page.url != loaded_url:
+            # The test navigated away without a page object
+            return False
+        if page.viewport_size != viewport:
+            # Loaded at a viewport the test set, its layout is not the one the next test expects
+            return False
+        page.evaluate(RESET_SCRIPT)
+        if page.evaluate(FINGERPRINT_SCRIPT) == fingerprint:
+            self.counts["restored"] += 1
+        else:
+            # The test left state behind that the reset could not undo
+            page.reload(wait_until="domcontentloaded")
+            self._baselines[page] = (page.url, page.evaluate(FINGERPRINT_SCRIPT), url, viewport)
+            self.counts["reloaded"] += 1
+        self._clean[page] = url
+        return True
+
+
+@pytest.fixture(scope="session")
+def url_groups(pytestconfig):
+    """Skips the navigations of grouped tests to the page they were left on."""
+    groups = pytestconfig.stash[_groups_key] = UrlGroups()
+    BasePage.add_navigation_listener(groups)
+    yield groups
+    BasePage.remove_navigation_listener(groups)
+
+
+def pytest_collection_modifyitems(config, items):
+    if not config.getoption("group_by_url"):
+        return
+    groups = {}
+    for index, item in enumerate(items):
+        marker = item.get_closest_marker("page_url")
+        if marker is None:
+            continue
+        browser = item.callspec.params.get("browser_name") if hasattr(item, "callspec") else None
+        key = (browser, marker.args[0])
+        groups.setdefault(key, index)
+        # Honored by pytest-xdist's --dist=loadgroup
+        item.add_marker(pytest.mark.xdist_group(f"page_url:{marker.args[0]}"))
+        item.stash[_group_index_key] = groups[key]
+    # Each group moves up to its first test, everything else keeps its place
+    order = {id(item): item.stash.get(_group_index_key, index) for index, item in enumerate(items)}
+    items.sort(key=lambda item: order[id(item)])
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    groups = item.config.stash.get(_groups_key, None)
+    if call.when == "teardown" and groups is not None:
+        worker = item.config.workerinput["workerid"] if hasattr(item.config, "workerinput") else "main"
+        # Running totals of this process, travel with the report to the xdist controller
+        outcome.get_result().url_groups = [worker, dict(groups.counts)]
+
+
+class UrlGroupsReporter:
+    """Sums up the navigations the grouping saved."""
+
+    def __init__(self):
+        self.counts: Dict[str, Dict[str, int]] = {}
+
+    def pytest_runtest_logreport(self, report):
+        totals = getattr(report, "url_groups", None)
+        if totals:
+            worker, counts = totals
+            self.counts[worker] = counts
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.counts:
+            return
+        total = {key: sum(counts[key] for counts in self.counts.values()) for key in COUNTERS}
+        terminalreporter.section("url groups")
+        terminalreporter.line(
+            f"{total['navigations']} page object navigations, {total['skipped']} skipped; "
+            f"pages reset in place {total['restored']} times, reloaded {total['reloaded']} times"
+        )
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "page_url(url): the page a test starts on, shared by --group-by-url")
+    if config.getoption("group_by_url") and not hasattr(config, "workerinput"):
+        config.pluginmanager.register(UrlGroupsReporter(), "url-groups-reporter")
@@ -0,0 +1,10 @@
+import re
+
+
+def node_slug(nodeid: str) -> str:
+    """Turn a pytest node id into a string that is safe to use as a file name."""
+    slug = re.sub(r"[^A-Za-z0-9_.-]+", "-", nodeid).strip("-")
+    if len(slug) > 200:
+        # Keep both ends: the module path and the parametrization are the useful parts
+        slug = f"{slug[:100]}-{slug[-99:]}"
+    return slug
@@ -0,0 +1,285 @@
+"""Screenshot comparison against stored baselines, vectorized with NumPy.
+
+Pixels are compared in YIQ space, weighted the way the eye is (as pixelmatch
+does): a pixel differs when its perceptual distance exceeds ``--visual-threshold``
+(0 to 1, defaults to 0.1). Differing pixels that match a neighbouring pixel in
+both directions are counted as anti-aliasing and ignored. A screenshot passes
+when the share of differing pixels stays within ``--visual-max-diff-ratio``.
+
+Only the pixels whose bytes differ are converted and compared, so identical or
+nearly identical screenshots, even at 2560x1440, take milliseconds. The
+comparison stops as soon as the screenshot is known to fail, so completely
+different screenshots fail fast as well.
+
+Baselines live under ``--baseline-dir`` as ``<browser>/<page>/<viewport>.png``
+and are committed with the tests. A test without a baseline is skipped, so a
+browser or viewport nobody has recorded yet does not fail CI;
+``--update-baselines`` writes the baselines instead of comparing. Failed
+comparisons write a diff image (differences in red, anti-aliasing in yellow)
+through the screenshot writer.
+"""
+import io
+import os
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from harness.screenshots import get_writer
+
+# Largest possible YIQ distance between two colors
+MAX_YIQ_DELTA = 35215.0
+
+# Neighbour offsets checked by the anti-aliasing test
+_NEIGHBOURS = [(dy, dx) for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dy or dx]
+# Changed pixels compared between two looks at the max_ratio budget
+_CHUNK = 65536
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("visual", "Visual regression")
+    group.addoption(
+        "--baseline-dir",
+        default="visual-baselines",
+        help="Directory of the visual baselines, defaults to visual-baselines.",
+    )
+    group.addoption(
+        "--update-baselines",
+        action="store_true",
+        default=False,
+        help="Write the current screenshots as the new baselines instead of comparing.",
+    )
+    group.addoption(
+        "--visual-threshold",
+        type=float,
+        default=0.1,
+        help="Perceptual distance (0-1) above which a pixel counts as different, defaults to 0.1.",
+    )
+    group.addoption(
+        "--visual-max-diff-ratio",
+        type=float,
+        default=0.001,
+        help="Share of differing pixels a screenshot may have, defaults to 0.001.",
+    )
+
+
+class Region(NamedTuple):
+    """A rectangle in screenshot pixels, shaped like ``locator.bounding_box()``."""
+
+    x: float
+    y: float
+    width: float
+    height: float
+
+
+class VisualDiff(NamedTuple):
+    """Outcome of comparing a screenshot with its baseline."""
+
+    mismatched: int  # differing pixels, anti-aliasing excluded
+    anti_aliased: int
+    total: int
+    size_mismatch: bool
+    # Rows, columns and anti-aliasing flags of the differing pixels
+    pixels: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+    # False when the comparison stopped past max_ratio: mismatched is a lower bound
+    complete: bool = True
+
+    @property
+    def ratio(self) -> float:
+        return 1.0 if self.size_mismatch else self.mismatched / self.total
+
+    def passes(self, max_ratio: float) -> bool:
+        return not self.size_mismatch and self.ratio <= max_ratio
+
+
+def decode(data: bytes) -> np.ndarray:
+    """Decode an image into an RGB uint8 array."""
+    return np.asarray(Image.open(io.BytesIO(data)).convert("RGB"))
+
+
+def encode(image: np.ndarray) -> bytes:
+    """Encode an RGB uint8 array as PNG."""
+    out = io.BytesIO()
+    Image.fromarray(image).save(out, format="PNG")
+    return out.getvalue()
+
+
+def _yiq(pixels: np.ndarray) -> np.ndarray:
+    rgb = pixels.astype(np.float32)
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    y = r * 0.29889531 + g * 0.58662247 + b * 0.11448223
+    i = r * 0.59597799 - g * 0.27417610 - b * 0.32180189
+    q = r * 0.21147017 - g * 0.52261711 + b * 0.31114694
+    return np.stack([y, i, q], axis=-1)
+
+
+def _yiq_delta(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    d = a - b
+    return 0.5053 * d[..., 0] ** 2 + 0.299 * d[..., 1] ** 2 + 0.1957 * d[..., 2] ** 2
+
+
+def _matches_a_neighbour(colors: np.ndarray, target: np.ndarray, ys, xs, max_delta: float) -> np.ndarray:
+    # Whether each pixel color (YIQ) equals, within the threshold, one of the 8
+    # pixels around the same position in the target: an edge moved by a pixel
+    height, width = target.shape[:2]
+    matched = np.zeros(len(ys), dtype=bool)
+    for dy, dx in _NEIGHBOURS:
+        ny = np.clip(ys + dy, 0, height - 1)
+        nx = np.clip(xs + dx, 0, width - 1)
+        neighbours = target[ny, nx]
+        matched |= _yiq_delta(colors, neighbours if target.dtype == np.float32 else _yiq(neighbours)) <= max_delta
+    return matched
+
+
+def compare(
+    actual: np.ndarray,
+    expected: np.ndarray,
+    threshold: float = 0.1,
+    ignore: Iterable[Region] = (),
+    anti_aliasing: bool = True,
+    max_ratio: Optional[float] = None,
+) -> VisualDiff:
+    """Compare two RGB images of the same size pixel by pixel.
+
+    With ``max_ratio``, the comparison stops once more pixels than it allows are
+    known to differ; the unchecked pixels are not counted as anti-aliasing.
+    """
+    if actual.shape != expected.shape:
+        return VisualDiff(0, 0, expected.shape[0] * expected.shape[1], True)
+    height, width = expected.shape[:2]
+    total = height * width
+
+    if np.array_equal(actual, expected):
+        return VisualDiff(0, 0, total, False)
+    xor = actual ^ expected
+    changed = (xor[..., 0] | xor[..., 1] | xor[..., 2]).astype(bool)
+    for region in ignore:
+        region = Region(**region) if isinstance(region, dict) else Region(*region)
+        top, left = max(int(region.y), 0), max(int(region.x), 0)
+        changed[top:int(np.ceil(region.y + region.height)), left:int(np.ceil(region.x + region.width))] = False
+    ys, xs = np.nonzero(changed)
+    if len(ys) == 0:
+        return VisualDiff(0, 0, total, False)
+
+    max_delta = MAX_YIQ_DELTA * threshold * threshold
+    budget = len(ys) if max_ratio is None else int(max_ratio * total)
+    # Past a few neighbours per pixel, converting whole images once is cheaper
+    if anti_aliasing and min(len(ys), budget + _CHUNK) * len(_NEIGHBOURS) > total:
+        actual_target, expected_target = _yiq(actual), _yiq(expected)
+    else:
+        actual_target, expected_target = actual, expected
+    found = []
+    changed_count, checked, mismatched = len(ys), 0, 0
+    while checked < changed_count and mismatched <= budget:
+        chunk_ys, chunk_xs = ys[checked:checked + _CHUNK], xs[checked:checked + _CHUNK]
+        checked += len(chunk_ys)
+        actual_yiq, expected_yiq = _yiq(actual[chunk_ys, chunk_xs]), _yiq(expected[chunk_ys, chunk_xs])
+        different = _yiq_delta(actual_yiq, expected_yiq) > max_delta
+        chunk_ys, chunk_xs = chunk_ys[different], chunk_xs[different]
+        aa = np.zeros(len(chunk_ys), dtype=bool)
+        if anti_aliasing and len(chunk_ys):
+            aa = _matches_a_neighbour(actual_yiq[different], expected_target, chunk_ys, chunk_xs, max_delta)
+            aa[aa] = _matches_a_neighbour(
+                expected_yiq[different][aa], actual_target, chunk_ys[aa], chunk_xs[aa], max_delta
+            )
+        found.append((chunk_ys, chunk_xs, aa))
+        mismatched += len(aa) - int(np.count_nonzero(aa))
+    ys, xs, aa = (np.concatenate(parts) for parts in zip(*found))
+    return VisualDiff(
+        mismatched, int(np.count_nonzero(aa)), total, False, (ys, xs, aa), complete=checked == changed_count
+    )
+
+
+def diff_image(expected: np.ndarray, result: VisualDiff) -> np.ndarray:
+    """Render the baseline faded to gray, differences in red and anti-aliasing in yellow."""
+    gray = expected.astype(np.float32) @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    image = np.repeat((255 - (255 - gray) * 0.1).astype(np.uint8)[..., None], 3, axis=-1)
+    if result.pixels is not None:
+        ys, xs, aa = result.pixels
+        image[ys[aa], xs[aa]] = (255, 255, 0)
+        image[ys[~aa], xs[~aa]] = (255, 0, 0)
+    return image
+
+
+class BaselineStore:
+    """Baseline images on disk, indexed by page, viewport and browser."""
+
+    def __init__(self, root: str):
+        self.root = root
+        # Decoded baselines, shared by every comparison in the session
+        self._cache: Dict[Tuple[str, str, str], np.ndarray] = {}
+
+    def path(self, page: str, viewport: str, browser: str) -> str:
+        return os.path.join(self.root, browser, page, f"{viewport}.png")
+
+    def load(self, page: str, viewport: str, browser: str) -> Optional[np.ndarray]:
+        key = (page, viewport, browser)
+        if key not in self._cache:
+            path = self.path(*key)
+            if not os.path.exists(path):
+                return None
+            with open(path, "rb") as f:
+                self._cache[key] = decode(f.read())
+        return self._cache[key]
+
+    def save(self, page: str, viewport: str, browser: str, data: bytes):
+        path = self.path(page, viewport, browser)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        image = decode(data)
+        with open(path, "wb") as f:
+            f.write(encode(image))
+        self._cache[(page, viewport, browser)] = image
+
+
+class VisualChecker:
+    """Compares a test's screenshots with the baselines of its browser."""
+
+    def __init__(self, store: BaselineStore, browser: str, threshold: float, max_ratio: float, update: bool):
+        self.store = store
+        self.browser = browser
+        self.threshold = threshold
+        self.max_ratio = max_ratio
+        self.update = update
+
+    def assert_matches(self, screenshot: bytes, page: str, viewport: str, ignore: Iterable[Region] = ()):
+        """Fail when the screenshot differs from the baseline of the page and viewport."""
+        if self.update:
+            self.store.save(page, viewport, self.browser, screenshot)
+            return
+        expected = self.store.load(page, viewport, self.browser)
+        if expected is None:
+            pytest.skip(
+                f"No baseline for {page}/{viewport} on {self.browser}: run pytest -k visual "
+                f"--update-baselines and commit {self.store.root}/"
+            )
+        result = compare(decode(screenshot), expected, self.threshold, ignore, max_ratio=self.max_ratio)
+        if result.passes(self.max_ratio):
+            return
+        if result.size_mismatch:
+            pytest.fail(f"{page}/{viewport} screenshot size differs from the baseline")
+        diff_path = get_writer().submit(
+            encode(diff_image(expected, result)), f"{self.browser}-{page}-{viewport}-diff"
+        )
+        pytest.fail(
+            f"{page}/{viewport} differs from the baseline in {'' if result.complete else 'at least '}"
+            f"{result.mismatched} pixels ({result.ratio:.2%}, {result.anti_aliased} anti-aliased ignored), "
+            f"diff: {diff_path}"
+        )
+
+
+@pytest.fixture(scope="session")
+def baseline_store(pytestconfig) -> BaselineStore:
+    return BaselineStore(pytestconfig.getoption("baseline_dir"))
+
+
+@pytest.fixture(scope="function")
+def visual(baseline_store, browser_name, pytestconfig) -> VisualChecker:
+    """Compare screenshots with the visual baselines of the current browser."""
+    return VisualChecker(
+        baseline_store,
+        browser_name,
+        threshold=pytestconfig.getoption("visual_threshold"),
+        max_ratio=pytestconfig.getoption("visual_max_diff_ratio"),
+        update=pytestconfig.getoption("update_baselines"),
+    )
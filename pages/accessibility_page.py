@@ -1,42 +1,365 @@
+from typing import Dict, List, Tuple
+
 from playwright.sync_api import Page
 
+from pages.base_page import BasePage
+
+SEMANTIC_STRUCTURE_SCRIPT = """() => {
+    return {
+        hasMain: !!document.querySelector('main, [role="main"]'),
+        hasHeader: !!document.querySelector('header, [role="banner"]'),
+        hasNav: !!document.querySelector('nav, [role="navigation"]'),
+        buttonCount: document.querySelectorAll('button').length,
+        inputCount: document.querySelectorAll('input').length
+    };
+}"""
+
+COLOR_CONTRAST_SCRIPT = """(selector) => {
+    const el = document.querySelector(selector);
+    const style = window.getComputedStyle(el);
+    return {
+        color: style.color,
+        backgroundColor: style.backgroundColor,
+        fontSize: style.fontSize
+    };
+}"""
+
+FORM_LABELS_SCRIPT = """(id) => {
+    const input = document.getElementById(id);
+    const label = document.querySelector(`label[for="${id}"]`);
+    return {
+        hasLabel: !!label,
+        labelText: label ? label.textContent : null,
+        hasPlaceholder: !!input.getAttribute('placeholder'),
+        placeholderText: input.getAttribute('placeholder')
+    };
+}"""
+
+ARIA_LABELS_SCRIPT = """(el) => ({
+    "aria-label": el.getAttribute('aria-label'),
+    "role": el.getAttribute('role'),
+    "aria-required": el.getAttribute('aria-required')
+})"""
+
+# Declarations shared by the scripts that walk the focusable elements: the
+# FOCUSABLE selector and selectorOf(el), a unique selector that walks up to an
+# id or to the root
+FOCUS_HELPERS = """    const FOCUSABLE = 'a[href], area[href], button, input:not([type="hidden"]), select, textarea, '
+        + 'iframe, summary, audio[controls], video[controls], [contenteditable=""], '
+        + '[contenteditable="true"], [tabindex]';
+
+    const selectorOf = (el) => {
+        const parts = [];
+        while (el && el.nodeType === 1) {
+            if (el.id) {
+                parts.unshift('#' + CSS.escape(el.id));
+                break;
+            }
+            let part = el.tagName.toLowerCase();
+            const siblings = el.parentElement
+                ? Array.from(el.parentElement.children).filter(s => s.tagName === el.tagName)
+                : [];
+            if (siblings.length > 1) {
+                part += `:nth-of-type(${siblings.indexOf(el) + 1})`;
+            }
+            parts.unshift(part);
+            el = el.parentElement;
+        }
+        return parts.join(' > ');
+    };"""
+
+# Audits the whole page in one evaluation: landmarks, headings, image alt text,
+# form labels, ARIA roles, focusable elements and WCAG 2.x contrast ratios.
+AUDIT_SCRIPT = """() => {
+    const ARIA_ROLES = new Set([
+        'alert', 'alertdialog', 'application', 'article', 'banner', 'blockquote', 'button',
+        'caption', 'cell', 'checkbox', 'code', 'columnheader', 'combobox', 'complementary',
+        'contentinfo', 'definition', 'deletion', 'dialog', 'directory', 'document', 'emphasis',
+        'feed', 'figure', 'form', 'generic', 'grid', 'gridcell', 'group', 'heading', 'img',
+        'insertion', 'link', 'list', 'listbox', 'listitem', 'log', 'main', 'marquee', 'math',
+        'menu', 'menubar', 'menuitem', 'menuitemcheckbox', 'menuitemradio', 'meter',
+        'navigation', 'none', 'note', 'option', 'paragraph', 'presentation', 'progressbar',
+        'radio', 'radiogroup', 'region', 'row', 'rowgroup', 'rowheader', 'scrollbar', 'search',
+        'searchbox', 'separator', 'slider', 'spinbutton', 'status', 'strong', 'subscript',
+        'superscript', 'switch', 'tab', 'table', 'tablist', 'tabpanel', 'term', 'textbox',
+        'time', 'timer', 'toolbar', 'tooltip', 'tree', 'treegrid', 'treeitem'
+    ]);
+    const LANDMARKS = {
+        main: 'main, [role="main"]',
+        banner: 'header, [role="banner"]',
+        navigation: 'nav, [role="navigation"]',
+        contentinfo: 'footer, [role="contentinfo"]',
+        complementary: 'aside, [role="complementary"]',
+        search: '[role="search"]'
+    };
+""" + FOCUS_HELPERS + """
+    const isVisible = (el) => {
+        const style = getComputedStyle(el);
+        if (style.visibility === 'hidden' || style.display === 'none') {
+            return false;
+        }
+        const rect = el.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0;
+    };
+    const text = (el) => (el ? el.textContent.replace(/\\s+/g, ' ').trim() : '');
+    const labelFor = (el) => {
+        if (el.getAttribute('aria-label')) {
+            return el.getAttribute('aria-label').trim();
+        }
+        const labelledBy = el.getAttribute('aria-labelledby');
+        if (labelledBy) {
+            return labelledBy.split(/\\s+/).map(id => text(document.getElementById(id))).join(' ').trim();
+        }
+        if (el.labels && el.labels.length) {
+            return Array.from(el.labels).map(text).join(' ').trim();
+        }
+        return '';
+    };
+    const accessibleName = (el) => labelFor(el)
+        || (el.getAttribute('alt') || '').trim()
+        || text(el)
+        || (el.getAttribute('title') || '').trim()
+        || (el.getAttribute('placeholder') || '').trim();
+
+    // Colors and WCAG 2.x relative luminance / contrast ratio
+    const parseColor = (value) => {
+        const m = value.match(/rgba?\\(([^)]+)\\)/);
+        if (!m) {
+            return null;
+        }
+        const [r, g, b, a = 1] = m[1].split(/[\\s,\\/]+/).filter(Boolean).map(Number);
+        return {r, g, b, a};
+    };
+    const blend = (top, bottom) => ({
+        r: top.r * top.a + bottom.r * (1 - top.a),
+        g: top.g * top.a + bottom.g * (1 - top.a),
+        b: top.b * top.a + bottom.b * (1 - top.a),
+        a: 1
+    });
+    const backgroundOf = (el) => {
+        const layers = [];
+        for (let node = el; node && node.nodeType === 1; node = node.parentElement) {
+            const color = parseColor(getComputedStyle(node).backgroundColor);
+            if (color && color.a > 0) {
+                layers.push(color);
+                if (color.a >= 1) {
+                    break;
+                }
+            }
+        }
+        return layers.reduceRight((bottom, top) => blend(top, bottom), {r: 255, g: 255, b: 255, a: 1});
+    };
+    const luminance = ({r, g, b}) => {
+        const [R, G, B] = [r, g, b].map(c => {
+            c /= 255;
+            return c <= 0.03928 ? c / 12.92 : Math.pow((c + 0.055) / 1.055, 2.4);
+        });
+        return 0.2126 * R + 0.7152 * G + 0.0722 * B;
+    };
+    const contrastRatio = (a, b) => {
+        const [light, dark] = [luminance(a), luminance(b)].sort((x, y) => y - x);
+        return (light + 0.05) / (dark + 0.05);
+    };
+
+    const landmarks = {};
+    for (const [name, selector] of Object.entries(LANDMARKS)) {
+        landmarks[name] = document.querySelectorAll(selector).length;
+    }
+
+    const headings = Array.from(document.querySelectorAll('h1, h2, h3, h4, h5, h6, [role="heading"]'))
+        .filter(isVisible)
+        .map(el => ({
+            level: Number(el.getAttribute('aria-level') || el.tagName.slice(1)) || null,
+            text: text(el)
+        }));
+
+    const images = Array.from(document.querySelectorAll('img')).map(el => ({
+        selector: selectorOf(el),
+        src: el.getAttribute('src'),
+        alt: el.getAttribute('alt'),
+        hasAlt: el.hasAttribute('alt'),
+        decorative: el.getAttribute('alt') === '' || ['presentation', 'none'].includes(el.getAttribute('role'))
+    }));
+
+    const formControls = Array.from(document.querySelectorAll('input, select, textarea'))
+        .filter(el => el.type !== 'hidden')
+        .map(el => {
+            const label = labelFor(el);
+            return {
+                selector: selectorOf(el),
+                id: el.id || null,
+                type: el.type || el.tagName.toLowerCase(),
+                hasLabel: !!label,
+                labelText: label || null,
+                placeholder: el.getAttribute('placeholder')
+            };
+        });
+
+    const roles = Array.from(document.querySelectorAll('[role]')).map(el => {
+        const role = el.getAttribute('role').trim().split(/\\s+/)[0];
+        return {selector: selectorOf(el), role, valid: ARIA_ROLES.has(role)};
+    });
+
+    const focusable = Array.from(document.querySelectorAll(FOCUSABLE))
+        .filter(el => !el.disabled && el.tabIndex >= 0 && isVisible(el))
+        .map(el => ({
+            selector: selectorOf(el),
+            tag: el.tagName.toLowerCase(),
+            tabIndex: el.tabIndex,
+            role: el.getAttribute('role'),
+            name: accessibleName(el) || null
+        }));
+
+    const contrast = [];
+    for (const el of document.body.querySelectorAll('*')) {
+        const ownText = Array.from(el.childNodes)
+            .filter(node => node.nodeType === 3)
+            .map(node => node.textContent)
+            .join('')
+            .trim();
+        if (!ownText || !isVisible(el)) {
+            continue;
+        }
+        const style = getComputedStyle(el);
+        const color = parseColor(style.color);
+        if (!color) {
+            continue;
+        }
+        const background = backgroundOf(el);
+        const foreground = color.a < 1 ? blend(color, background) : color;
+        const fontSize = parseFloat(style.fontSize);
+        const bold = Number(style.fontWeight) >= 700 || style.fontWeight === 'bold';
+        // WCAG large text: 18pt (24px), or 14pt (18.66px) bold
+        const large = fontSize >= 24 || (bold && fontSize >= 18.66);
+        const ratio = Math.round(contrastRatio(foreground, background) * 100) / 100;
+        const required = large ? 3 : 4.5;
+        contrast.push({
+            selector: selectorOf(el),
+            text: ownText.slice(0, 80),
+            color: style.color,
+            background: `rgb(${Math.round(background.r)}, ${Math.round(background.g)}, ${Math.round(background.b)})`,
+            fontSize,
+            large,
+            ratio,
+            required,
+            passes: ratio >= required
+        });
+    }
+
+    return {
+        url: location.href,
+        viewport: {width: window.innerWidth, height: window.innerHeight},
+        landmarks,
+        headings,
+        images,
+        formControls,
+        roles,
+        focusable,
+        contrast,
+        summary: {
+            imagesMissingAlt: images.filter(i => !i.hasAlt).length,
+            unlabeledControls: formControls.filter(c => !c.hasLabel).length,
+            invalidRoles: roles.filter(r => !r.valid).length,
+            unnamedFocusable: focusable.filter(f => !f.name).length,
+            contrastFailures: contrast.filter(c => !c.passes).length
+        }
+    };
+}"""
+
+# Sequential focus navigation order of the document, in one pass: elements with
+# a positive tabindex first, by tabindex, then those with tabindex 0 in document
+# order; disabled, inert and hidden elements and tabindex < 0 are skipped, and
+# a radio group is one stop (its checked radio, else its first). Shadow roots
+# and frames are not entered.
+FOCUS_ORDER_SCRIPT = """() => {
+""" + FOCUS_HELPERS + """
+    const isRendered = (el) => {
+        if (el.checkVisibility) {
+            return el.checkVisibility({visibilityProperty: true, checkVisibilityCSS: true});
+        }
+        return el.getClientRects().length > 0 && getComputedStyle(el).visibility !== 'hidden';
+    };
+    const radioStops = new Map();
+
+    const candidates = Array.from(document.querySelectorAll(FOCUSABLE)).filter(el =>
+        el.tabIndex >= 0
+        && !el.matches(':disabled')
+        && !el.closest('[inert]')
+        && !(el.tagName === 'SUMMARY' && (el.parentElement.tagName !== 'DETAILS'
+            || el.parentElement.querySelector(':scope > summary') !== el))
+        && isRendered(el));
+    for (const el of candidates) {
+        if (el.type === 'radio' && el.name) {
+            const group = `${el.form ? selectorOf(el.form) : ''}|${el.name}`;
+            if (!radioStops.has(group) || (el.checked && !radioStops.get(group).checked)) {
+                radioStops.set(group, el);
+            }
+        }
+    }
+    const stops = candidates.filter(el =>
+        !(el.type === 'radio' && el.name)
+        || radioStops.get(`${el.form ? selectorOf(el.form) : ''}|${el.name}`) === el);
+
+    const positive = stops.filter(el => el.tabIndex > 0).sort((a, b) => a.tabIndex - b.tabIndex);
+    return positive.concat(stops.filter(el => el.tabIndex === 0)).map(el => ({
+        selector: selectorOf(el),
+        tag: el.tagName.toLowerCase(),
+        id: el.id || null,
+        tabIndex: el.tabIndex
+    }));
+}"""
+
+FOCUS_SCRIPT = """(selector) => document.querySelector(selector).focus()"""
+
+ACTIVE_ELEMENT_SCRIPT = """(selector) => {
+    const active = document.activeElement;
+    return {
+        matches: active === document.querySelector(selector),
+        actual: !active || active === document.body ? null
+            : active.id ? '#' + active.id : active.tagName.toLowerCase()
+    };
+}"""
 
-class AccessibilityPage:
+
+def sample_hops(order: List[dict], sample: int) -> List[int]:
+    """Return the indexes of ``sample`` Tab hops of a focus order, spread evenly over it.
+
+    Hops out of a frame are left out: Tab moves into the frame's own content.
+    """
+    hops = [index for index in range(len(order) - 1) if order[index]["tag"] != "iframe"]
+    if sample >= len(hops):
+        return hops
+    if sample <= 1:
+        return hops[:sample]
+    return sorted({hops[round(k * (len(hops) - 1) / (sample - 1))] for k in range(sample)})
+
+
+class AccessibilityPage(BasePage):
     """Page Object for DemoQA accessibility testing."""
 
+    # (browser, URL, viewport width, viewport height) -> focus order
+    focus_order_cache: Dict[Tuple, List[dict]] = {}
+
     def __init__(self, page: Page):
-        self.page = page
-        self.text_box_url = "https://demoqa.com/text-box"
-        self.buttons_url = "https://demoqa.com/buttons"
+        super().__init__(page)
+        self.text_box_url = f"{self.base_url}/text-box"
+        self.buttons_url = f"{self.base_url}/buttons"
         
     def navigate_to_text_box(self):
         """Navigate to the text box page."""
-        self.page.goto(self.text_box_url, wait_until="domcontentloaded")
+        self.goto(self.text_box_url)
         
     def navigate_to_buttons(self):
         """Navigate to the buttons page."""
-        self.page.goto(self.buttons_url, wait_until="domcontentloaded")
+        self.goto(self.buttons_url)
         
     def check_aria_labels(self, element_selector: str) -> dict:
         """Check aria attributes for an element."""
-        element = self.page.locator(element_selector)
-        return {
-            "aria-label": element.get_attribute("aria-label"),
-            "role": element.get_attribute("role"),
-            "aria-required": element.get_attribute("aria-required"),
-        }
+        return self.page.locator(element_selector).evaluate(ARIA_LABELS_SCRIPT)
         
     def get_semantic_structure(self) -> dict:
         """Get semantic HTML structure information."""
-        return self.page.evaluate("""() => {
-            return {
-                hasMain: !!document.querySelector('main, [role="main"]'),
-                hasHeader: !!document.querySelector('header, [role="banner"]'),
-                hasNav: !!document.querySelector('nav, [role="navigation"]'),
-                buttonCount: document.querySelectorAll('button').length,
-                inputCount: document.querySelectorAll('input').length
-            };
-        }""")
+        return self.page.evaluate(SEMANTIC_STRUCTURE_SCRIPT)
         
     def keyboard_navigation_test(self, start_element: str, tab_count: int):
         """Test keyboard navigation by tabbing through elements."""
@@ -48,25 +371,58 @@ class AccessibilityPage:
     def check_color_contrast(self, element_selector: str) -> dict:
         """Check color contrast for text elements."""
         element = self.page.locator(element_selector)
-        return self.page.evaluate("""(selector) => {
-            const el = document.querySelector(selector);
-            const style = window.getComputedStyle(el);
-            return {
-                color: style.color,
-                backgroundColor: style.backgroundColor,
-                fontSize: style.fontSize
-            };
-        }""", element_selector)
+        return self.page.evaluate(COLOR_CONTRAST_SCRIPT, element_selector)
         
     def check_form_labels(self, input_id: str) -> dict:
         """Check if form inputs have proper labels."""
-        return self.page.evaluate("""(id) => {
-            const input = document.getElementById(id);
-            const label = document.querySelector(`label[for="${id}"]`);
-            return {
-                hasLabel: !!label,
-                labelText: label ? label.textContent : null,
-                hasPlaceholder: !!input.getAttribute('placeholder'),
-                placeholderText: input.getAttribute('placeholder')
-            };
-        }""", input_id)
+        return self.page.evaluate(FORM_LABELS_SCRIPT, input_id)
+
+    def run_audit(self) -> dict:
+        """
+        Audit the current page in a single evaluation.
+
+        Returns a report with landmark counts, headings, images and their alt
+        text, form controls and their labels, elements with an ARIA role,
+        focusable elements and their accessible names, and the WCAG contrast
+        ratio of every visible text element, plus a summary of the failures.
+        """
+        return self.page.evaluate(AUDIT_SCRIPT)
+
+    def focus_order(self, refresh: bool = False) -> List[dict]:
+        """
+        Return the sequential focus order of the current page, computed in one pass.
+
+        Each focus stop has a unique CSS selector, its tag, id and tabindex.
+        The order is cached per browser, URL and viewport; pass refresh=True
+        after the page changed what can be focused.
+        """
+        viewport = self.page.viewport_size or {}
+        browser = self.page.context.browser
+        key = (
+            browser.browser_type.name if browser else None,
+            self.page.url,
+            viewport.get("width"),
+            viewport.get("height"),
+        )
+        if refresh or key not in self.focus_order_cache:
+            self.focus_order_cache[key] = self.page.evaluate(FOCUS_ORDER_SCRIPT)
+        return self.focus_order_cache[key]
+
+    def verify_focus_order(self, sample: int = 5) -> List[dict]:
+        """
+        Check a sample of real Tab presses against focus_order().
+
+        Focuses a stop, presses Tab and checks that the next stop got the
+        focus, for ``sample`` hops spread over the whole order. Returns the
+        hops that went elsewhere, with the element that got the focus.
+        """
+        order = self.focus_order()
+        mismatches = []
+        for index in sample_hops(order, sample):
+            current, expected = order[index]["selector"], order[index + 1]["selector"]
+            self.page.evaluate(FOCUS_SCRIPT, current)
+            self.page.keyboard.press("Tab")
+            focused = self.page.evaluate(ACTIVE_ELEMENT_SCRIPT, expected)
+            if not focused["matches"]:
+                mismatches.append({"from": current, "expected": expected, "actual": focused["actual"]})
+        return mismatches
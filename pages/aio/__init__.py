@@ -0,0 +1,5 @@
+"""Async twins of the page objects, built on playwright.async_api.
+
+They share locators, scripts and return values with their sync counterparts in
+``pages``, so one event loop can drive many pages and contexts concurrently.
+"""
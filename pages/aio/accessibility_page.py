@@ -0,0 +1,89 @@
+from typing import List
+
+from playwright.async_api import Page
+
+from pages.accessibility_page import (
+    ACTIVE_ELEMENT_SCRIPT,
+    ARIA_LABELS_SCRIPT,
+    AUDIT_SCRIPT,
+    COLOR_CONTRAST_SCRIPT,
+    FOCUS_ORDER_SCRIPT,
+    FOCUS_SCRIPT,
+    FORM_LABELS_SCRIPT,
+    SEMANTIC_STRUCTURE_SCRIPT,
+    AccessibilityPage as SyncAccessibilityPage,
+    sample_hops,
+)
+from pages.aio.base_page import BasePage
+
+
+class AccessibilityPage(BasePage):
+    """Async Page Object for DemoQA accessibility testing."""
+
+    def __init__(self, page: Page):
+        super().__init__(page)
+        self.text_box_url = f"{self.base_url}/text-box"
+        self.buttons_url = f"{self.base_url}/buttons"
+
+    async def navigate_to_text_box(self):
+        """Navigate to the text box page."""
+        await self.goto(self.text_box_url)
+
+    async def navigate_to_buttons(self):
+        """Navigate to the buttons page."""
+        await self.goto(self.buttons_url)
+
+    async def check_aria_labels(self, element_selector: str) -> dict:
+        """Check aria attributes for an element."""
+        return await self.page.locator(element_selector).evaluate(ARIA_LABELS_SCRIPT)
+
+    async def get_semantic_structure(self) -> dict:
+        """Get semantic HTML structure information."""
+        return await self.page.evaluate(SEMANTIC_STRUCTURE_SCRIPT)
+
+    async def keyboard_navigation_test(self, start_element: str, tab_count: int):
+        """Test keyboard navigation by tabbing through elements."""
+        await self.page.locator(start_element).focus()
+        for _ in range(tab_count):
+            await self.page.keyboard.press("Tab")
+        return await self.page.evaluate("document.activeElement.id")
+
+    async def check_color_contrast(self, element_selector: str) -> dict:
+        """Check color contrast for text elements."""
+        return await self.page.evaluate(COLOR_CONTRAST_SCRIPT, element_selector)
+
+    async def check_form_labels(self, input_id: str) -> dict:
+        """Check if form inputs have proper labels."""
+        return await self.page.evaluate(FORM_LABELS_SCRIPT, input_id)
+
+    async def run_audit(self) -> dict:
+        """Audit the current page in a single evaluation, see AccessibilityPage.run_audit."""
+        return await self.page.evaluate(AUDIT_SCRIPT)
+
+    async def focus_order(self, refresh: bool = False) -> List[dict]:
+        """Return the page's sequential focus order, see AccessibilityPage.focus_order."""
+        viewport = self.page.viewport_size or {}
+        browser = self.page.context.browser
+        key = (
+            browser.browser_type.name if browser else None,
+            self.page.url,
+            viewport.get("width"),
+            viewport.get("height"),
+        )
+        cache = SyncAccessibilityPage.focus_order_cache
+        if refresh or key not in cache:
+            cache[key] = await self.page.evaluate(FOCUS_ORDER_SCRIPT)
+        return cache[key]
+
+    async def verify_focus_order(self, sample: int = 5) -> List[dict]:
+        """Check a sample of real Tab presses against focus_order(), see AccessibilityPage."""
+        order = await self.focus_order()
+        mismatches = []
+        for index in sample_hops(order, sample):
+            current, expected = order[index]["selector"], order[index + 1]["selector"]
+            await self.page.evaluate(FOCUS_SCRIPT, current)
+            await self.page.keyboard.press("Tab")
+            focused = await self.page.evaluate(ACTIVE_ELEMENT_SCRIPT, expected)
+            if not focused["matches"]:
+                mismatches.append({"from": current, "expected": expected, "actual": focused["actual"]})
+        return mismatches
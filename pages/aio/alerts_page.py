@@ -0,0 +1,103 @@
+from playwright.async_api import Dialog, Page
+
+from pages.aio.base_page import BasePage
+
+
+class AlertsPage(BasePage):
+    """Async Page Object for DemoQA Alerts, Frames & Windows - Alerts section."""
+
+    def __init__(self, page: Page, fake_clock: bool = False):
+        """
+        Args:
+            page: Playwright page to drive
+            fake_clock: Install a fake clock on navigation, so page timers only
+                advance when advance_time() is called
+        """
+        super().__init__(page)
+        self.url = f"{self.base_url}/alerts"
+        self.fake_clock = fake_clock
+
+        # Locators
+        self.simple_alert_button = page.locator("#alertButton")
+        self.timer_alert_button = page.locator("#timerAlertButton")
+        self.confirm_alert_button = page.locator("#confirmButton")
+        self.prompt_alert_button = page.locator("#promtButton")  # Note: typo in demoqa id
+
+        # Result message locators
+        self.confirm_result = page.locator("#confirmResult")
+        self.prompt_result = page.locator("#promptResult")
+
+        # Dialog handler storage
+        self.dialog_message = None
+        self.dialog_type = None
+        self._dialog_handlers = []
+
+    async def navigate(self):
+        """Navigate to the alerts page."""
+        if self.fake_clock:
+            # Must be in place before the page's scripts capture the real timers
+            await self.page.clock.install()
+        await self.goto(self.url)
+
+    async def click_simple_alert(self):
+        """Click button that triggers simple alert."""
+        await self.simple_alert_button.click()
+
+    async def click_timer_alert(self):
+        """Click button that triggers timed alert (appears after 5 seconds)."""
+        await self.timer_alert_button.click()
+
+    async def advance_time(self, milliseconds: int):
+        """Run the page's fake clock forward, firing every timer that falls due."""
+        if not self.fake_clock:
+            raise RuntimeError("advance_time() needs AlertsPage(page, fake_clock=True)")
+        await self.page.clock.run_for(milliseconds)
+
+    async def click_confirm_alert(self):
+        """Click button that triggers confirm box."""
+        await self.confirm_alert_button.click()
+
+    async def click_prompt_alert(self):
+        """Click button that triggers prompt box."""
+        await self.prompt_alert_button.click()
+
+    async def get_confirm_result(self) -> str:
+        """Get the result message after handling confirm alert."""
+        return await self.confirm_result.text_content()
+
+    async def get_prompt_result(self) -> str:
+        """Get the result message after handling prompt alert."""
+        return await self.prompt_result.text_content()
+
+    def setup_dialog_handler(self, action: str = "accept", prompt_text: str = None):
+        """
+        Set up a handler for dialogs.
+
+        Args:
+            action: 'accept' to click OK, 'dismiss' to click Cancel
+            prompt_text: Text to enter in prompt dialog (if applicable)
+        """
+        async def handle_dialog(dialog: Dialog):
+            self.dialog_message = dialog.message
+            self.dialog_type = dialog.type
+
+            if action == "accept":
+                if prompt_text and dialog.type == "prompt":
+                    await dialog.accept(prompt_text)
+                else:
+                    await dialog.accept()
+            else:
+                await dialog.dismiss()
+
+        self.page.on("dialog", handle_dialog)
+        self._dialog_handlers.append(handle_dialog)
+
+    def remove_dialog_handler(self):
+        """Remove the dialog handlers set up by this page object."""
+        for handler in self._dialog_handlers:
+            self.page.remove_listener("dialog", handler)
+        self._dialog_handlers.clear()
+
+    async def wait_for_alert(self, timeout: int = 10000):
+        """Wait for an alert to appear."""
+        await self.page.wait_for_event("dialog", timeout=timeout)
@@ -0,0 +1,59 @@
+from typing import Dict, List, Optional
+
+from playwright.async_api import Page, Response
+
+from pages.base_page import FILL_MANY_SCRIPT, BasePage as SyncBasePage
+
+
+class NavigationListener:
+    """Gets notified around every navigation made through an async page object."""
+
+    async def before_navigation(self, page: Page, url: str):
+        pass
+
+    async def after_navigation(self, page: Page, url: str, response: Optional[Response]):
+        pass
+
+    async def skip_navigation(self, page: Page, url: str) -> bool:
+        """Return True when the page already shows ``url`` as a fresh navigation would."""
+        return False
+
+
+class BasePage(SyncBasePage):
+    """Base class of the async page objects, routing their navigations through goto().
+
+    Shares base_url with the sync page objects, but not their navigation
+    listeners: those drive a sync page, while these are awaited on the event
+    loop with the async page.
+    """
+
+    # Registered by test fixtures, like the sync listeners
+    navigation_listeners: List[NavigationListener] = []
+
+    async def goto(self, url: str, wait_until: str = "domcontentloaded") -> Optional[Response]:
+        """Navigate to a URL and notify the navigation listeners.
+
+        Returns None without navigating when a listener skips the navigation.
+        """
+        # Every listener is asked, and learns about the navigation even when it is skipped
+        if any([await listener.skip_navigation(self.page, url) for listener in self.navigation_listeners]):
+            return None
+        for listener in self.navigation_listeners:
+            await listener.before_navigation(self.page, url)
+        response = await self.page.goto(url, wait_until=wait_until)
+        for listener in self.navigation_listeners:
+            await listener.after_navigation(self.page, url, response)
+        return response
+
+    async def fill_many(self, data: Dict[str, str]):
+        """Fill several form fields in a single page evaluation.
+
+        Args:
+            data: Field names from form_fields mapped to their values.
+        """
+        unknown = set(data) - set(self.form_fields)
+        if unknown:
+            raise ValueError(f"{type(self).__name__} has no form fields {', '.join(sorted(unknown))}")
+        fields = [[name, self.form_fields[name], value] for name, value in data.items()]
+        for name in await self.page.evaluate(FILL_MANY_SCRIPT, fields):
+            await self.page.locator(self.form_fields[name]).fill(data[name])
@@ -0,0 +1,49 @@
+from playwright.async_api import Page
+
+from pages.aio.base_page import BasePage
+
+
+class ButtonsPage(BasePage):
+    """Async Page Object for DemoQA Buttons page."""
+
+    def __init__(self, page: Page):
+        super().__init__(page)
+        self.url = f"{self.base_url}/buttons"
+
+        # Locators
+        self.double_click_button = page.locator("#doubleClickBtn")
+        self.right_click_button = page.locator("#rightClickBtn")
+        self.click_me_button = page.get_by_role("button", name="Click Me", exact=True)
+
+        # Message locators
+        self.double_click_message = page.locator("#doubleClickMessage")
+        self.right_click_message = page.locator("#rightClickMessage")
+        self.dynamic_click_message = page.locator("#dynamicClickMessage")
+
+    async def navigate(self):
+        """Navigate to the buttons page."""
+        await self.goto(self.url)
+
+    async def double_click(self):
+        """Perform double click on the double click button."""
+        await self.double_click_button.dblclick()
+
+    async def right_click(self):
+        """Perform right click on the right click button."""
+        await self.right_click_button.click(button="right")
+
+    async def single_click(self):
+        """Perform single click on the click me button."""
+        await self.click_me_button.click()
+
+    async def get_double_click_message(self) -> str:
+        """Get double click message text."""
+        return await self.double_click_message.text_content()
+
+    async def get_right_click_message(self) -> str:
+        """Get right click message text."""
+        return await self.right_click_message.text_content()
+
+    async def get_dynamic_click_message(self) -> str:
+        """Get dynamic click message text."""
+        return await self.dynamic_click_message.text_content()
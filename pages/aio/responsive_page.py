@@ -0,0 +1,80 @@
+from playwright.async_api import Page, ViewportSize
+
+from pages.aio.base_page import BasePage
+from pages.responsive_page import COMPUTED_STYLE_SCRIPT, RESPONSIVE_LAYOUT_SCRIPT
+from pages.responsive_page import ResponsivePage as SyncResponsivePage
+
+
+class ResponsivePage(BasePage):
+    """Async Page Object for responsive design testing across different screen sizes."""
+
+    VIEWPORTS = SyncResponsivePage.VIEWPORTS
+
+    def __init__(self, page: Page, screenshot_writer=None):
+        """
+        Args:
+            page: Playwright page to drive
+            screenshot_writer: Writes the take_screenshot() captures in the
+                background, e.g. the screenshot_writer fixture; without one they
+                are saved to screenshots/ directly
+        """
+        super().__init__(page)
+        self.screenshot_writer = screenshot_writer
+        self.text_box_url = f"{self.base_url}/text-box"
+        self.buttons_url = f"{self.base_url}/buttons"
+
+    async def set_viewport(self, device_type: str):
+        """Set viewport size for a specific device type."""
+        if device_type not in self.VIEWPORTS:
+            raise ValueError(f"Unknown device type: {device_type}")
+
+        viewport = self.VIEWPORTS[device_type]
+        await self.page.set_viewport_size(viewport)
+
+    def get_viewport_size(self) -> ViewportSize:
+        """Get current viewport size."""
+        return self.page.viewport_size
+
+    async def navigate_to_text_box(self):
+        """Navigate to text box page."""
+        await self.goto(self.text_box_url)
+
+    async def navigate_to_buttons(self):
+        """Navigate to buttons page."""
+        await self.goto(self.buttons_url)
+
+    async def is_element_visible(self, selector: str) -> bool:
+        """Check if element is visible in viewport."""
+        return await self.page.locator(selector).is_visible()
+
+    async def get_element_size(self, selector: str) -> dict:
+        """Get element dimensions."""
+        return await self.page.locator(selector).bounding_box()
+
+    async def check_mobile_menu_visible(self) -> bool:
+        """Check if mobile menu/hamburger is visible."""
+        mobile_menu = self.page.locator(".header-wrapper, .mobile-menu, [class*='menu']").first
+        return await mobile_menu.is_visible() if await mobile_menu.count() > 0 else False
+
+    async def get_computed_style(self, selector: str, property: str) -> str:
+        """Get computed CSS property value for an element."""
+        return await self.page.evaluate(COMPUTED_STYLE_SCRIPT, [selector, property])
+
+    async def check_responsive_layout(self) -> dict:
+        """Check various layout characteristics for responsive design."""
+        return await self.page.evaluate(RESPONSIVE_LAYOUT_SCRIPT)
+
+    async def capture_element(self, selector: str) -> bytes:
+        """Take a PNG screenshot of an element, with animations stopped and iframes (ads) masked."""
+        return await self.page.locator(selector).screenshot(
+            animations="disabled", caret="hide", mask=[self.page.locator("iframe")]
+        )
+
+    async def take_screenshot(self, filename: str) -> str:
+        """Take screenshot of current page and return the path it is written to."""
+        writer = self.screenshot_writer
+        if writer is None:
+            path = f"screenshots/{filename}"
+            await self.page.screenshot(path=path)
+            return path
+        return writer.submit(await self.page.screenshot(**writer.screenshot_options()), filename)
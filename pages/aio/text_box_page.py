@@ -0,0 +1,43 @@
+from playwright.async_api import Page
+
+from pages.aio.base_page import BasePage
+from pages.text_box_page import TextBoxPage as SyncTextBoxPage
+
+
+class TextBoxPage(BasePage):
+    """Async Page Object for DemoQA Text Box page."""
+
+    form_fields = SyncTextBoxPage.form_fields
+
+    def __init__(self, page: Page):
+        super().__init__(page)
+        self.url = f"{self.base_url}/text-box"
+
+        # Locators
+        self.full_name_input = page.locator(self.form_fields["full_name"])
+        self.email_input = page.locator(self.form_fields["email"])
+        self.current_address_input = page.locator(self.form_fields["current_address"])
+        self.permanent_address_input = page.locator(self.form_fields["permanent_address"])
+        self.submit_button = page.locator("#submit")
+        self.output_section = page.locator("#output")
+
+    async def navigate(self):
+        """Navigate to the text box page."""
+        await self.goto(self.url)
+
+    async def fill_form(self, full_name: str, email: str, current_address: str, permanent_address: str):
+        """Fill out the text box form."""
+        await self.fill_many({
+            "full_name": full_name,
+            "email": email,
+            "current_address": current_address,
+            "permanent_address": permanent_address,
+        })
+
+    async def submit(self):
+        """Click the submit button."""
+        await self.submit_button.click()
+
+    async def get_output_text(self) -> str:
+        """Get the output section text."""
+        return await self.output_section.text_content()
@@ -0,0 +1,76 @@
+from playwright.async_api import Page
+
+from pages.aio.base_page import BasePage
+from pages.web_tables_page import SNAPSHOT_SCRIPT, TableSnapshot
+from pages.web_tables_page import WebTablesPage as SyncWebTablesPage
+
+
+class WebTablesPage(BasePage):
+    """Async Page Object for DemoQA Web Tables page."""
+
+    form_fields = SyncWebTablesPage.form_fields
+
+    def __init__(self, page: Page):
+        super().__init__(page)
+        self.url = f"{self.base_url}/webtables"
+
+        # Locators
+        self.add_button = page.locator("#addNewRecordButton")
+        self.search_box = page.locator("#searchBox")
+        self.table = page.locator(".rt-table")
+        self.table_rows = page.locator(".rt-tbody .rt-tr-group")
+
+        # Registration form locators
+        self.first_name_input = page.locator(self.form_fields["first_name"])
+        self.last_name_input = page.locator(self.form_fields["last_name"])
+        self.email_input = page.locator(self.form_fields["email"])
+        self.age_input = page.locator(self.form_fields["age"])
+        self.salary_input = page.locator(self.form_fields["salary"])
+        self.department_input = page.locator(self.form_fields["department"])
+        self.submit_button = page.locator("#submit")
+
+    async def navigate(self):
+        """Navigate to the web tables page."""
+        await self.goto(self.url)
+
+    async def click_add_button(self):
+        """Click the add new record button."""
+        await self.add_button.click()
+
+    async def fill_registration_form(self, first_name: str, last_name: str, email: str,
+                                     age: str, salary: str, department: str):
+        """Fill out the registration form."""
+        await self.fill_many({
+            "first_name": first_name,
+            "last_name": last_name,
+            "email": email,
+            "age": age,
+            "salary": salary,
+            "department": department,
+        })
+
+    async def submit_form(self):
+        """Submit the registration form."""
+        await self.submit_button.click()
+
+    async def search(self, search_text: str):
+        """Search for a record in the table."""
+        await self.search_box.fill(search_text)
+
+    async def snapshot(self) -> TableSnapshot:
+        """Read the table headers and data rows in a single page evaluation."""
+        return TableSnapshot.from_evaluation(await self.table.evaluate(SNAPSHOT_SCRIPT))
+
+    async def get_table_row_count(self) -> int:
+        """Get the number of rows with data in the table."""
+        return (await self.snapshot()).count()
+
+    async def delete_row(self, row_index: int):
+        """Delete a specific row by index (0-based)."""
+        delete_button = self.page.locator(f".rt-tbody .rt-tr-group:nth-child({row_index + 1}) #delete-record-{row_index + 1}")
+        await delete_button.click()
+
+    async def edit_row(self, row_index: int):
+        """Edit a specific row by index (0-based)."""
+        edit_button = self.page.locator(f".rt-tbody .rt-tr-group:nth-child({row_index + 1}) #edit-record-{row_index + 1}")
+        await edit_button.click()
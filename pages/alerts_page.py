@@ -1,12 +1,21 @@
 from playwright.sync_api import Page, Dialog
 
+from pages.base_page import BasePage
 
-class AlertsPage:
+
+class AlertsPage(BasePage):
     """Page Object for DemoQA Alerts, Frames & Windows - Alerts section."""
 
-    def __init__(self, page: Page):
-        self.page = page
-        self.url = "https://demoqa.com/alerts"
+    def __init__(self, page: Page, fake_clock: bool = False):
+        """
+        Args:
+            page: Playwright page to drive
+            fake_clock: Install a fake clock on navigation, so page timers only
+                advance when advance_time() is called
+        """
+        super().__init__(page)
+        self.url = f"{self.base_url}/alerts"
+        self.fake_clock = fake_clock
         
         # Locators
         self.simple_alert_button = page.locator("#alertButton")
@@ -21,10 +30,14 @@ class AlertsPage:
         # Dialog handler storage
         self.dialog_message = None
         self.dialog_type = None
+        self._dialog_handlers = []
         
     def navigate(self):
         """Navigate to the alerts page."""
-        self.page.goto(self.url, wait_until="domcontentloaded")
+        if self.fake_clock:
+            # Must be in place before the page's scripts capture the real timers
+            self.page.clock.install()
+        self.goto(self.url)
         
     def click_simple_alert(self):
         """Click button that triggers simple alert."""
@@ -33,6 +46,12 @@ class AlertsPage:
     def click_timer_alert(self):
         """Click button that triggers timed alert (appears after 5 seconds)."""
         self.timer_alert_button.click()
+
+    def advance_time(self, milliseconds: int):
+        """Run the page's fake clock forward, firing every timer that falls due."""
+        if not self.fake_clock:
+            raise RuntimeError("advance_time() needs AlertsPage(page, fake_clock=True)")
+        self.page.clock.run_for(milliseconds)
         
     def click_confirm_alert(self):
         """Click button that triggers confirm box."""
@@ -71,10 +90,13 @@ class AlertsPage:
                 dialog.dismiss()
         
         self.page.on("dialog", handle_dialog)
+        self._dialog_handlers.append(handle_dialog)
         
     def remove_dialog_handler(self):
-        """Remove the dialog handler."""
-        self.page.remove_listener("dialog", lambda dialog: None)
+        """Remove the dialog handlers set up by this page object."""
+        for handler in self._dialog_handlers:
+            self.page.remove_listener("dialog", handler)
+        self._dialog_handlers.clear()
         
     def wait_for_alert(self, timeout: int = 10000):
         """Wait for an alert to appear."""
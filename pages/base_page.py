@@ -0,0 +1,103 @@
+from typing import Dict, List, Optional
+
+from playwright.sync_api import Page, Response
+
+# Sets many text fields in one evaluation. Values go through the prototype's
+# value setter, bypassing the instance one React overrides, followed by the
+# input and change events React listens to. Returns the names of the fields
+# that could not be set or did not keep their value, e.g. because a controlled
+# component rejected it: those are filled one by one with Playwright instead.
+FILL_MANY_SCRIPT = """async (fields) => {
+    const TEXT_TYPES = ['text', 'email', 'number', 'password', 'search', 'tel', 'url'];
+    const settable = el => !el.disabled && !el.readOnly
+        && (el instanceof HTMLTextAreaElement
+            || (el instanceof HTMLInputElement && TEXT_TYPES.includes(el.type)))
+        && el.getClientRects().length > 0 && getComputedStyle(el).visibility !== 'hidden';
+    const rejected = [];
+    const filled = [];
+    for (const [name, selector, value] of fields) {
+        const matches = document.querySelectorAll(selector);
+        const el = matches[0];
+        if (matches.length !== 1 || !settable(el)) {
+            rejected.push(name);
+            continue;
+        }
+        const proto = Object.getPrototypeOf(el);
+        Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, value);
+        el.dispatchEvent(new Event('input', {bubbles: true}));
+        el.dispatchEvent(new Event('change', {bubbles: true}));
+        filled.push([name, el, value]);
+    }
+    // Let the framework re-render before checking the values stuck
+    await new Promise(resolve => setTimeout(resolve, 0));
+    for (const [name, el, value] of filled) {
+        if (!el.isConnected || el.value !== value) {
+            rejected.push(name);
+        }
+    }
+    return rejected;
+}"""
+
+
+class NavigationListener:
+    """Gets notified around every navigation made through a page object."""
+
+    def before_navigation(self, page: Page, url: str):
+        pass
+
+    def after_navigation(self, page: Page, url: str, response: Optional[Response]):
+        pass
+
+    def skip_navigation(self, page: Page, url: str) -> bool:
+        """Return True when the page already shows ``url`` as a fresh navigation would."""
+        return False
+
+
+class BasePage:
+    """Base class of the page objects, routing their navigations through goto()."""
+
+    # Site under test; the session's --base-url replaces it
+    base_url = "https://demoqa.com"
+    # Registered by test fixtures, e.g. to collect performance metrics
+    navigation_listeners: List[NavigationListener] = []
+    # Form model used by fill_many(): field name -> CSS selector
+    form_fields: Dict[str, str] = {}
+
+    def __init__(self, page: Page):
+        self.page = page
+
+    def goto(self, url: str, wait_until: str = "domcontentloaded") -> Optional[Response]:
+        """Navigate to a URL and notify the navigation listeners.
+
+        Returns None without navigating when a listener skips the navigation.
+        """
+        # Every listener is asked, and learns about the navigation even when it is skipped
+        if any([listener.skip_navigation(self.page, url) for listener in self.navigation_listeners]):
+            return None
+        for listener in self.navigation_listeners:
+            listener.before_navigation(self.page, url)
+        response = self.page.goto(url, wait_until=wait_until)
+        for listener in self.navigation_listeners:
+            listener.after_navigation(self.page, url, response)
+        return response
+
+    def fill_many(self, data: Dict[str, str]):
+        """Fill several form fields in a single page evaluation.
+
+        Args:
+            data: Field names from form_fields mapped to their values.
+        """
+        unknown = set(data) - set(self.form_fields)
+        if unknown:
+            raise ValueError(f"{type(self).__name__} has no form fields {', '.join(sorted(unknown))}")
+        fields = [[name, self.form_fields[name], value] for name, value in data.items()]
+        for name in self.page.evaluate(FILL_MANY_SCRIPT, fields):
+            self.page.locator(self.form_fields[name]).fill(data[name])
+
+    @classmethod
+    def add_navigation_listener(cls, listener: NavigationListener):
+        cls.navigation_listeners.append(listener)
+
+    @classmethod
+    def remove_navigation_listener(cls, listener: NavigationListener):
+        cls.navigation_listeners.remove(listener)
@@ -1,12 +1,14 @@
 from playwright.sync_api import Page
 
+from pages.base_page import BasePage
 
-class ButtonsPage:
+
+class ButtonsPage(BasePage):
     """Page Object for DemoQA Buttons page."""
 
     def __init__(self, page: Page):
-        self.page = page
-        self.url = "https://demoqa.com/buttons"
+        super().__init__(page)
+        self.url = f"{self.base_url}/buttons"
         
         # Locators
         self.double_click_button = page.locator("#doubleClickBtn")
@@ -20,7 +22,7 @@ class ButtonsPage:
         
     def navigate(self):
         """Navigate to the buttons page."""
-        self.page.goto(self.url, wait_until="domcontentloaded")
+        self.goto(self.url)
         
     def double_click(self):
         """Perform double click on the double click button."""
@@ -1,7 +1,28 @@
 from playwright.sync_api import Page, ViewportSize
 
+from pages.base_page import BasePage
 
-class ResponsivePage:
+COMPUTED_STYLE_SCRIPT = """([selector, property]) => {
+    const el = document.querySelector(selector);
+    return window.getComputedStyle(el).getPropertyValue(property);
+}"""
+
+RESPONSIVE_LAYOUT_SCRIPT = """() => {
+    const body = document.body;
+    const container = document.querySelector('.container, .main-header, .text-center');
+
+    return {
+        bodyWidth: body.offsetWidth,
+        containerWidth: container ? container.offsetWidth : null,
+        scrollWidth: document.documentElement.scrollWidth,
+        hasHorizontalScroll: document.documentElement.scrollWidth > window.innerWidth,
+        viewportWidth: window.innerWidth,
+        viewportHeight: window.innerHeight
+    };
+}"""
+
+
+class ResponsivePage(BasePage):
     """Page Object for responsive design testing across different screen sizes."""
 
     # Common viewport sizes
@@ -17,10 +38,18 @@ class ResponsivePage:
         "desktop_large": {"width": 2560, "height": 1440},   # 2K display
     }
 
-    def __init__(self, page: Page):
-        self.page = page
-        self.text_box_url = "https://demoqa.com/text-box"
-        self.buttons_url = "https://demoqa.com/buttons"
+    def __init__(self, page: Page, screenshot_writer=None):
+        """
+        Args:
+            page: Playwright page to drive
+            screenshot_writer: Writes the take_screenshot() captures in the
+                background, e.g. the screenshot_writer fixture; without one they
+                are saved to screenshots/ directly
+        """
+        super().__init__(page)
+        self.screenshot_writer = screenshot_writer
+        self.text_box_url = f"{self.base_url}/text-box"
+        self.buttons_url = f"{self.base_url}/buttons"
         
     def set_viewport(self, device_type: str):
         """Set viewport size for a specific device type."""
@@ -36,11 +65,11 @@ class ResponsivePage:
         
     def navigate_to_text_box(self):
         """Navigate to text box page."""
-        self.page.goto(self.text_box_url, wait_until="domcontentloaded")
+        self.goto(self.text_box_url)
 
     def navigate_to_buttons(self):
         """Navigate to buttons page."""
-        self.page.goto(self.buttons_url, wait_until="domcontentloaded")
+        self.goto(self.buttons_url)
         
     def is_element_visible(self, selector: str) -> bool:
         """Check if element is visible in viewport."""
@@ -59,27 +88,22 @@ class ResponsivePage:
         
     def get_computed_style(self, selector: str, property: str) -> str:
         """Get computed CSS property value for an element."""
-        return self.page.evaluate(f"""(selector) => {{
-            const el = document.querySelector(selector);
-            return window.getComputedStyle(el).getPropertyValue('{property}');
-        }}""", selector)
+        return self.page.evaluate(COMPUTED_STYLE_SCRIPT, [selector, property])
         
     def check_responsive_layout(self) -> dict:
         """Check various layout characteristics for responsive design."""
-        return self.page.evaluate("""() => {
-            const body = document.body;
-            const container = document.querySelector('.container, .main-header, .text-center');
-            
-            return {
-                bodyWidth: body.offsetWidth,
-                containerWidth: container ? container.offsetWidth : null,
-                scrollWidth: document.documentElement.scrollWidth,
-                hasHorizontalScroll: document.documentElement.scrollWidth > window.innerWidth,
-                viewportWidth: window.innerWidth,
-                viewportHeight: window.innerHeight
-            };
-        }""")
+        return self.page.evaluate(RESPONSIVE_LAYOUT_SCRIPT)
         
-    def take_screenshot(self, filename: str):
-        """Take screenshot of current page."""
-        self.page.screenshot(path=f"screenshots/{filename}")
+    def capture_element(self, selector: str) -> bytes:
+        """Take a PNG screenshot of an element, with animations stopped and iframes (ads) masked."""
+        return self.page.locator(selector).screenshot(
+            animations="disabled", caret="hide", mask=[self.page.locator("iframe")]
+        )
+
+    def take_screenshot(self, filename: str) -> str:
+        """Take screenshot of current page and return the path it is written to."""
+        if self.screenshot_writer is None:
+            path = f"screenshots/{filename}"
+            self.page.screenshot(path=path)
+            return path
+        return self.screenshot_writer.capture(self.page, filename)
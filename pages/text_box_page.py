@@ -1,31 +1,42 @@
 from playwright.sync_api import Page
 
+from pages.base_page import BasePage
 
-class TextBoxPage:
+
+class TextBoxPage(BasePage):
     """Page Object for DemoQA Text Box page."""
 
+    form_fields = {
+        "full_name": "#userName",
+        "email": "#userEmail",
+        "current_address": "#currentAddress",
+        "permanent_address": "#permanentAddress",
+    }
+
     def __init__(self, page: Page):
-        self.page = page
-        self.url = "https://demoqa.com/text-box"
+        super().__init__(page)
+        self.url = f"{self.base_url}/text-box"
         
         # Locators
-        self.full_name_input = page.locator("#userName")
-        self.email_input = page.locator("#userEmail")
-        self.current_address_input = page.locator("#currentAddress")
-        self.permanent_address_input = page.locator("#permanentAddress")
+        self.full_name_input = page.locator(self.form_fields["full_name"])
+        self.email_input = page.locator(self.form_fields["email"])
+        self.current_address_input = page.locator(self.form_fields["current_address"])
+        self.permanent_address_input = page.locator(self.form_fields["permanent_address"])
         self.submit_button = page.locator("#submit")
         self.output_section = page.locator("#output")
         
     def navigate(self):
         """Navigate to the text box page."""
-        self.page.goto(self.url, wait_until="domcontentloaded")
+        self.goto(self.url)
         
     def fill_form(self, full_name: str, email: str, current_address: str, permanent_address: str):
         """Fill out the text box form."""
-        self.full_name_input.fill(full_name)
-        self.email_input.fill(email)
-        self.current_address_input.fill(current_address)
-        self.permanent_address_input.fill(permanent_address)
+        self.fill_many({
+            "full_name": full_name,
+            "email": email,
+            "current_address": current_address,
+            "permanent_address": permanent_address,
+        })
         
     def submit(self):
         """Click the submit button."""
@@ -1,12 +1,91 @@
+from typing import Dict, List, NamedTuple, Tuple
+
 from playwright.sync_api import Page
 
+from pages.base_page import BasePage
+
+# Reads the whole table in one evaluation instead of one round trip per row.
+# Padding rows (react-table fills the page with empty ones) are left out.
+SNAPSHOT_SCRIPT = """(table) => {
+    const headers = Array.from(table.querySelectorAll('.rt-thead .rt-th'))
+        .map(th => th.textContent.trim());
+    const rows = [];
+    table.querySelectorAll('.rt-tbody .rt-tr-group').forEach((group, index) => {
+        const cells = Array.from(group.querySelectorAll('.rt-td'))
+            .map(td => td.textContent.trim());
+        if (!cells.some(cell => cell)) {
+            return;
+        }
+        const actionIds = Array.from(
+            group.querySelectorAll('[id^="edit-record-"], [id^="delete-record-"]')
+        ).map(el => el.id);
+        rows.push({index, cells, actionIds});
+    });
+    return {headers, rows};
+}"""
+
+
+class TableRow(NamedTuple):
+    """A data row of the web table."""
+
+    index: int  # 0-based position among the table's row groups
+    values: Dict[str, str]  # column header -> cell text
+    action_ids: Tuple[str, ...]  # ids of the row's edit/delete buttons
+
+    def contains(self, text: str) -> bool:
+        """Check if any cell contains the text, ignoring case like the search box."""
+        text = text.lower()
+        return any(text in value.lower() for value in self.values.values())
+
+
+class TableSnapshot(NamedTuple):
+    """The headers and data rows of the web table at one point in time."""
 
-class WebTablesPage:
+    headers: List[str]
+    rows: List[TableRow]
+
+    @classmethod
+    def from_evaluation(cls, result: dict) -> "TableSnapshot":
+        headers = result["headers"]
+        rows = [
+            TableRow(
+                index=row["index"],
+                values=dict(zip(headers, row["cells"])),
+                action_ids=tuple(row["actionIds"]),
+            )
+            for row in result["rows"]
+        ]
+        return cls(headers=headers, rows=rows)
+
+    def count(self) -> int:
+        """Get the number of data rows."""
+        return len(self.rows)
+
+    def search(self, text: str) -> List[TableRow]:
+        """Get the rows with a cell containing the text."""
+        return [row for row in self.rows if row.contains(text)]
+
+    def where(self, column: str, value: str) -> List[TableRow]:
+        """Get the rows whose cell in the column equals the value."""
+        return [row for row in self.rows if row.values.get(column) == value]
+
+
+class WebTablesPage(BasePage):
     """Page Object for DemoQA Web Tables page."""
 
+    # Registration form
+    form_fields = {
+        "first_name": "#firstName",
+        "last_name": "#lastName",
+        "email": "#userEmail",
+        "age": "#age",
+        "salary": "#salary",
+        "department": "#department",
+    }
+
     def __init__(self, page: Page):
-        self.page = page
-        self.url = "https://demoqa.com/webtables"
+        super().__init__(page)
+        self.url = f"{self.base_url}/webtables"
         
         # Locators
         self.add_button = page.locator("#addNewRecordButton")
@@ -15,17 +94,17 @@ class WebTablesPage:
         self.table_rows = page.locator(".rt-tbody .rt-tr-group")
         
         # Registration form locators
-        self.first_name_input = page.locator("#firstName")
-        self.last_name_input = page.locator("#lastName")
-        self.email_input = page.locator("#userEmail")
-        self.age_input = page.locator("#age")
-        self.salary_input = page.locator("#salary")
-        self.department_input = page.locator("#department")
+        self.first_name_input = page.locator(self.form_fields["first_name"])
+        self.last_name_input = page.locator(self.form_fields["last_name"])
+        self.email_input = page.locator(self.form_fields["email"])
+        self.age_input = page.locator(self.form_fields["age"])
+        self.salary_input = page.locator(self.form_fields["salary"])
+        self.department_input = page.locator(self.form_fields["department"])
         self.submit_button = page.locator("#submit")
         
     def navigate(self):
         """Navigate to the web tables page."""
-        self.page.goto(self.url, wait_until="domcontentloaded")
+        self.goto(self.url)
         
     def click_add_button(self):
         """Click the add new record button."""
@@ -34,12 +113,14 @@ class WebTablesPage:
     def fill_registration_form(self, first_name: str, last_name: str, email: str, 
                                age: str, salary: str, department: str):
         """Fill out the registration form."""
-        self.first_name_input.fill(first_name)
-        self.last_name_input.fill(last_name)
-        self.email_input.fill(email)
-        self.age_input.fill(age)
-        self.salary_input.fill(salary)
-        self.department_input.fill(department)
+        self.fill_many({
+            "first_name": first_name,
+            "last_name": last_name,
+            "email": email,
+            "age": age,
+            "salary": salary,
+            "department": department,
+        })
         
     def submit_form(self):
         """Submit the registration form."""
@@ -49,14 +130,13 @@ class WebTablesPage:
         """Search for a record in the table."""
         self.search_box.fill(search_text)
         
+    def snapshot(self) -> TableSnapshot:
+        """Read the table headers and data rows in a single page evaluation."""
+        return TableSnapshot.from_evaluation(self.table.evaluate(SNAPSHOT_SCRIPT))
+
     def get_table_row_count(self) -> int:
         """Get the number of rows with data in the table."""
-        count = 0
-        for row in self.table_rows.all():
-            # Check if row has any text content
-            if row.text_content().strip():
-                count += 1
-        return count
+        return self.snapshot().count()
         
     def delete_row(self, row_index: int):
         """Delete a specific row by index (0-based)."""
@@ -0,0 +1 @@
+"""Unit tests of the harness, run without a browser."""
@@ -0,0 +1,57 @@
+import itertools
+import os
+
+import pytest
+
+from harness.artifacts import ArtifactStore
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Make every store access one second later than the previous one."""
+    ticks = itertools.count()
+    monkeypatch.setattr("harness.artifacts.time.time", lambda: float(next(ticks)))
+
+
+class TestArtifactStore:
+    """Tests for the artifact store budgets and eviction."""
+
+    @staticmethod
+    def artifact(tmp_path, name, data):
+        path = tmp_path / "output" / name
+        path.parent.mkdir(exist_ok=True)
+        path.write_bytes(data)
+        return str(path)
+
+    def test_keeps_traces_within_the_test_budget(self, tmp_path):
+        """Test that a test over its budget keeps its trace and drops its video."""
+        store = ArtifactStore(str(tmp_path / "store"), run_budget=10_000, test_budget=1_500)
+        video = self.artifact(tmp_path, "video.webm", os.urandom(1_000))
+        trace = self.artifact(tmp_path, "trace.zip", os.urandom(1_000))
+        entries = store.add_test("test_a", [("video", video), ("trace", trace)])
+        assert [entry["kind"] for entry in entries] == ["trace", "video"]
+        assert "object" in entries[0]
+        assert entries[1] == {"kind": "video", "dropped": "test-budget", "size": 1_000}
+        assert not os.path.exists(video) and not os.path.exists(trace)
+
+    def test_stores_identical_files_once(self, tmp_path):
+        """Test that identical artifacts of two tests share one object."""
+        store = ArtifactStore(str(tmp_path / "store"), run_budget=10_000, test_budget=10_000)
+        data = os.urandom(1_000)
+        [first] = store.add_test("test_a", [("trace", self.artifact(tmp_path, "a.zip", data))])
+        [second] = store.add_test("test_b", [("trace", self.artifact(tmp_path, "b.zip", data))])
+        assert first["object"] == second["object"]
+        assert store.size == 1_000
+
+    def test_evicts_least_recently_used(self, tmp_path, clock):
+        """Test that the run budget evicts the object used longest ago, not the oldest one."""
+        store = ArtifactStore(str(tmp_path / "store"), run_budget=2_500, test_budget=10_000)
+        data_a, data_b = os.urandom(1_000), os.urandom(1_000)
+        [a] = store.add_test("test_a", [("trace", self.artifact(tmp_path, "a.zip", data_a))])
+        [b] = store.add_test("test_b", [("trace", self.artifact(tmp_path, "b.zip", data_b))])
+        # Used again, so b is now the least recently used
+        store.add_test("test_c", [("trace", self.artifact(tmp_path, "c.zip", data_a))])
+        store.add_test("test_d", [("trace", self.artifact(tmp_path, "d.zip", os.urandom(1_000)))])
+        assert a["object"] in store.objects and b["object"] not in store.objects
+        assert b["evicted"] and not os.path.exists(tmp_path / "store" / b["path"])
+        assert store.size <= 2_500
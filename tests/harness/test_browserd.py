@@ -0,0 +1,54 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from harness.browserd import connect_options_for
+
+ENDPOINT = "ws://127.0.0.1:40000/abc"
+
+
+@pytest.fixture
+def state_path(tmp_path):
+    path = tmp_path / "browserd.json"
+    path.write_text(json.dumps({
+        "pid": os.getpid(),
+        "browsers": {
+            "chromium": {"ws_endpoint": ENDPOINT, "headless": True, "channel": None, "restarts": 0},
+        },
+    }))
+    return str(path)
+
+
+class TestConnectOptions:
+    """Tests for when pytest connects to the browser daemon."""
+
+    def test_matching_browser(self, state_path):
+        """Test that a browser served with the same mode and channel is connected to, keeping slow_mo."""
+        assert connect_options_for("chromium", {}, state_path) == {"ws_endpoint": ENDPOINT}
+        assert connect_options_for("chromium", {"headless": True, "slow_mo": 100}, state_path) == {
+            "ws_endpoint": ENDPOINT,
+            "slow_mo": 100,
+        }
+
+    @pytest.mark.parametrize("browser, launch_args", [
+        ("firefox", {}),
+        ("chromium", {"headless": False}),
+        ("chromium", {"channel": "chrome"}),
+    ])
+    def test_mismatch_launches(self, state_path, browser, launch_args):
+        """Test that another browser, mode or channel launches a browser as usual."""
+        assert connect_options_for(browser, launch_args, state_path) is None
+
+    def test_no_running_daemon(self, state_path, tmp_path):
+        """Test that a missing state file or an exited daemon launches a browser as usual."""
+        assert connect_options_for("chromium", {}, str(tmp_path / "missing.json")) is None
+        exited = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"], capture_output=True, text=True)
+        with open(state_path) as f:
+            state = json.load(f)
+        state["pid"] = int(exited.stdout)
+        with open(state_path, "w") as f:
+            json.dump(state, f)
+        assert connect_options_for("chromium", {}, state_path) is None
@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+
+from harness.durations import DurationRecorder, DurationStore, format_slowdown, percentile
+
+
+class TestPercentile:
+    """Tests for the duration percentiles."""
+
+    def test_interpolates_between_values(self):
+        """Test that percentiles fall between the two nearest values."""
+        assert percentile([1, 2, 3, 4], 50) == 2.5
+        assert percentile([4, 1, 3, 2], 25) == 1.75
+
+    def test_bounds_and_single_value(self):
+        """Test the 0th and 100th percentiles and a single value."""
+        assert percentile([3, 1, 2], 0) == 1
+        assert percentile([3, 1, 2], 100) == 3
+        assert percentile([7], 95) == 7
+
+
+class TestSlowdown:
+    """Tests for the description of a regression's slowdown."""
+
+    def test_factor_and_zero_p50(self):
+        """Test that the slowdown is a factor of the p50, or the added time when the p50 is 0s."""
+        assert format_slowdown({"duration": 3.2, "p50": 1.0}) == "3.2x"
+        assert format_slowdown({"duration": 0.8, "p50": 0.0}) == "+0.80s"
+
+
+class TestDurationRecorder:
+    """Tests for the per-test duration records."""
+
+    def test_records_the_last_attempt(self, tmp_path):
+        """Test that a rerun test is recorded with its last attempt's durations and its rerun count."""
+        store = DurationStore(str(tmp_path / "durations.jsonl"))
+        recorder = DurationRecorder(store, regression_factor=2.0)
+        for attempt, when, duration, outcome in [
+            (0, "setup", 1.0, "passed"),
+            (0, "call", 30.0, "rerun"),
+            (0, "teardown", 1.0, "passed"),
+            (1, "setup", 0.5, "passed"),
+            (1, "call", 2.0, "passed"),
+            (1, "teardown", 0.5, "passed"),
+        ]:
+            recorder.pytest_runtest_logreport(SimpleNamespace(
+                nodeid="tests/test_a.py::test_a", when=when, duration=duration, outcome=outcome,
+                failed=False, skipped=False, rerun=attempt,
+            ))
+            if when == "teardown":
+                # pytest-rerunfailures finishes every attempt
+                recorder.pytest_runtest_logfinish("tests/test_a.py::test_a", None)
+        [record] = store.records()
+        assert (record["duration"], record["call"], record["reruns"], record["outcome"]) == (3.0, 2.0, 1, "passed")
+
+
+class TestDurationStore:
+    """Tests for the duration history file."""
+
+    def test_compact_keeps_the_last_records_of_each_test(self, tmp_path):
+        """Test that compaction keeps each test's most recent records, in order."""
+        store = DurationStore(str(tmp_path / "durations.jsonl"))
+        for i in range(5):
+            store.append({"nodeid": "test_a", "duration": float(i), "timestamp": i})
+        store.append({"nodeid": "test_b", "duration": 9.0, "timestamp": 5})
+        store.compact(window=3)
+        assert store.history() == {"test_a": [2.0, 3.0, 4.0], "test_b": [9.0]}
+        assert not (tmp_path / "durations.jsonl.tmp").exists()
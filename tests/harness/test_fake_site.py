@@ -0,0 +1,42 @@
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from harness.fake_site import PAGES, FakeSite
+
+
+@pytest.fixture(scope="module")
+def site():
+    site = FakeSite(rows=5, page_size=2)
+    site.start()
+    yield site
+    site.stop()
+
+
+class TestFakeSite:
+    """Tests for the routes of the fake DemoQA server."""
+
+    @pytest.mark.parametrize("path", list(PAGES))
+    def test_serves_pages(self, site, path):
+        """Test that every page is served with its heading and the server's table settings."""
+        with urllib.request.urlopen(site.url + path + "?rows=1") as response:
+            body = response.read().decode()
+        assert response.status == 200
+        assert response.headers["Content-Type"] == "text/html; charset=utf-8"
+        assert PAGES[path][1] in body
+        assert json.dumps({"rows": 5, "pageSize": 2}) in body
+
+    def test_trailing_slash_and_assets(self, site):
+        """Test that a trailing slash is ignored and the stylesheet is served as CSS."""
+        assert site.response("/text-box/") == site.response("/text-box")
+        with urllib.request.urlopen(site.url + "/static/site.css") as response:
+            assert response.headers["Content-Type"] == "text/css; charset=utf-8"
+
+    def test_unknown_path_is_404(self, site):
+        """Test that paths the fake does not know are not found."""
+        with pytest.raises(urllib.error.HTTPError) as excinfo:
+            urllib.request.urlopen(site.url + "/books")
+        assert excinfo.value.code == 404
+        assert excinfo.value.read() == b"Not Found"
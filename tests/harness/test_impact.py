@@ -0,0 +1,77 @@
+import subprocess
+
+import pytest
+
+from harness.impact import Changes, _method_spans
+
+PAGE_MODULE = '''class SamplePage:
+    def navigate(self):
+        return "navigate"
+
+    @property
+    def title(self):
+        return "title"
+
+
+def helper():
+    return "helper"
+'''
+
+
+class TestImpact:
+    """Tests for the test impact analysis."""
+
+    def test_method_spans(self):
+        """Test that method spans cover their decorators and skip module functions."""
+        assert _method_spans(PAGE_MODULE) == [(2, 3, "SamplePage.navigate"), (5, 7, "SamplePage.title")]
+
+    @pytest.fixture
+    def repo(self, tmp_path):
+        def git(*args):
+            subprocess.run(["git", *args], cwd=tmp_path, check=True, capture_output=True)
+
+        (tmp_path / "pages").mkdir()
+        (tmp_path / "pages" / "sample_page.py").write_text(PAGE_MODULE)
+        (tmp_path / "README.md").write_text("Sample\n")
+        git("init", "-q")
+        git("add", ".")
+        git("-c", "user.name=test", "-c", "user.email=test@example.com", "commit", "-q", "-m", "sample")
+        return tmp_path
+
+    def changes(self, repo):
+        return Changes("HEAD", str(repo), ["*.md"])
+
+    def test_method_change(self, repo):
+        """Test that a change inside a method affects only the tests that called it."""
+        module = repo / "pages" / "sample_page.py"
+        module.write_text(PAGE_MODULE.replace('return "navigate"', 'return "navigated"'))
+        changes = self.changes(repo)
+        assert changes.methods == {"pages/sample_page.py::SamplePage.navigate"}
+        assert not changes.modules and not changes.run_all
+        touched = {"modules": ["pages/sample_page.py"], "urls": []}
+        assert changes.affects("tests/test_a.py::test_a", {**touched, "methods": [
+            "pages/sample_page.py::SamplePage.navigate"
+        ]})
+        assert not changes.affects("tests/test_b.py::test_b", {**touched, "methods": [
+            "pages/sample_page.py::SamplePage.title"
+        ]})
+        # Not in the map yet
+        assert changes.affects("tests/test_c.py::test_c", None)
+
+    def test_module_change_and_ignored_files(self, repo):
+        """Test that a change outside methods affects the module's tests and ignored files nothing."""
+        (repo / "pages" / "sample_page.py").write_text(PAGE_MODULE.replace('"helper"', '"helped"'))
+        (repo / "README.md").write_text("Changed\n")
+        changes = self.changes(repo)
+        assert changes.modules == {"pages/sample_page.py"} and not changes.run_all
+        assert changes.affects("tests/test_a.py::test_a", {
+            "modules": ["pages/sample_page.py"], "methods": [], "urls": []
+        })
+        assert not changes.affects("tests/test_b.py::test_b", {"modules": [], "methods": [], "urls": ["/text-box"]})
+
+    def test_other_change_runs_everything(self, repo):
+        """Test that a change outside pages and tests affects every test."""
+        (repo / "conftest.py").write_text("")
+        changes = self.changes(repo)
+        assert changes.run_all == ["conftest.py"]
+        assert changes.affects("tests/test_b.py::test_b", {"modules": [], "methods": [], "urls": []})
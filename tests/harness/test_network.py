@@ -0,0 +1,21 @@
+import pytest
+
+from harness.network import match_action, parse_rules
+
+
+class TestNetworkRules:
+    """Tests for the network_rules ini lines."""
+
+    def test_parse_and_match(self):
+        """Test that the first matching rule decides, and exact is the default."""
+        rules = parse_rules(["", "*/ads/* abort", "*.js ignore-query", "* live"])
+        assert rules == [("*/ads/*", "abort"), ("*.js", "ignore-query"), ("*", "live")]
+        assert match_action(rules, "https://demoqa.com/ads/banner.js") == "abort"
+        assert match_action(rules, "https://demoqa.com/main.js") == "ignore-query"
+        assert match_action(rules[:2], "https://demoqa.com/text-box") == "exact"
+
+    @pytest.mark.parametrize("line", ["*.js", "*.js unknown", "*.js live extra"])
+    def test_invalid_rule(self, line):
+        """Test that malformed rules are usage errors."""
+        with pytest.raises(pytest.UsageError):
+            parse_rules([line])
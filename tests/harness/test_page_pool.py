@@ -0,0 +1,126 @@
+import json
+from types import SimpleNamespace
+
+from harness.page_pool import PagePool
+
+
+class FakePage:
+    """The parts of a Playwright page the pool uses, with a record of its resets."""
+
+    def __init__(self):
+        self.url = "about:blank"
+        self.handlers = []
+        self.closed = False
+        self.calls = []
+
+    def on(self, event, handler):
+        self.handlers.append((event, handler))
+
+    once = on
+
+    def remove_listener(self, event, handler):
+        self.handlers.remove((event, handler))
+
+    def is_closed(self):
+        return self.closed
+
+    def close(self):
+        self.closed = True
+
+    def unroute_all(self, behavior=None):
+        self.calls.append("unroute_all")
+
+    def set_viewport_size(self, viewport):
+        self.calls.append(("viewport", viewport))
+
+    def evaluate(self, script, seed):
+        self.calls.append(("storage", seed))
+
+    def goto(self, url):
+        self.url = url
+
+
+class FakeContext:
+    def __init__(self):
+        self.pages = []
+        self.cookies = []
+        self.closed = False
+        self.clock = SimpleNamespace(install=lambda *args, **kwargs: None)
+
+    def new_page(self):
+        self.pages.append(FakePage())
+        return self.pages[-1]
+
+    def clear_cookies(self):
+        self.cookies = []
+
+    def add_cookies(self, cookies):
+        self.cookies.extend(cookies)
+
+    def clear_permissions(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+def make_pool(contexts, **kwargs):
+    def context_factory():
+        contexts.append(FakeContext())
+        return contexts[-1]
+
+    return PagePool(context_factory, {"width": 800, "height": 600}, **kwargs)
+
+
+class TestPagePool:
+    """Tests for the page pool's reuse, reset and replacement bookkeeping."""
+
+    def test_reuses_a_reset_page(self, tmp_path):
+        """Test that a released page is reset, seeded again and handed to the next test."""
+        state = tmp_path / "state.json"
+        state.write_text(json.dumps({
+            "cookies": [{"name": "consent", "value": "1"}],
+            "origins": [{"origin": "https://demoqa.com", "localStorage": [{"name": "seen", "value": "1"}]}],
+        }))
+        contexts = []
+        pool = make_pool(contexts, storage_state=str(state))
+        page = pool.acquire()
+        page.url = "https://demoqa.com/text-box"
+        pool.release(page)
+        assert pool.acquire() is page
+        assert (pool.created, pool.recycled) == (1, 0)
+        assert page.url == "about:blank"
+        assert ("storage", [{"name": "seen", "value": "1"}]) in page.calls
+        assert contexts[0].cookies == [{"name": "consent", "value": "1"}]
+
+    def test_removes_only_the_listeners_of_the_test(self):
+        """Test that handlers a test added are removed and the pool's crash handler stays."""
+        pool = make_pool([])
+        page = pool.acquire()
+        page.on("dialog", print)
+        pool.release(page)
+        assert [event for event, _ in page.handlers] == ["crash"]
+
+    def test_replaces_worn_out_and_unhealthy_pages(self):
+        """Test that a page is replaced after max_uses tests and after a failed test."""
+        pool = make_pool([], max_uses=2)
+        page = pool.acquire()
+        pool.release(page)
+        pool.release(pool.acquire())
+        assert page.closed
+        second = pool.acquire()
+        assert second is not page
+        pool.release(second, healthy=False)
+        assert second.closed
+        assert (pool.created, pool.recycled) == (2, 2)
+
+    def test_fake_clock_replaces_the_context(self):
+        """Test that a test installing a fake clock gets its context closed after it."""
+        contexts = []
+        pool = make_pool(contexts)
+        page = pool.acquire()
+        pool.context.clock.install()
+        pool.release(page)
+        assert contexts[0].closed
+        pool.acquire()
+        assert len(contexts) == 2
@@ -0,0 +1,60 @@
+from pathlib import Path
+
+import pytest
+
+from harness.reruns import classify_failure, is_environmental
+
+pytest_plugins = ["pytester"]
+
+FLAKY_TESTS = '''
+import pytest
+
+attempts = {"network": 0}
+
+
+def test_network():
+    attempts["network"] += 1
+    if attempts["network"] == 1:
+        raise ConnectionResetError("reset by peer")
+
+
+def test_assertion():
+    assert False
+'''
+
+
+class TestReruns:
+    """Tests for the environmental failure classification and the reruns it triggers."""
+
+    @pytest.mark.parametrize("exception", [
+        ConnectionResetError("reset by peer"),
+        TimeoutError(),
+        RuntimeError('page.goto: net::ERR_CONNECTION_REFUSED at https://demoqa.com/'),
+        RuntimeError('Timeout 30000ms exceeded.\n  navigating to "https://demoqa.com/", waiting until "load"'),
+        RuntimeError("Target page, context or browser has been closed"),
+    ])
+    def test_environmental(self, exception):
+        """Test that network errors, navigation timeouts and closed browsers are environmental."""
+        assert classify_failure(exception) == "environmental"
+        assert is_environmental(exception)
+
+    @pytest.mark.parametrize("exception", [
+        AssertionError("net::ERR_CONNECTION_REFUSED in an assertion message"),
+        RuntimeError("Timeout 5000ms exceeded waiting for locator('#submit')"),
+        KeyError("full_name"),
+    ])
+    def test_deterministic(self, exception):
+        """Test that assertions, locator timeouts and other errors are deterministic."""
+        assert classify_failure(exception) == "deterministic"
+        assert not is_environmental(exception)
+
+    def test_reruns_only_environmental_failures(self, pytester, monkeypatch):
+        """Test that a network error is rerun and an assertion failure is reported right away."""
+        monkeypatch.setenv("PYTHONPATH", str(Path(__file__).parents[2]))
+        pytester.makepyfile(FLAKY_TESTS)
+        result = pytester.runpytest_subprocess(
+            "-p", "no:playwright", "-p", "harness.durations", "-p", "harness.reruns",
+            "--env-reruns=2", "--env-rerun-backoff=0", "--durations-store=durations.jsonl",
+        )
+        assert result.parseoutcomes() == {"passed": 1, "failed": 1, "rerun": 1}
+        result.stdout.fnmatch_lines(["*test_network: flakiness 1.00"])
@@ -0,0 +1,55 @@
+from types import SimpleNamespace
+
+import pytest
+
+from harness.scheduler import _duration_scheduling_class
+
+
+class TestDurationScheduling:
+    """Tests for the longest-first xdist scheduler."""
+
+    class Config:
+        """The options LoadScheduling reads, for two workers."""
+
+        def getvalue(self, name):
+            return ["2*popen"] if name == "tx" else None
+
+        getoption = getvalue
+
+    class Node:
+        """A worker that records the tests it is sent."""
+
+        def __init__(self, name):
+            self.gateway = SimpleNamespace(id=name)
+            self.sent = []
+            self.shutting_down = False
+
+        def send_runtest_some(self, indices):
+            self.sent.extend(indices)
+
+        def shutdown(self):
+            self.shutting_down = True
+
+    def scheduling(self, durations):
+        pytest.importorskip("xdist")
+        return _duration_scheduling_class()(self.Config(), None, durations)
+
+    def test_expected_durations(self):
+        """Test that tests without history are expected to take the median duration."""
+        scheduling = self.scheduling({"a": 1.0, "b": 5.0, "c": 2.0})
+        assert scheduling.expected_duration("b") == 5.0
+        assert scheduling.expected_duration("unknown") == 2.0
+        assert self.scheduling({}).expected_duration("a") == 1.0
+
+    def test_longest_first_round_robin(self):
+        """Test that the longest tests are dealt out first, one per worker at a time."""
+        collection = ["a", "b", "c", "d", "e"]
+        scheduling = self.scheduling({"a": 1.0, "b": 5.0, "c": 3.0, "d": 4.0, "e": 2.0})
+        nodes = [self.Node("gw0"), self.Node("gw1")]
+        for node in nodes:
+            scheduling.add_node(node)
+            scheduling.add_node_collection(node, collection)
+        scheduling.schedule()
+        assert [collection[i] for i in nodes[0].sent] == ["b", "c"]
+        assert [collection[i] for i in nodes[1].sent] == ["d", "e"]
+        assert [collection[i] for i in scheduling.pending] == ["a"]
@@ -0,0 +1,31 @@
+import pytest
+
+from harness.soak import SoakResult
+
+
+def result(samples, duration=60.0):
+    return SoakResult(
+        iterations=120, concurrency=2, duration=duration, latencies=[0.5], errors=[], samples=samples,
+        leaked_contexts=0,
+    )
+
+
+class TestSoakResult:
+    """Tests for the soak result's throughput and memory growth."""
+
+    def test_rss_growth_is_the_slope_in_mb_per_hour(self):
+        """Test that a steady 1 MB per minute with noise around it grows 60 MB per hour."""
+        noise = [2**19, -(2**19), -(2**19), 2**19]
+        samples = [{"elapsed": 60.0 * i, "rss": 100 * 2**20 + i * 2**20 + noise[i]} for i in range(4)]
+        assert result(samples).rss_growth("rss") == pytest.approx(60.0)
+
+    def test_rss_growth_needs_two_samples_over_time(self):
+        """Test that missing, single or simultaneous samples give no growth."""
+        assert result([{"elapsed": 0.0, "rss": 1}]).rss_growth("rss") is None
+        assert result([{"elapsed": 0.0, "rss": 1}, {"elapsed": 0.0, "rss": 2}]).rss_growth("rss") is None
+        assert result([{"elapsed": 0.0, "rss": None}, {"elapsed": 1.0}]).rss_growth("rss") is None
+
+    def test_throughput(self):
+        """Test that throughput is iterations per second, and 0 for an empty run."""
+        assert result([]).throughput == 2.0
+        assert result([], duration=0.0).throughput == 0.0
@@ -0,0 +1,71 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from harness.storage_state import StorageSnapshot, site_version
+
+
+class FakeBrowser:
+    """Serves one base page through ``new_context().request.get``."""
+
+    def __init__(self, html, ok=True):
+        response = SimpleNamespace(ok=ok, text=lambda: html)
+        self.context = SimpleNamespace(
+            request=SimpleNamespace(get=lambda url, timeout: response),
+            close=lambda: None,
+        )
+
+    def new_context(self):
+        return self.context
+
+
+@pytest.fixture
+def snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr("harness.storage_state.time.time", lambda: 1000.0)
+    snapshot = StorageSnapshot(str(tmp_path), "chromium")
+    (tmp_path / "chromium.json").write_text(json.dumps({"cookies": [], "origins": []}))
+    (tmp_path / "chromium.meta.json").write_text(json.dumps({"created": 900.0, "site_version": "v1"}))
+    return snapshot
+
+
+class TestStorageSnapshot:
+    """Tests for when a bootstrapped storage state can be reused."""
+
+    def test_valid_within_ttl_and_version(self, snapshot):
+        """Test that a snapshot is reused within its TTL for the same or an unknown site version."""
+        assert snapshot.is_valid(ttl_seconds=200, version="v1")
+        assert snapshot.is_valid(ttl_seconds=200, version=None)
+
+    def test_invalid_after_ttl_or_deploy(self, snapshot):
+        """Test that a snapshot expires with its TTL and with a new site version."""
+        assert not snapshot.is_valid(ttl_seconds=50, version="v1")
+        assert not snapshot.is_valid(ttl_seconds=200, version="v2")
+
+    def test_invalid_without_its_files(self, snapshot, tmp_path):
+        """Test that a snapshot whose state or metadata is missing or broken is not reused."""
+        (tmp_path / "chromium.json").unlink()
+        assert not snapshot.is_valid(ttl_seconds=200, version="v1")
+        assert not StorageSnapshot(str(tmp_path), "firefox").is_valid(ttl_seconds=200, version=None)
+        (tmp_path / "chromium.meta.json").write_text("{")
+        assert not snapshot.is_valid(ttl_seconds=200, version=None)
+
+
+class TestSiteVersion:
+    """Tests for the site version hash of the base page's assets."""
+
+    def test_hashes_script_and_stylesheet_urls(self):
+        """Test that the hash follows the asset URLs, not their order or the rest of the page."""
+        page = '<link href="/main.css"><script src="/main.abc.js"></script><p>{}</p>'
+        reordered = '<script src="/main.abc.js"></script><link href="/main.css"><p>changed</p>'
+        deployed = '<link href="/main.css"><script src="/main.def.js"></script>'
+        assert site_version(FakeBrowser(page), "https://demoqa.com") == site_version(
+            FakeBrowser(reordered), "https://demoqa.com"
+        )
+        assert site_version(FakeBrowser(page), "https://demoqa.com") != site_version(
+            FakeBrowser(deployed), "https://demoqa.com"
+        )
+
+    def test_unknown_when_the_page_fails(self):
+        """Test that an error page gives no version."""
+        assert site_version(FakeBrowser("", ok=False), "https://demoqa.com") is None
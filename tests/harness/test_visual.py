@@ -0,0 +1,41 @@
+import numpy as np
+
+from harness.visual import compare
+
+
+class TestVisualCompare:
+    """Tests for the perceptual screenshot comparison."""
+
+    @staticmethod
+    def image(height=40, width=60, value=255):
+        return np.full((height, width, 3), value, dtype=np.uint8)
+
+    def test_identical_and_size_mismatch(self):
+        """Test that identical images pass and images of another size fail."""
+        assert compare(self.image(), self.image()).passes(0)
+        assert compare(self.image(), self.image(width=61)).size_mismatch
+
+    def test_counts_differences_and_ignores_regions(self):
+        """Test that a changed block is counted unless it is in an ignored region."""
+        actual = self.image()
+        actual[10:20, 10:20] = 0
+        result = compare(actual, self.image(), anti_aliasing=False)
+        assert result.mismatched == 100 and result.total == 2400
+        assert not result.passes(0.01)
+        ignored = compare(actual, self.image(), ignore=[{"x": 10, "y": 10, "width": 10, "height": 10}])
+        assert ignored.mismatched == 0
+
+    def test_below_threshold(self):
+        """Test that imperceptible changes are not differences."""
+        assert compare(self.image(value=254), self.image()).mismatched == 0
+
+    def test_stops_past_max_ratio(self):
+        """Test that the comparison stops once it is known to fail."""
+        rng = np.random.default_rng(0)
+        actual = rng.integers(0, 256, (400, 400, 3), dtype=np.uint8)
+        expected = rng.integers(0, 256, (400, 400, 3), dtype=np.uint8)
+        full = compare(actual, expected)
+        stopped = compare(actual, expected, max_ratio=0.001)
+        assert full.complete and not stopped.complete
+        assert 0.001 * full.total < stopped.mismatched < full.mismatched
+        assert not stopped.passes(0.001)
@@ -24,22 +24,36 @@ class TestAlerts:
 
     def test_timer_alert(self, page: Page):
         """Test handling a timed alert that appears after 5 seconds."""
-        alerts_page = AlertsPage(page)
+        alerts_page = AlertsPage(page, fake_clock=True)
         alerts_page.navigate()
         
         # Set up handler before triggering
         alerts_page.setup_dialog_handler(action="accept")
         
-        # Click button and wait for alert
+        # Click button and fast-forward the page clock past the 5 second delay
         alerts_page.click_timer_alert()
-        
-        # Wait for the timed alert (appears after 5 seconds)
-        page.wait_for_event("dialog", timeout=6000)
+        alerts_page.advance_time(5000)
         
         # Verify alert appeared and was handled
         assert alerts_page.dialog_message is not None
         assert "This alert appeared after 5 seconds" in alerts_page.dialog_message
 
+    def test_timer_alert_not_shown_early(self, page: Page):
+        """Test that the timed alert does not appear before its delay has passed."""
+        alerts_page = AlertsPage(page, fake_clock=True)
+        alerts_page.navigate()
+        
+        alerts_page.setup_dialog_handler(action="accept")
+        alerts_page.click_timer_alert()
+        
+        # Just short of the delay: no dialog yet
+        alerts_page.advance_time(4900)
+        assert alerts_page.dialog_message is None
+        
+        # Crossing the 5 second mark fires it
+        alerts_page.advance_time(100)
+        assert "This alert appeared after 5 seconds" in alerts_page.dialog_message
+
     def test_confirm_alert_accept(self, page: Page):
         """Test accepting a confirm dialog (clicking OK)."""
         alerts_page = AlertsPage(page)
@@ -2,7 +2,11 @@ import pytest
 from playwright.sync_api import Page, expect
 from pages.buttons_page import ButtonsPage
 
+# DOM-only tests: skip images, fonts and ad payloads
+pytestmark = pytest.mark.resource_profile("minimal")
 
+
+@pytest.mark.page_url("/buttons")
 class TestButtons:
     """Tests for DemoQA Buttons page."""
 
@@ -1,11 +1,13 @@
 import pytest
 from playwright.sync_api import Page, expect
 from pages.responsive_page import ResponsivePage
+from pages.aio.responsive_page import ResponsivePage as AsyncResponsivePage
 
 
 class TestResponsiveDesign:
     """Tests for responsive design across different screen resolutions."""
 
+    @pytest.mark.page_url("/text-box")
     @pytest.mark.xfail(reason="demoqa.com has horizontal scroll on mobile viewports - known site issue")
     def test_mobile_small_viewport(self, page: Page):
         """Test layout on small mobile device (iPhone SE - 375x667)."""
@@ -22,6 +24,7 @@ class TestResponsiveDesign:
         layout = responsive_page.check_responsive_layout()
         assert not layout["hasHorizontalScroll"], "Should not have horizontal scroll on mobile"
 
+    @pytest.mark.page_url("/buttons")
     def test_mobile_medium_viewport(self, page: Page):
         """Test layout on medium mobile device (iPhone 12/13 - 390x844)."""
         responsive_page = ResponsivePage(page)
@@ -36,6 +39,7 @@ class TestResponsiveDesign:
         assert responsive_page.is_element_visible("#doubleClickBtn")
         assert responsive_page.is_element_visible("#rightClickBtn")
 
+    @pytest.mark.page_url("/text-box")
     def test_tablet_portrait_viewport(self, page: Page):
         """Test layout on tablet in portrait mode (iPad - 768x1024)."""
         responsive_page = ResponsivePage(page)
@@ -51,6 +55,7 @@ class TestResponsiveDesign:
         assert responsive_page.is_element_visible("#userName")
         assert responsive_page.is_element_visible("#userEmail")
 
+    @pytest.mark.page_url("/text-box")
     def test_tablet_landscape_viewport(self, page: Page):
         """Test layout on tablet in landscape mode (1024x768)."""
         responsive_page = ResponsivePage(page)
@@ -65,6 +70,7 @@ class TestResponsiveDesign:
         layout = responsive_page.check_responsive_layout()
         assert layout["viewportWidth"] == 1024
 
+    @pytest.mark.page_url("/buttons")
     def test_laptop_viewport(self, page: Page):
         """Test layout on common laptop screen (1366x768)."""
         responsive_page = ResponsivePage(page)
@@ -80,6 +86,7 @@ class TestResponsiveDesign:
         buttons = page.locator("button").all()
         assert len(buttons) >= 3, "All buttons should be visible on laptop"
 
+    @pytest.mark.page_url("/text-box")
     def test_desktop_full_hd_viewport(self, page: Page):
         """Test layout on Full HD desktop (1920x1080)."""
         responsive_page = ResponsivePage(page)
@@ -95,6 +102,7 @@ class TestResponsiveDesign:
         layout = responsive_page.check_responsive_layout()
         assert layout["viewportWidth"] == 1920
 
+    @pytest.mark.page_url("/buttons")
     def test_desktop_2k_viewport(self, page: Page):
         """Test layout on 2K desktop (2560x1440)."""
         responsive_page = ResponsivePage(page)
@@ -117,6 +125,7 @@ class TestResponsiveDesign:
         "laptop",
         "desktop"
     ])
+    @pytest.mark.page_url("/text-box")
     def test_form_accessibility_across_devices(self, page: Page, device_type: str):
         """Test that form remains accessible across different device sizes."""
         responsive_page = ResponsivePage(page)
@@ -151,6 +160,7 @@ class TestResponsiveDesign:
         assert viewport["width"] == width, f"Width should be {width} for {device_type}"
         assert viewport["height"] == height, f"Height should be {height} for {device_type}"
 
+    @pytest.mark.page_url("/text-box")
     @pytest.mark.xfail(reason="demoqa.com has horizontal scroll on mobile viewports - known site issue")
     def test_responsive_content_layout(self, page: Page):
         """Test content layout adapts from mobile to desktop."""
@@ -172,3 +182,33 @@ class TestResponsiveDesign:
         # Both should not have horizontal scroll
         assert not mobile_layout["hasHorizontalScroll"]
         assert not desktop_layout["hasHorizontalScroll"]
+
+    @pytest.mark.page_url("/text-box")
+    @pytest.mark.resource_profile("minimal")
+    @pytest.mark.parametrize("device_type", list(ResponsivePage.VIEWPORTS))
+    def test_text_box_form_visual(self, page: Page, visual, device_type: str):
+        """Compare the text box form with its baseline at each viewport."""
+        responsive_page = ResponsivePage(page)
+        responsive_page.set_viewport(device_type)
+        responsive_page.navigate_to_text_box()
+        
+        screenshot = responsive_page.capture_element("#userForm")
+        visual.assert_matches(screenshot, "text-box-form", device_type)
+
+    def test_all_viewports_concurrently(self, async_driver):
+        """Test the text box form at every viewport, each in its own page at the same time."""
+        async def check_viewport(page, device_type):
+            responsive_page = AsyncResponsivePage(page)
+            await responsive_page.set_viewport(device_type)
+            await responsive_page.navigate_to_text_box()
+            return {
+                "viewport": responsive_page.get_viewport_size(),
+                "form_visible": await responsive_page.is_element_visible("#userName"),
+            }
+
+        device_types = list(AsyncResponsivePage.VIEWPORTS)
+        results = async_driver.map(check_viewport, device_types)
+
+        for device_type, result in zip(device_types, results):
+            assert result["viewport"] == AsyncResponsivePage.VIEWPORTS[device_type]
+            assert result["form_visible"], f"Form should be visible on {device_type}"
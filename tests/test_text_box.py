@@ -1,11 +1,18 @@
 import pytest
 from playwright.sync_api import Page, expect
 from pages.text_box_page import TextBoxPage
+from pages.aio.text_box_page import TextBoxPage as AsyncTextBoxPage
 
+# DOM-only tests: skip images, fonts and ad payloads
+pytestmark = pytest.mark.resource_profile("minimal")
 
+
+@pytest.mark.page_url("/text-box")
 class TestTextBox:
     """Tests for DemoQA Text Box page."""
 
+    # Generous limits: the budget is there to catch regressions, not a slow network
+    @pytest.mark.perf_budget(fcp_ms=10000, load_ms=30000, long_tasks_ms=5000)
     def test_fill_and_submit_form(self, page: Page):
         """Test filling out and submitting the text box form."""
         text_box_page = TextBoxPage(page)
@@ -47,3 +54,41 @@ class TestTextBox:
         
         # Output should be visible after submission
         expect(text_box_page.output_section).to_be_visible()
+
+    def test_fill_many_sets_react_state(self, page: Page):
+        """Test that fields filled in one evaluation reach the React state."""
+        text_box_page = TextBoxPage(page)
+        text_box_page.navigate()
+        
+        data = {
+            "full_name": "Ann Lee",
+            "email": "ann.lee@example.com",
+            "permanent_address": "1 Batch Road",
+        }
+        text_box_page.fill_many(data)
+        for name, value in data.items():
+            expect(page.locator(TextBoxPage.form_fields[name])).to_have_value(value)
+        
+        # The submitted output is rendered from React state, not from the DOM values
+        text_box_page.submit()
+        output_text = text_box_page.get_output_text()
+        assert "Ann Lee" in output_text
+        assert "ann.lee@example.com" in output_text
+        assert "1 Batch Road" in output_text
+
+    @pytest.mark.soak
+    def test_fill_and_submit_soak(self, soak):
+        """Test filling and submitting the form, many times over with --soak."""
+        async def fill_and_submit(page):
+            text_box_page = AsyncTextBoxPage(page)
+            await text_box_page.navigate()
+            await text_box_page.fill_form(
+                full_name="Soak User",
+                email="soak@example.com",
+                current_address="1 Long Run Road",
+                permanent_address="2 Endurance Lane"
+            )
+            await text_box_page.submit()
+            assert "Soak User" in await text_box_page.get_output_text()
+
+        soak.run(fill_and_submit)
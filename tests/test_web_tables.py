@@ -1,6 +1,7 @@
 import pytest
 from playwright.sync_api import Page, expect
 from pages.web_tables_page import WebTablesPage
+from pages.aio.web_tables_page import WebTablesPage as AsyncWebTablesPage
 
 
 class TestWebTables:
@@ -51,10 +52,78 @@ class TestWebTables:
         tables_page.search("NonExistentName123")
         
         # Verify no data rows are visible
-        visible_rows = 0
-        for row in tables_page.table_rows.all():
-            if row.text_content().strip() and "NonExistentName123" not in row.text_content():
-                visible_rows += 1
+        snapshot = tables_page.snapshot()
+        visible_rows = [row for row in snapshot.rows if not row.contains("NonExistentName123")]
         
         # Should have minimal or no visible content rows
-        assert visible_rows <= 1
+        assert len(visible_rows) <= 1
+
+    def test_table_snapshot(self, page: Page):
+        """Test reading the whole table as structured rows."""
+        tables_page = WebTablesPage(page)
+        tables_page.navigate()
+        
+        snapshot = tables_page.snapshot()
+        
+        # Column headers come from the table header row
+        assert "First Name" in snapshot.headers
+        assert "Email" in snapshot.headers
+        
+        # The seeded records are there, with their action buttons
+        cierra = snapshot.where("First Name", "Cierra")
+        assert len(cierra) == 1
+        assert cierra[0].values["Last Name"] == "Vega"
+        assert any(action_id.startswith("delete-record-") for action_id in cierra[0].action_ids)
+        
+        # Searching the snapshot matches the table's own search
+        tables_page.search("Cierra")
+        assert tables_page.snapshot().count() == len(snapshot.search("Cierra"))
+
+    def test_add_records_concurrently(self, async_driver):
+        """Test adding records in several independent sessions at the same time."""
+        async def add_record(page, first_name):
+            tables_page = AsyncWebTablesPage(page)
+            await tables_page.navigate()
+            initial_count = await tables_page.get_table_row_count()
+            await tables_page.click_add_button()
+            await tables_page.fill_registration_form(
+                first_name=first_name,
+                last_name="Parallel",
+                email=f"{first_name.lower()}@example.com",
+                age="30",
+                salary="50000",
+                department="Engineering"
+            )
+            await tables_page.submit_form()
+            snapshot = await tables_page.snapshot()
+            return initial_count, snapshot
+
+        first_names = ["Ada", "Grace", "Linus", "Barbara"]
+        results = async_driver.map(add_record, first_names)
+
+        # Every session only sees its own record
+        for first_name, (initial_count, snapshot) in zip(first_names, results):
+            assert snapshot.count() == initial_count + 1
+            assert len(snapshot.where("First Name", first_name)) == 1
+            assert len(snapshot.where("Last Name", "Parallel")) == 1
+
+    @pytest.mark.soak
+    def test_add_and_search_soak(self, soak):
+        """Test adding a record and searching for it, many times over with --soak."""
+        async def add_and_search(page):
+            tables_page = AsyncWebTablesPage(page)
+            await tables_page.navigate()
+            await tables_page.click_add_button()
+            await tables_page.fill_registration_form(
+                first_name="Soak",
+                last_name="Runner",
+                email="soak.runner@example.com",
+                age="41",
+                salary="60000",
+                department="Reliability"
+            )
+            await tables_page.submit_form()
+            await tables_page.search("Reliability")
+            assert len((await tables_page.snapshot()).where("Last Name", "Runner")) == 1
+
+        soak.run(add_and_search)